@@ -10,7 +10,7 @@ echo Started at: %date% %time%
 echo ========================================
 
 echo.
-echo [1/3] Updating prompt dates for new spreads...
+echo [1/6] Updating prompt dates for new spreads...
 python scripts\sql_collector\update_prompt_dates.py
 
 if %ERRORLEVEL% NEQ 0 (
@@ -19,7 +19,7 @@ if %ERRORLEVEL% NEQ 0 (
 )
 
 echo.
-echo [2/3] Classifying actual spread types...
+echo [2/6] Classifying actual spread types...
 python scripts\sql_collector\classify_actual_spreads.py
 
 if %ERRORLEVEL% NEQ 0 (
@@ -28,7 +28,31 @@ if %ERRORLEVEL% NEQ 0 (
 
 :skip_classify
 echo.
-echo [3/3] Running daily data collection...
+echo [3/6] Maintaining tick data partitions...
+python scripts\sql_collector\maintain_tick_partitions.py
+
+if %ERRORLEVEL% NEQ 0 (
+    echo [WARNING] Partition maintenance failed
+)
+
+echo.
+echo [4/6] Archiving old tick data...
+python scripts\sql_collector\archive_tick_data.py
+
+if %ERRORLEVEL% NEQ 0 (
+    echo [WARNING] Tick archive failed
+)
+
+echo.
+echo [5/6] Downsampling expired tick data...
+python scripts\sql_collector\downsample_tick_data.py
+
+if %ERRORLEVEL% NEQ 0 (
+    echo [WARNING] Tick downsampling failed
+)
+
+echo.
+echo [6/6] Running daily data collection...
 python scripts\sql_collector\quick_collect_copper.py
 
 if %ERRORLEVEL% EQU 0 (
@@ -0,0 +1,128 @@
+"""
+Move closed days of LME tick data into the columnstore archive
+Version: 1.0
+Date: 2025-07-25
+
+Moves ticks older than archive.hot_days from lme_market.LME_T_tick_data into
+lme_market.LME_T_tick_archive one day per transaction, then compresses the
+archive's open rowgroups. Research queries read both tiers through
+lme_market.V_tick_data_all.
+Requires sql/schema/09_create_tick_archive.sql.
+"""
+
+import os
+import argparse
+from datetime import datetime, date, timedelta
+from sql_data_collector_jcl import SQLServerDataCollectorJCL
+
+
+class TickArchiver:
+    """Moves closed tick days from the rowstore table into the archive"""
+
+    def __init__(self, config_path=None):
+        if config_path is None:
+            config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.jcl.json')
+            config_path = os.path.abspath(config_path)
+
+        self.collector = SQLServerDataCollectorJCL(config_path)
+        self.hot_days = self.collector.config.get('archive', {}).get('hot_days', 90)
+
+    def connect(self):
+        """Connect to database"""
+        if not self.collector.connect_database():
+            raise Exception("Failed to connect to database")
+
+    def get_oldest_hot_day(self):
+        """Oldest day still present in LME_T_tick_data"""
+        cursor = self.collector.connection.cursor()
+
+        try:
+            cursor.execute("SELECT MIN(timestamp) FROM lme_market.LME_T_tick_data")
+            oldest = cursor.fetchone()[0]
+            return oldest.date() if oldest else None
+
+        finally:
+            cursor.close()
+
+    def archive(self, hot_days: int = None, max_days: int = None) -> int:
+        """Archive every closed day older than hot_days"""
+        hot_days = self.hot_days if hot_days is None else hot_days
+        cutoff = date.today() - timedelta(days=hot_days)
+        day = self.get_oldest_hot_day()
+
+        if day is None or day >= cutoff:
+            print(f"[OK] No tick data older than {cutoff}")
+            return 0
+
+        print(f"Archiving ticks from {day} up to {cutoff} (hot window: {hot_days} days)")
+
+        total_rows = 0
+        days_done = 0
+        cursor = self.collector.connection.cursor()
+
+        try:
+            while day < cutoff and (max_days is None or days_done < max_days):
+                cursor.execute("EXEC lme_market.sp_ArchiveTickDay @day = ?", (day,))
+                rows = cursor.fetchone()[0] or 0
+                self.collector.connection.commit()
+
+                if rows:
+                    print(f"  {day}: {rows:,} rows")
+                total_rows += rows
+                days_done += 1
+                day += timedelta(days=1)
+
+            if total_rows:
+                print("Compressing archive rowgroups...")
+                cursor.execute("EXEC lme_market.sp_CompressTickArchive")
+                self.collector.connection.commit()
+
+        except Exception:
+            self.collector.connection.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+        print(f"[OK] Archived {total_rows:,} rows from {days_done} days")
+        return total_rows
+
+    def run(self, hot_days: int = None, max_days: int = None):
+        """Run the archive job"""
+        print("\n" + "="*60)
+        print("TICK DATA ARCHIVE")
+        print("="*60)
+        print(f"Started at: {datetime.now()}")
+
+        try:
+            self.connect()
+            self.archive(hot_days, max_days)
+            return 0
+
+        except Exception as e:
+            print(f"\nERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+        finally:
+            self.collector.close()
+            print(f"\nFinished at: {datetime.now()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move old LME tick data into the columnstore archive')
+    parser.add_argument('--config', default=None, help='Configuration file path')
+    parser.add_argument('--hot-days', type=int, default=None,
+                        help='Days of tick data kept in the rowstore table (default: archive.hot_days)')
+    parser.add_argument('--max-days', type=int, default=None,
+                        help='Maximum number of days to archive in this run')
+    args = parser.parse_args()
+
+    archiver = TickArchiver(args.config)
+    return archiver.run(args.hot_days, args.max_days)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,656 @@
+"""
+asyncio Collection Service for LME Metal Spreads
+Version: 1.0
+Date: 2025-07-25
+
+asyncio variant of RealtimeCollectionService. Bloomberg requests are
+awaited through BloombergDispatcher, pyodbc calls run on a dedicated
+database executor sized to the connection pool, and every collection
+schedule is its own task, so Bloomberg I/O, database writes and scheduling
+overlap in one process. SIGINT/SIGTERM cancel the schedule tasks, then the
+service flushes the intraday summaries and closes its connections.
+
+    python async_collection_service.py --config config.jcl.json
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sql_data_collector_jcl import SQLServerDataCollectorJCL, MARKET_DATA_FIELDS
+from bloomberg_dispatcher import BloombergDispatcher
+from collection_scheduler import JobStats
+from trading_calendar import TradingCalendar
+from collection_metrics import (
+    MetricsServer, BLOOMBERG_REQUEST_SECONDS, BLOOMBERG_SECURITIES_PER_REQUEST, BLOOMBERG_DECODE_SECONDS,
+    SCHEDULER_LAG_SECONDS, COLLECTION_JOB_SECONDS, COLLECTION_JOBS, COLLECTION_SKIPPED_CYCLES, CycleTimings
+)
+
+
+# Attempts to release a job lease before leaving it to expire
+COMPLETE_ATTEMPTS = 3
+
+
+class AsyncCollectionService:
+    """Collection service driven by an asyncio event loop"""
+
+    def __init__(self, config_path: str = "config.jcl.json"):
+        self.collector = SQLServerDataCollectorJCL(config_path)
+        self.logger = logging.getLogger('AsyncCollectionService')
+
+        config = self.collector.config
+        self.collection_config = config.get('collection', {})
+        self.bloomberg_config = config.get('bloomberg', {})
+        self.summary_flush_minutes = self.collection_config.get('summary_flush_minutes', 5)
+        self.lag_warning_seconds = self.collection_config.get('lag_warning_seconds', 5)
+        self.reload_minutes = self.collection_config.get('reload_minutes', 5)
+        self.calendar = TradingCalendar(config.get('sessions', {}), self.logger)
+        self.node_id = self.collection_config.get('node_name') or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = self.collection_config.get('lease_seconds', 120)
+
+        # pyodbc calls never run on the event loop; one thread per pooled connection
+        self.db_executor = ThreadPoolExecutor(
+            max_workers=config.get('database', {}).get('pool_size', 5),
+            thread_name_prefix='Database'
+        )
+
+        self.pool = None
+        self.dispatcher = None
+        self.metrics_config = config.get('metrics', {})
+        self.metrics_server = None
+        self.collection_schedules = {}
+        self.metal_locks = {}
+        self.job_results = {}
+        self.job_stats: Dict[int, JobStats] = {}
+        self.tasks: List[asyncio.Task] = []
+        self.schedule_tasks: Dict[int, asyncio.Task] = {}
+        self.busy_jobs = set()
+        self.snapshot_lock = None
+        self._stop_event = None
+        self._reload_event = None
+
+    async def _db(self, func, *args, **kwargs):
+        """Run a blocking database call on the database executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_executor, functools.partial(func, *args, **kwargs))
+
+    def _pooled(self, method, *args, **kwargs):
+        """Call a collector method with a pooled connection (database thread)"""
+        with self.pool.connection() as connection:
+            return method(*args, connection=connection, **kwargs)
+
+    async def start(self) -> bool:
+        """Open the pool and Bloomberg, load state and start the schedule tasks"""
+        self.logger.info("Starting asyncio Collection Service")
+        self.snapshot_lock = asyncio.Lock()
+
+        try:
+            self.pool = await self._db(self.collector.create_connection_pool)
+            await self._db(self._load_state)
+
+        except Exception as e:
+            self.logger.error(f"Failed to connect to database: {e}")
+            return False
+
+        self.dispatcher = BloombergDispatcher(
+            self.bloomberg_config.get('host', 'localhost'),
+            self.bloomberg_config.get('port', 8194),
+            max_outstanding=self.bloomberg_config.get('max_outstanding_requests', 100),
+            logger=self.logger
+        )
+        if not await self.dispatcher.start():
+            return False
+
+        self._start_metrics_server()
+
+        for config_id in self.collection_schedules:
+            self._start_schedule(config_id)
+        self.tasks.append(asyncio.create_task(self._summary_loop(), name='summary-flush'))
+        self.tasks.append(asyncio.create_task(self._lease_loop(), name='lease-renewal'))
+        self.tasks.append(asyncio.create_task(self._reload_loop(), name='config-reload'))
+
+        self.logger.info(
+            f"Service started with {len(self.collection_schedules)} schedules ({self.calendar.describe()})"
+        )
+        return True
+
+    def _start_metrics_server(self):
+        """Serve Prometheus-style metrics over HTTP if enabled"""
+        if not self.metrics_config.get('enabled', True):
+            return
+
+        host = self.metrics_config.get('host', '127.0.0.1')
+
+        try:
+            self.metrics_server = MetricsServer(host, self.metrics_config.get('port', 9108))
+            self.metrics_server.start()
+            self.logger.info(f"Metrics available at http://{host}:{self.metrics_server.port}/metrics")
+
+        except OSError as e:
+            # Collection does not depend on the endpoint
+            self.logger.error(f"Could not start metrics server: {e}")
+            self.metrics_server = None
+
+    def _load_state(self):
+        """Load schedules, today's summaries and last quotes (database thread)"""
+        with self.pool.connection() as connection:
+            self.collection_schedules = self.collector.get_collection_schedules(connection)
+            self.collector.load_intraday_summary(connection=connection)
+            self.collector.load_last_quotes(connection)
+
+        self.logger.info(f"Loaded {len(self.collection_schedules)} collection schedules")
+
+    def _start_schedule(self, config_id: int):
+        self.schedule_tasks[config_id] = asyncio.create_task(
+            self._schedule_loop(config_id), name=f"collection-{config_id}"
+        )
+
+    async def _schedule_loop(self, config_id: int):
+        """Task of one schedule: sleep until due, run, repeat"""
+        schedule = self.collection_schedules[config_id]
+
+        while True:
+            due = schedule['next_run']
+            delay = (due - datetime.now()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # Market-data jobs wait for the next session while the market is closed
+            suspended_until = self.calendar.suspended_until(schedule['collection_type'])
+            if suspended_until is not None:
+                self.logger.info(
+                    f"{schedule['collection_type']} collection for {schedule['metal_code']} "
+                    f"suspended until {suspended_until:%Y-%m-%d %H:%M}"
+                )
+                schedule['next_run'] = suspended_until
+                continue
+
+            # Jobs of the same metal run one after another
+            metal_lock = self.metal_locks.setdefault(schedule['metal_code'], asyncio.Lock())
+            async with metal_lock:
+                # A busy job is never cancelled by a schedule reload
+                self.busy_jobs.add(config_id)
+                try:
+                    await self._run_job(config_id, schedule, due)
+                finally:
+                    self.busy_jobs.discard(config_id)
+
+            # Removed by a reload while it was running
+            if self.collection_schedules.get(config_id) is not schedule:
+                return
+
+    async def _run_job(self, config_id: int, schedule: Dict, due: datetime):
+        """Claim and run one due job, recording lag and duration"""
+        if not await self._claim_job(config_id, schedule):
+            return
+
+        stats = self.job_stats.setdefault(config_id, JobStats())
+        lag = max(0.0, (datetime.now() - due).total_seconds())
+        stats.record_lag(lag)
+        SCHEDULER_LAG_SECONDS.observe(
+            lag, metal=schedule['metal_code'], collection_type=schedule['collection_type']
+        )
+        if lag > self.lag_warning_seconds:
+            self.logger.warning(f"Job {config_id} started {lag:.1f}s late")
+
+        started = time.monotonic()
+        await self._process_collection(config_id, schedule)
+        duration = time.monotonic() - started
+
+        stats.interval = schedule['interval_minutes'] * 60
+        if stats.record_duration(duration):
+            self.logger.warning(
+                f"Job {config_id} ran {duration:.1f}s, longer than its {stats.interval:.0f}s interval"
+            )
+
+    async def _claim_job(self, config_id: int, schedule: Dict) -> bool:
+        """Lease a due job in the database so that only one node runs it"""
+        try:
+            claimed = await self._db(
+                self._pooled, self.collector.claim_collection_jobs, self.node_id, self.lease_seconds, config_id
+            )
+            if claimed:
+                return True
+            next_run, lease_expires = await self._db(self._pooled, self.collector.get_collection_lease, config_id)
+
+        except Exception as e:
+            self.logger.error(f"Error claiming collection job {config_id}: {e}")
+            schedule['next_run'] = datetime.now() + timedelta(seconds=30)
+            return False
+
+        # Another node ran or is running the job; follow the database schedule
+        retry_at = datetime.now() + timedelta(seconds=5)
+        schedule['next_run'] = max(t for t in (next_run, lease_expires, retry_at) if t is not None)
+        return False
+
+    async def _complete_job(self, config_id: int, schedule: Dict, succeeded: bool) -> Tuple[datetime, int]:
+        """Release a job lease; returns the job's next run time and skipped cycles"""
+        next_run, skipped = self.calendar.next_run(
+            schedule['collection_type'], schedule['next_run'], schedule['interval_minutes'] * 60
+        )
+
+        # Retried: a lease left behind blocks the job until it expires
+        for attempt in range(COMPLETE_ATTEMPTS):
+            try:
+                completed = await self._db(
+                    self._pooled, self.collector.complete_collection_job, config_id, self.node_id, succeeded,
+                    next_run=next_run if succeeded else None
+                )
+                if completed is not None:
+                    return (completed[0], skipped) if succeeded else completed
+                self.logger.warning(f"Lease on collection job {config_id} expired before the job completed")
+                break
+
+            except Exception as e:
+                self.logger.error(
+                    f"Error completing collection job {config_id} (attempt {attempt + 1}/{COMPLETE_ATTEMPTS}): {e}"
+                )
+                if attempt + 1 < COMPLETE_ATTEMPTS:
+                    await asyncio.sleep(2 ** attempt)
+
+        if succeeded:
+            return next_run, skipped
+        return datetime.now() + timedelta(seconds=30), 0
+
+    async def reload(self):
+        """Reload configuration and schedules without dropping in-flight work or caches"""
+        try:
+            config = await self._db(self.collector.reload_config)
+            self.collection_config = config.get('collection', {})
+            self.summary_flush_minutes = self.collection_config.get('summary_flush_minutes', 5)
+            self.lag_warning_seconds = self.collection_config.get('lag_warning_seconds', 5)
+            self.lease_seconds = self.collection_config.get('lease_seconds', 120)
+            self.reload_minutes = self.collection_config.get('reload_minutes', 5)
+            self.calendar = TradingCalendar(config.get('sessions', {}), self.logger)
+            self.logger.info(f"Session timetable reloaded: {self.calendar.describe()}")
+
+        except Exception as e:
+            self.logger.error(f"Error reloading configuration, keeping current settings: {e}")
+
+        try:
+            loaded = await self._db(self._pooled, self.collector.get_collection_schedules)
+
+        except Exception as e:
+            self.logger.error(f"Error reloading collection schedules: {e}")
+            return
+
+        added, removed, changed = 0, 0, 0
+
+        for config_id in list(self.collection_schedules):
+            if config_id not in loaded:
+                del self.collection_schedules[config_id]
+                task = self.schedule_tasks.pop(config_id)
+                # A busy job finishes its run; its task then sees the removal and returns
+                if config_id not in self.busy_jobs:
+                    task.cancel()
+                removed += 1
+
+        for config_id, new in loaded.items():
+            schedule = self.collection_schedules.get(config_id)
+
+            if schedule is None:
+                self.collection_schedules[config_id] = new
+                self._start_schedule(config_id)
+                added += 1
+
+            elif schedule['interval_minutes'] != new['interval_minutes']:
+                schedule['interval_minutes'] = new['interval_minutes']
+
+                # Restart an idle task so it sleeps until the new due time
+                if config_id not in self.busy_jobs:
+                    interval = timedelta(minutes=new['interval_minutes'])
+                    schedule['next_run'] = min(new['next_run'], (new['last_run'] or datetime.now()) + interval)
+                    self.schedule_tasks[config_id].cancel()
+                    self._start_schedule(config_id)
+                changed += 1
+
+        if added or removed or changed:
+            self.logger.info(f"Reloaded collection schedules: {added} added, {removed} removed, {changed} changed")
+
+    async def _reload_loop(self):
+        """Reload periodically or when SIGHUP arrives"""
+        while True:
+            try:
+                await asyncio.wait_for(self._reload_event.wait(), self.reload_minutes * 60)
+            except asyncio.TimeoutError:
+                pass
+
+            self._reload_event.clear()
+            await self.reload()
+
+    async def _lease_loop(self):
+        """Extend the leases of running jobs"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+
+            try:
+                await self._db(
+                    self._pooled, self.collector.renew_collection_leases,
+                    self.node_id, self.lease_seconds, list(self.busy_jobs)
+                )
+
+            except Exception as e:
+                self.logger.error(f"Error renewing collection leases: {e}")
+
+    async def _process_collection(self, config_id: int, schedule: Dict):
+        """Run one collection job, record its result and release its lease"""
+        metal_code = schedule['metal_code']
+        collection_type = schedule['collection_type']
+        result = self.job_results[config_id] = {
+            'metal_code': metal_code,
+            'collection_type': collection_type,
+            'started': datetime.now(),
+            'finished': None,
+            'status': 'RUNNING',
+            'error': None,
+            'skipped_cycles': 0
+        }
+        timings = CycleTimings()
+
+        self.logger.info(f"Starting {collection_type} collection for {metal_code}")
+
+        try:
+            if collection_type == 'REALTIME':
+                await self._collect_active_spreads(metal_code, timings)
+            elif collection_type == 'REGULAR':
+                await self._collect_all_spreads(metal_code, timings)
+            elif collection_type == 'DAILY':
+                await self._daily_maintenance(metal_code, timings)
+
+            result['status'] = 'SUCCESS'
+
+        except asyncio.CancelledError:
+            # Hand the job back at shutdown instead of holding it until the lease expires
+            result['status'] = 'CANCELLED'
+            result['finished'] = datetime.now()
+            self.db_executor.submit(
+                self._pooled, self.collector.complete_collection_job, config_id, self.node_id, False
+            )
+            raise
+
+        except Exception as e:
+            self.logger.error(f"Error in {collection_type} collection for {metal_code}: {e}")
+            result['status'] = 'FAILED'
+            result['error'] = str(e)
+
+        timings.finish(metal_code, collection_type)
+        await self._record_cycle_metrics(config_id, schedule, result['status'], timings)
+
+        # Release the lease; next_run stays on the interval grid and
+        # cycles that passed during an overrun are skipped, not queued
+        succeeded = result['status'] == 'SUCCESS'
+        schedule['next_run'], skipped = await self._complete_job(config_id, schedule, succeeded)
+        result['skipped_cycles'] = skipped
+        result['finished'] = datetime.now()
+
+        labels = {'metal': metal_code, 'collection_type': collection_type}
+        COLLECTION_JOB_SECONDS.observe((result['finished'] - result['started']).total_seconds(), **labels)
+        COLLECTION_JOBS.inc(status=result['status'], **labels)
+
+        if skipped:
+            COLLECTION_SKIPPED_CYCLES.inc(skipped, **labels)
+            self.job_stats[config_id].skipped_cycles += skipped
+            self.logger.warning(f"Job {config_id} overran; skipped {skipped} cycle(s)")
+
+        if succeeded:
+            schedule['last_run'] = datetime.now()
+            await self._write_activity_snapshot()
+            self.logger.info(f"Completed {collection_type} collection for {metal_code}")
+
+    async def _record_cycle_metrics(self, config_id: int, schedule: Dict, status: str, timings: CycleTimings):
+        """Persist the stage timings of a cycle to LME_T_collection_metrics"""
+        try:
+            await self._db(
+                self._pooled, self.collector.store_collection_metrics,
+                schedule['metal_code'], schedule['collection_type'], status, timings,
+                config_id=config_id, node_name=self.node_id
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error recording collection metrics: {e}")
+
+    def get_job_stats(self) -> Dict[int, Dict]:
+        """Lag, duration, overrun and skipped-cycle statistics per config_id"""
+        return {config_id: stats.as_dict() for config_id, stats in self.job_stats.items()}
+
+    async def _write_activity_snapshot(self):
+        """Replace the spread activity snapshot read by the monitoring views"""
+        try:
+            async with self.snapshot_lock:
+                await self._db(self._pooled, self.collector.store_activity_snapshot)
+
+        except Exception as e:
+            self.logger.error(f"Error writing activity snapshot: {e}")
+
+    async def get_market_data(self, spreads: List[Dict], fields: List[str] = None) -> List[Dict]:
+        """Request all batches of spreads concurrently"""
+        fields = fields or MARKET_DATA_FIELDS
+        batch_size = self.collection_config.get('batch_size', 50)
+
+        batches = [spreads[i:i+batch_size] for i in range(0, len(spreads), batch_size)]
+        results = await asyncio.gather(*(self._market_data_batch(batch, fields) for batch in batches))
+
+        return [data for batch_data in results for data in batch_data]
+
+    async def _market_data_batch(self, batch: List[Dict], fields: List[str]) -> List[Dict]:
+        request = self.dispatcher.create_request("//blp/refdata", "ReferenceDataRequest")
+
+        for spread in batch:
+            request.append("securities", spread['ticker'])
+
+        for field in fields:
+            request.append("fields", field)
+
+        metal_code = batch[0].get('metal_code') or ''
+        BLOOMBERG_SECURITIES_PER_REQUEST.observe(len(batch), metal=metal_code)
+
+        started = time.perf_counter()
+        messages = await self.dispatcher.request(request)
+        BLOOMBERG_REQUEST_SECONDS.observe(time.perf_counter() - started, metal=metal_code, request='refdata')
+
+        market_data = []
+        with BLOOMBERG_DECODE_SECONDS.time(metal=metal_code, request='refdata'):
+            for msg in messages:
+                market_data.extend(self.collector.parse_security_data(msg, batch, fields))
+        return market_data
+
+    async def _collect_active_spreads(self, metal_code: str, timings: CycleTimings):
+        """Collect data for spreads quoted within the active window"""
+        active_spreads = await self._db(
+            self._pooled, self.collector.get_active_spreads, metal_code, self.collector.active_hours
+        )
+
+        if not active_spreads:
+            self.logger.info(f"No active spreads found for {metal_code}")
+            return
+
+        timings.spread_count = len(active_spreads)
+        with timings.stage('fetch'):
+            market_data = await self.get_market_data(active_spreads)
+        current_data = [
+            d for d in market_data
+            if d.get('BID') is not None or d.get('ASK') is not None
+        ]
+
+        if current_data:
+            timings.tick_count = len(current_data)
+            with timings.stage('store_ticks'):
+                stored = await self._db(self._pooled, self.collector.store_tick_data, current_data)
+            self.logger.info(f"Stored {stored} tick records for active {metal_code} spreads")
+
+    async def _collect_all_spreads(self, metal_code: str, timings: CycleTimings):
+        """Collect all active spreads; each batch is written as soon as it arrives"""
+        all_spreads = await self._db(self._pooled, self.collector.get_spreads, metal_code)
+        batch_size = self.collection_config.get('batch_size', 50)
+
+        self.logger.info(f"Collecting data for {len(all_spreads)} {metal_code} spreads")
+        timings.spread_count = len(all_spreads)
+
+        # Batches overlap, so the stage times add up across batches
+        async def collect_batch(batch):
+            with timings.stage('fetch'):
+                market_data = await self._market_data_batch(batch, MARKET_DATA_FIELDS)
+            if market_data:
+                timings.tick_count += len(market_data)
+                with timings.stage('store_ticks'):
+                    return await self._db(self._pooled, self.collector.store_tick_data, market_data)
+            return 0
+
+        stored = await asyncio.gather(*(
+            collect_batch(all_spreads[i:i+batch_size])
+            for i in range(0, len(all_spreads), batch_size)
+        ))
+        self.logger.info(f"Stored {sum(stored)} tick records for {metal_code}")
+
+    async def _daily_maintenance(self, metal_code: str, timings: CycleTimings):
+        """Search new spreads, recalculate summaries and mark inactive spreads"""
+        with timings.stage('search'):
+            spreads = await self.search_spreads(metal_code)
+        timings.spread_count = len(spreads)
+
+        if spreads:
+            with timings.stage('store_spreads'):
+                stored = await self._db(self._pooled, self.collector.store_spreads, spreads)
+            self.logger.info(f"Found and stored {stored} new {metal_code} spreads")
+
+        calculated = await self._db(self._pooled, self.collector.calculate_daily_summaries, metal_code)
+        self.logger.info(f"Calculated {calculated} daily summaries for {metal_code}")
+
+        inactive_count = await self._db(self._pooled, self.collector.mark_inactive_spreads, metal_code, 30)
+        if inactive_count > 0:
+            self.logger.info(f"Marked {inactive_count} {metal_code} spreads as inactive")
+
+    async def search_spreads(self, metal_code: str) -> List[Dict]:
+        """Run all instrument searches of a metal concurrently"""
+        async def search(pattern):
+            request = self.dispatcher.create_request("//blp/instruments", "instrumentListRequest")
+            request.set("query", pattern)
+            request.set("yellowKeyFilter", "YK_FILTER_CMDT")
+            request.set("maxResults", 1000)
+
+            with BLOOMBERG_REQUEST_SECONDS.time(metal=metal_code, request='instruments'):
+                return await self.dispatcher.request(request)
+
+        responses = await asyncio.gather(*(
+            search(pattern) for pattern in self.collector.search_patterns(metal_code)
+        ))
+
+        spreads = []
+        seen_tickers = set()
+        with BLOOMBERG_DECODE_SECONDS.time(metal=metal_code, request='instruments'):
+            for messages in responses:
+                for msg in messages:
+                    spreads.extend(self.collector.parse_instrument_results(msg, metal_code, seen_tickers))
+
+        self.logger.info(f"Found {len(spreads)} spreads for {metal_code}")
+        return spreads
+
+    async def _summary_loop(self):
+        """Merge the running intraday summaries periodically"""
+        while True:
+            await asyncio.sleep(self.summary_flush_minutes * 60)
+            await self._flush_intraday_summary()
+
+    async def _flush_intraday_summary(self):
+        try:
+            merged = await self._db(self._pooled, self.collector.flush_intraday_summary)
+            if merged:
+                self.logger.info(f"Flushed {merged} intraday summaries")
+
+        except Exception as e:
+            self.logger.error(f"Error flushing intraday summaries: {e}")
+
+    def stop(self):
+        """Request shutdown; safe to call from a signal handler"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def _install_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+
+        if hasattr(signal, 'SIGHUP'):
+            loop.add_signal_handler(signal.SIGHUP, self._reload_event.set)
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except NotImplementedError:
+                # Windows event loops have no add_signal_handler
+                signal.signal(signum, lambda *_: loop.call_soon_threadsafe(self.stop))
+
+    async def run(self) -> int:
+        """Run until SIGINT/SIGTERM, then cancel tasks and shut down"""
+        self._stop_event = asyncio.Event()
+        self._reload_event = asyncio.Event()
+        self._install_signal_handlers()
+
+        try:
+            if not await self.start():
+                return 1
+
+            await self._stop_event.wait()
+            self.logger.info("Shutting down...")
+            return 0
+
+        finally:
+            await self.shutdown()
+
+    async def shutdown(self):
+        """Cancel schedule tasks, flush summaries and close connections"""
+        tasks = self.tasks + list(self.schedule_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.tasks = []
+        self.schedule_tasks = {}
+
+        if self.pool:
+            await self._flush_intraday_summary()
+
+        if self.dispatcher:
+            await self.dispatcher.stop()
+            self.dispatcher = None
+
+        # Let database calls of cancelled tasks finish before closing the pool
+        self.db_executor.shutdown(wait=True)
+
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+        self.collector.close()
+
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+
+        self.logger.info("Service stopped")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='LME Metal Spreads asyncio Collection Service')
+    parser.add_argument('--config', default='config.jcl.json', help='Configuration file path')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    service = AsyncCollectionService(args.config)
+    return asyncio.run(service.run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
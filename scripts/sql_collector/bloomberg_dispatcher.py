@@ -0,0 +1,143 @@
+"""
+asyncio dispatcher for Bloomberg API requests
+Version: 1.0
+Date: 2025-07-25
+
+Runs a Bloomberg session with an event handler instead of blocking
+nextEvent() loops. Each request gets its own correlation id; the handler,
+called on the API's dispatcher thread, collects the response messages of
+that id and resolves an asyncio future on the event loop when the final
+RESPONSE arrives, so any number of requests can be awaited concurrently.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from typing import Dict, List
+
+import blpapi
+
+
+class BloombergDispatcher:
+    """Surfaces Bloomberg request/response pairs as awaitables"""
+
+    def __init__(self, host: str = 'localhost', port: int = 8194,
+                 max_outstanding: int = 100, logger: logging.Logger = None):
+        self.host = host
+        self.port = port
+        self.logger = logger or logging.getLogger('BloombergDispatcher')
+
+        self.session = None
+        self.services: Dict[str, blpapi.Service] = {}
+        self._loop = None
+        self._slots = asyncio.Semaphore(max_outstanding)
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, tuple] = {}  # correlation id -> (future, messages)
+        self._lock = threading.Lock()
+
+    async def start(self, service_names: List[str] = ("//blp/refdata", "//blp/instruments")) -> bool:
+        """Start the session and open services without blocking the event loop"""
+        self._loop = asyncio.get_running_loop()
+        return await self._loop.run_in_executor(None, self._start, list(service_names))
+
+    def _start(self, service_names: List[str]) -> bool:
+        options = blpapi.SessionOptions()
+        options.setServerHost(self.host)
+        options.setServerPort(self.port)
+
+        self.session = blpapi.Session(options, self._handle_event)
+
+        if not self.session.start():
+            self.logger.error("Failed to start Bloomberg session")
+            return False
+
+        for name in service_names:
+            if not self.session.openService(name):
+                self.logger.error(f"Failed to open {name} service")
+                return False
+            self.services[name] = self.session.getService(name)
+
+        self.logger.info("Bloomberg dispatcher started")
+        return True
+
+    def create_request(self, service_name: str, operation: str):
+        return self.services[service_name].createRequest(operation)
+
+    async def request(self, request) -> List[blpapi.Message]:
+        """Send a request and return all of its response messages"""
+        async with self._slots:
+            key = next(self._ids)
+            correlation_id = blpapi.CorrelationId(key)
+            future = self._loop.create_future()
+
+            with self._lock:
+                self._pending[key] = (future, [])
+
+            try:
+                self.session.sendRequest(request, correlationId=correlation_id)
+                return await future
+
+            except asyncio.CancelledError:
+                self.session.cancel(correlation_id)
+                raise
+
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+
+    def _handle_event(self, event, session):
+        """Event handler; runs on the Bloomberg API dispatcher thread"""
+        event_type = event.eventType()
+
+        if event_type in (blpapi.Event.SESSION_STATUS, blpapi.Event.SERVICE_STATUS):
+            for msg in event:
+                self.logger.debug(f"Bloomberg status: {msg.messageType()}")
+            return
+
+        if event_type not in (blpapi.Event.RESPONSE, blpapi.Event.PARTIAL_RESPONSE,
+                              blpapi.Event.REQUEST_STATUS):
+            return
+
+        for msg in event:
+            for correlation_id in msg.correlationIds():
+                key = correlation_id.value()
+
+                with self._lock:
+                    state = self._pending.get(key)
+                if state is None:
+                    continue
+
+                future, messages = state
+
+                if event_type == blpapi.Event.REQUEST_STATUS:
+                    error = ConnectionError(f"Bloomberg request failed: {msg}")
+                    self._loop.call_soon_threadsafe(self._settle, future, None, error)
+                    continue
+
+                messages.append(msg)
+                if event_type == blpapi.Event.RESPONSE:
+                    self._loop.call_soon_threadsafe(self._settle, future, messages, None)
+
+    @staticmethod
+    def _settle(future, messages, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(messages)
+
+    async def stop(self):
+        """Fail outstanding requests and stop the session"""
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+
+        for future, _ in pending:
+            self._settle(future, None, ConnectionError("Bloomberg session stopped"))
+
+        if self.session:
+            await self._loop.run_in_executor(None, self.session.stop)
+            self.session = None
+            self.logger.info("Bloomberg dispatcher stopped")
@@ -14,6 +14,7 @@ import calendar
 import pyodbc
 import blpapi
 from sql_data_collector_jcl import SQLServerDataCollectorJCL
+from market_data_query import KeysetQuery
 
 
 class ActualSpreadClassifier:
@@ -162,59 +163,57 @@ class ActualSpreadClassifier:
         cursor = self.collector.connection.cursor()
         
         try:
-            # Get spreads to classify
-            query = """
-                SELECT 
-                    spread_id,
-                    ticker,
-                    spread_type,
-                    prompt_date1,
-                    prompt_date2
-                FROM lme_market.LME_M_spreads s
-                JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
-                WHERE m.metal_code = ?
-                AND prompt_date1 IS NOT NULL
-                AND prompt_date2 IS NOT NULL
-                AND actual_spread_type IS NULL
-            """
-            
-            if limit:
-                query += f" ORDER BY spread_id OFFSET 0 ROWS FETCH NEXT {limit} ROWS ONLY"
-                
-            cursor.execute(query, (metal_code,))
-            spreads = cursor.fetchall()
+            # Get spreads to classify, one keyset page at a time
+            query = KeysetQuery(
+                self.collector.connection,
+                "lme_market.LME_M_spreads s JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id",
+                ['s.spread_id', 's.ticker', 's.spread_type', 's.prompt_date1', 's.prompt_date2'],
+                ['s.spread_id'],
+                where="""
+                    m.metal_code = ?
+                    AND s.prompt_date1 IS NOT NULL
+                    AND s.prompt_date2 IS NOT NULL
+                    AND s.actual_spread_type IS NULL
+                """,
+                params=(metal_code,),
+                page_rows=5000,
+                limit=limit
+            )
             
-            print(f"\nFound {len(spreads)} {metal_code} spreads to classify")
+            print(f"\nClassifying {metal_code} spreads...")
             
             classified_count = 0
             reclassified_count = 0
             
-            for spread_id, ticker, original_type, date1, date2 in spreads:
-                actual_type, leg1_type, leg2_type, notes = self.classify_spread(date1, date2, ticker)
+            for spreads in query.pages():
+                for spread_id, ticker, original_type, date1, date2 in spreads:
+                    actual_type, leg1_type, leg2_type, notes = self.classify_spread(date1, date2, ticker)
                 
-                if actual_type:
-                    cursor.execute("""
-                        UPDATE lme_market.LME_M_spreads
-                        SET actual_spread_type = ?,
-                            actual_leg1_type = ?,
-                            actual_leg2_type = ?,
-                            classification_notes = ?,
-                            updated_at = GETDATE()
-                        WHERE spread_id = ?
-                    """, (actual_type, leg1_type, leg2_type, notes, spread_id))
+                    if actual_type:
+                        cursor.execute("""
+                            UPDATE lme_market.LME_M_spreads
+                            SET actual_spread_type = ?,
+                                actual_leg1_type = ?,
+                                actual_leg2_type = ?,
+                                classification_notes = ?,
+                                updated_at = GETDATE()
+                            WHERE spread_id = ?
+                        """, (actual_type, leg1_type, leg2_type, notes, spread_id))
                     
-                    classified_count += 1
+                        classified_count += 1
                     
-                    # Check if reclassified
-                    original_normalized = original_type.replace('Calendar', '3W-3W').replace('3M-3W', '3M-3W')
-                    if original_type != actual_type and original_normalized != actual_type:
-                        reclassified_count += 1
-                        print(f"  Reclassified: {ticker[:40]:40} {original_type:12} → {actual_type:12}")
+                        # Check if reclassified
+                        original_normalized = original_type.replace('Calendar', '3W-3W').replace('3M-3W', '3M-3W')
+                        if original_type != actual_type and original_normalized != actual_type:
+                            reclassified_count += 1
+                            print(f"  Reclassified: {ticker[:40]:40} {original_type:12} → {actual_type:12}")
                         
-                    if classified_count % 100 == 0:
-                        print(f"  Processed {classified_count} spreads...")
-                        
-            self.collector.connection.commit()
+                        if classified_count % 100 == 0:
+                            print(f"  Processed {classified_count} spreads...")
+                            
+                # Commit each page so a long run keeps its progress
+                self.collector.connection.commit()
+                
             print(f"\n[OK] Classified {classified_count} spreads")
             print(f"  Reclassified: {reclassified_count}")
             
@@ -0,0 +1,329 @@
+"""
+Prometheus-style metrics for the LME collection services
+Version: 1.0
+Date: 2025-07-25
+
+A small in-process metrics registry (counters, gauges, histograms with
+labels) rendered in the Prometheus text exposition format, and an embedded
+HTTP server that serves it on /metrics. No client library or external
+service is needed; point a Prometheus scrape job (or curl) at the port.
+
+The metrics below are module-level so the collector, the tick writer and
+the services can record into them without passing a registry around.
+CycleTimings times the stages of a single collection cycle; the services
+persist it to LME_T_collection_metrics as one row per cycle.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+# Latency buckets in seconds (Bloomberg round trips, DB writes, decode)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Sizes (securities per request, rows per write)
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# Scheduler lag and job durations in seconds
+SCHEDULE_BUCKETS = (0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 900, 1800)
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Gauge(_Metric):
+    """Current value per label set, set directly or read from a callback"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple, float] = {}
+        self._functions: Dict[Tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, func: Callable[[], float], **labels):
+        """Read the value from func at scrape time"""
+        with self._lock:
+            self._functions[self._key(labels)] = func
+
+    def remove_function(self, **labels):
+        with self._lock:
+            self._functions.pop(self._key(labels), None)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = list(self._functions.items())
+
+        for key, func in functions:
+            try:
+                values[key] = func()
+            except Exception:
+                continue
+
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """Bucketed observations with sum and count per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series: Dict[Tuple, list] = {}  # key -> [bucket counts, sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*series[0]], series[1], series[2])) for key, series in self._series.items())
+
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered set of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# Bloomberg
+BLOOMBERG_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'lme_bloomberg_request_seconds', 'Bloomberg request round-trip time',
+    ['metal', 'request']
+))
+BLOOMBERG_SECURITIES_PER_REQUEST = REGISTRY.register(Histogram(
+    'lme_bloomberg_securities_per_request', 'Securities in one reference data request',
+    ['metal'], buckets=SIZE_BUCKETS
+))
+BLOOMBERG_DECODE_SECONDS = REGISTRY.register(Histogram(
+    'lme_bloomberg_decode_seconds', 'Time spent decoding Bloomberg response messages',
+    ['metal', 'request']
+))
+BLOOMBERG_RATE_LIMIT_WAIT_SECONDS = REGISTRY.register(Counter(
+    'lme_bloomberg_rate_limit_wait_seconds_total', 'Time spent waiting on the request rate limiter',
+    ['metal']
+))
+
+# Database
+DB_WRITE_SECONDS = REGISTRY.register(Histogram(
+    'lme_db_write_seconds', 'Database write latency including commit',
+    ['stage']
+))
+TICK_ROWS = REGISTRY.register(Counter(
+    'lme_tick_rows_total', 'Tick rows by outcome (inserted, unchanged, duplicate)',
+    ['metal', 'outcome']
+))
+TICK_WRITER_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'lme_tick_writer_queue_batches', 'Batches waiting in the write-behind tick writer'
+))
+
+# Scheduling
+SCHEDULER_LAG_SECONDS = REGISTRY.register(Histogram(
+    'lme_scheduler_lag_seconds', 'Delay between a job falling due and starting',
+    ['metal', 'collection_type'], buckets=SCHEDULE_BUCKETS
+))
+COLLECTION_JOB_SECONDS = REGISTRY.register(Histogram(
+    'lme_collection_job_seconds', 'Collection job run time',
+    ['metal', 'collection_type'], buckets=SCHEDULE_BUCKETS
+))
+COLLECTION_JOBS = REGISTRY.register(Counter(
+    'lme_collection_jobs_total', 'Collection jobs run by final status',
+    ['metal', 'collection_type', 'status']
+))
+COLLECTION_SKIPPED_CYCLES = REGISTRY.register(Counter(
+    'lme_collection_skipped_cycles_total', 'Schedule cycles coalesced after an overrun',
+    ['metal', 'collection_type']
+))
+COLLECTION_STAGE_SECONDS = REGISTRY.register(Histogram(
+    'lme_collection_stage_seconds', 'Time spent in one stage of a collection cycle',
+    ['metal', 'collection_type', 'stage'], buckets=SCHEDULE_BUCKETS
+))
+
+
+class CycleTimings:
+    """Milliseconds spent in each stage of one collection cycle
+
+    Stage times accumulate, so a stage entered once per batch adds up over
+    the cycle; with concurrent batches the sum can exceed the wall time.
+    """
+
+    STAGES = ('search', 'fetch', 'store_spreads', 'store_ticks')
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.stage_ms = dict.fromkeys(self.STAGES, 0.0)
+        self.spread_count = 0
+        self.tick_count = 0
+        self.total_ms = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Add the duration of a with-block to a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_ms[name] += (time.perf_counter() - started) * 1000
+
+    def finish(self, metal: str, collection_type: str) -> float:
+        """Stop the cycle clock and observe the stages; returns total milliseconds"""
+        self.total_ms = (time.perf_counter() - self._started) * 1000
+
+        for name, ms in self.stage_ms.items():
+            if ms:
+                COLLECTION_STAGE_SECONDS.observe(ms / 1000, metal=metal, collection_type=collection_type, stage=name)
+        return self.total_ms
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the service log
+        pass
+
+
+class MetricsServer:
+    """Embedded HTTP server exposing a registry on /metrics"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 9108, registry: MetricsRegistry = REGISTRY):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='MetricsServer', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
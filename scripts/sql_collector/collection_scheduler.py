@@ -0,0 +1,223 @@
+"""
+Event-driven scheduler for the LME collection service
+Version: 1.0
+Date: 2025-07-25
+
+Keeps collection jobs in a min-heap keyed on next_run and sleeps on a
+condition variable until the earliest one is due (or the heap changes),
+then hands due jobs to a worker pool. Scheduling lag (the delay between a
+job's next_run and the moment a worker starts it), run duration against the
+job's interval, overruns and coalesced cycles are recorded per job, for
+runs that actually executed: run_job returns False when a job was only
+deferred (busy metal, closed market, leased by another node).
+
+A job is queued again only after its run finishes, so a slow run never
+stacks up behind itself; next_aligned_run() keeps the schedule on its
+original interval grid and counts the cycles an overrun skipped.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+
+def next_aligned_run(due: Optional[datetime], interval_seconds: float,
+                     now: datetime = None) -> Tuple[datetime, int]:
+    """First due + k * interval after now, and the k - 1 cycles it skips"""
+    now = now or datetime.now()
+
+    if due is None or due > now:
+        return (due or now) + timedelta(seconds=interval_seconds), 0
+
+    periods = int((now - due).total_seconds() // interval_seconds) + 1
+    return due + timedelta(seconds=periods * interval_seconds), periods - 1
+
+
+class JobStats:
+    """Lag, duration and overrun statistics of one job (seconds)"""
+
+    __slots__ = ('runs', 'last_lag', 'max_lag', 'total_lag',
+                 'last_duration', 'max_duration', 'total_duration',
+                 'interval', 'overruns', 'skipped_cycles')
+
+    def __init__(self):
+        self.runs = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        self.interval = None
+        self.overruns = 0
+        self.skipped_cycles = 0
+
+    def record_lag(self, lag: float):
+        self.runs += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+
+    def record_duration(self, duration: float) -> bool:
+        """Record a finished run; True if it took longer than the interval"""
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+
+        overrun = self.interval is not None and duration > self.interval
+        if overrun:
+            self.overruns += 1
+        return overrun
+
+    def as_dict(self) -> Dict[str, float]:
+        average_duration = self.total_duration / self.runs if self.runs else 0.0
+
+        return {
+            'runs': self.runs,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+            'average_lag': self.total_lag / self.runs if self.runs else 0.0,
+            'last_duration': self.last_duration,
+            'max_duration': self.max_duration,
+            'average_duration': average_duration,
+            'interval': self.interval,
+            # Share of the interval the job spends running; above 1.0 it cannot keep up
+            'utilization': average_duration / self.interval if self.interval else None,
+            'overruns': self.overruns,
+            'skipped_cycles': self.skipped_cycles
+        }
+
+
+class CollectionScheduler:
+    """Priority-queue scheduler dispatching due jobs to an executor"""
+
+    def __init__(self, executor, run_job: Callable[[Hashable], bool],
+                 lag_warning_seconds: float = 5.0, logger: logging.Logger = None):
+        self.executor = executor
+        self.run_job = run_job
+        self.lag_warning_seconds = lag_warning_seconds
+        self.logger = logger or logging.getLogger('CollectionScheduler')
+
+        self._heap = []  # (next_run, sequence, job_id)
+        self._pending: Dict[Hashable, int] = {}  # job_id -> sequence of its live heap entry
+        self._sequence = itertools.count()
+        self._stats: Dict[Hashable, JobStats] = {}
+        self._running = True
+        self._condition = threading.Condition()
+
+    def schedule(self, job_id: Hashable, next_run: datetime, interval_seconds: float = None):
+        """Queue a job to run at next_run, replacing any pending run of it"""
+        with self._condition:
+            if interval_seconds is not None:
+                self._stats.setdefault(job_id, JobStats()).interval = interval_seconds
+            sequence = next(self._sequence)
+            self._pending[job_id] = sequence
+            heapq.heappush(self._heap, (next_run, sequence, job_id))
+            self._condition.notify()
+
+    def reschedule(self, job_id: Hashable, next_run: datetime, interval_seconds: float = None) -> bool:
+        """Move a pending job to next_run; False (no change) if it is running or unknown"""
+        with self._condition:
+            if job_id not in self._pending:
+                return False
+            self.schedule(job_id, next_run, interval_seconds)
+            return True
+
+    def cancel(self, job_id: Hashable):
+        """Drop the pending run of a job (its heap entry is skipped lazily)"""
+        with self._condition:
+            self._pending.pop(job_id, None)
+            self._condition.notify()
+
+    def _pop_due(self):
+        """Pop due jobs; return (due list, seconds until the next one)"""
+        due = []
+        now = datetime.now()
+
+        while self._heap:
+            next_run, sequence, job_id = self._heap[0]
+            if self._pending.get(job_id) != sequence:
+                heapq.heappop(self._heap)  # cancelled or rescheduled
+                continue
+            if next_run > now:
+                return due, (next_run - now).total_seconds()
+
+            heapq.heappop(self._heap)
+            del self._pending[job_id]
+            due.append((job_id, next_run))
+
+        return due, None
+
+    def _execute(self, job_id: Hashable, next_run: datetime):
+        """Worker entry point: run the job, then record lag and duration if it ran"""
+        lag = max(0.0, (datetime.now() - next_run).total_seconds())
+
+        started = time.monotonic()
+        try:
+            ran = self.run_job(job_id)
+        except Exception as e:
+            self.logger.error(f"Job {job_id} failed: {e}")
+            ran = True
+
+        # Deferred runs would inflate run counts and pull the averages down
+        if not ran:
+            return
+
+        duration = time.monotonic() - started
+        with self._condition:
+            stats = self._stats.setdefault(job_id, JobStats())
+            stats.record_lag(lag)
+            overrun = stats.record_duration(duration)
+
+        if lag > self.lag_warning_seconds:
+            self.logger.warning(f"Job {job_id} started {lag:.1f}s late")
+
+        if overrun:
+            self.logger.warning(
+                f"Job {job_id} ran {duration:.1f}s, longer than its {stats.interval:.0f}s interval"
+            )
+
+    def record_skipped(self, job_id: Hashable, cycles: int):
+        """Record cycles of a job coalesced into its last run"""
+        if cycles <= 0:
+            return
+
+        with self._condition:
+            self._stats.setdefault(job_id, JobStats()).skipped_cycles += cycles
+
+        self.logger.warning(f"Job {job_id} overran; skipped {cycles} cycle(s)")
+
+    def run(self):
+        """Dispatch loop; blocks until stop() is called"""
+        self.logger.info("Collection scheduler started")
+
+        while True:
+            with self._condition:
+                while self._running:
+                    due, wait_seconds = self._pop_due()
+                    if due:
+                        break
+                    self._condition.wait(wait_seconds)
+
+                if not self._running:
+                    break
+
+            for job_id, next_run in due:
+                self.executor.submit(self._execute, job_id, next_run)
+
+        self.logger.info("Collection scheduler stopped")
+
+    def stop(self):
+        """Wake the dispatch loop and make it return"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+    def job_stats(self) -> Dict[Hashable, Dict[str, float]]:
+        """Per-job lag, duration and overrun statistics"""
+        with self._condition:
+            return {job_id: stats.as_dict() for job_id, stats in self._stats.items()}
@@ -0,0 +1,158 @@
+"""
+Thread-safe pyodbc connection pool for the LME collection service
+Version: 1.0
+Date: 2025-07-25
+
+pyodbc connections must not be shared between threads. The pool hands each
+worker its own connection for the duration of a unit of work, checks idle
+connections before reuse and reconnects with exponential backoff.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List
+
+
+class ConnectionPool:
+    """Bounded pool of database connections with per-thread checkout"""
+
+    def __init__(self, connect_func: Callable, max_size: int = 5,
+                 retry_attempts: int = 3, retry_delay_seconds: float = 5,
+                 health_check_seconds: float = 60, logger: logging.Logger = None):
+        self.connect_func = connect_func
+        self.max_size = max_size
+        self.retry_attempts = retry_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.health_check_seconds = health_check_seconds
+        self.logger = logger or logging.getLogger('ConnectionPool')
+
+        self._idle: List[tuple] = []  # (connection, returned_at)
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _connect(self):
+        """Open a new connection, retrying with exponential backoff"""
+        for attempt in range(self.retry_attempts + 1):
+            try:
+                return self.connect_func()
+
+            except Exception as e:
+                if attempt >= self.retry_attempts:
+                    raise
+
+                delay = self.retry_delay_seconds * (2 ** attempt)
+                self.logger.warning(
+                    f"Database connection failed (attempt {attempt + 1}/{self.retry_attempts + 1}): {e}; "
+                    f"retrying in {delay}s"
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _is_healthy(connection) -> bool:
+        """Run a trivial query to check that the connection is still usable"""
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(connection):
+        """Close a connection, ignoring errors from broken links"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: float = None):
+        """Check out a connection, blocking while the pool is exhausted"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection, returned_at = None, None
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a database connection")
+                self._condition.wait(remaining)
+
+        # Connect and health-check outside the lock
+        try:
+            if connection is not None and time.monotonic() - returned_at >= self.health_check_seconds:
+                if not self._is_healthy(connection):
+                    self.logger.warning("Discarding unhealthy pooled connection")
+                    self._discard(connection)
+                    connection = None
+
+            if connection is None:
+                connection = self._connect()
+
+            return connection
+
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection, broken: bool = False):
+        """Return a connection to the pool (or drop it if broken)"""
+        if not broken:
+            try:
+                connection.rollback()  # Never hand over an open transaction
+            except Exception:
+                broken = True
+
+        with self._condition:
+            if broken or self._closed:
+                self._discard(connection)
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """Context manager that checks out a connection for one unit of work"""
+        connection = self.acquire(timeout)
+        broken = False
+
+        try:
+            yield connection
+
+        except Exception:
+            broken = not self._is_healthy(connection)
+            raise
+
+        finally:
+            self.release(connection, broken)
+
+    def close(self):
+        """Close idle connections and refuse new checkouts"""
+        with self._condition:
+            self._closed = True
+            for connection, _ in self._idle:
+                self._discard(connection)
+                self._size -= 1
+            self._idle = []
+            self._condition.notify_all()
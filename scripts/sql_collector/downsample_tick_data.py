@@ -0,0 +1,178 @@
+"""
+Roll old LME tick data into one-minute bars and purge the raw rows
+Version: 1.0
+Date: 2025-07-25
+
+For every day older than archive.raw_retention_days, aggregates the raw ticks
+(hot table and columnstore archive) into lme_market.LME_T_minute_bars, then
+deletes the raw rows in bounded batches so the transaction log stays small.
+A day is recorded in lme_market.LME_T_downsampled_days together with its bars
+and only purged once recorded; a purge interrupted partway is resumed on the
+next run without rebuilding the day's bars from the remaining ticks.
+Requires sql/schema/10_create_minute_bars.sql.
+"""
+
+import os
+import argparse
+from datetime import datetime, date, timedelta
+from sql_data_collector_jcl import SQLServerDataCollectorJCL
+
+
+class TickDownsampler:
+    """Downsamples expired raw ticks into one-minute bars"""
+
+    def __init__(self, config_path=None):
+        if config_path is None:
+            config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.jcl.json')
+            config_path = os.path.abspath(config_path)
+
+        self.collector = SQLServerDataCollectorJCL(config_path)
+
+        archive_config = self.collector.config.get('archive', {})
+        self.retention_days = archive_config.get('raw_retention_days', 365)
+        self.purge_batch_rows = archive_config.get('purge_batch_rows', 50000)
+
+    def connect(self):
+        """Connect to database"""
+        if not self.collector.connect_database():
+            raise Exception("Failed to connect to database")
+
+    def get_oldest_raw_day(self):
+        """Oldest day with raw ticks in either tier"""
+        cursor = self.collector.connection.cursor()
+
+        try:
+            cursor.execute("SELECT MIN(timestamp) FROM lme_market.V_tick_data_all")
+            oldest = cursor.fetchone()[0]
+            return oldest.date() if oldest else None
+
+        finally:
+            cursor.close()
+
+    def downsample_day(self, day: date):
+        """Aggregate one day of ticks into minute bars; returns (bars, already_done)"""
+        cursor = self.collector.connection.cursor()
+
+        try:
+            cursor.execute("EXEC lme_market.sp_DownsampleTickDay @day = ?", (day,))
+            row = cursor.fetchone()
+            self.collector.connection.commit()
+            return row[0] or 0, bool(row[1])
+
+        except Exception:
+            self.collector.connection.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+    def is_downsampled(self, day: date) -> bool:
+        """True if the day's minute bars are recorded as complete"""
+        cursor = self.collector.connection.cursor()
+
+        try:
+            cursor.execute("SELECT 1 FROM lme_market.LME_T_downsampled_days WHERE bar_date = ?", (day,))
+            return cursor.fetchone() is not None
+
+        finally:
+            cursor.close()
+
+    def purge_day(self, day: date) -> int:
+        """Delete one day of raw ticks, committing after every batch"""
+        if not self.is_downsampled(day):
+            raise RuntimeError(f"Refusing to purge {day}: minute bars not recorded as complete")
+
+        purged = 0
+        cursor = self.collector.connection.cursor()
+
+        try:
+            while True:
+                cursor.execute("EXEC lme_market.sp_PurgeTickBatch @from = ?, @to = ?, @batch_size = ?",
+                               (day, day + timedelta(days=1), self.purge_batch_rows))
+                rows = cursor.fetchone()[0] or 0
+                self.collector.connection.commit()
+
+                purged += rows
+                if rows < self.purge_batch_rows:
+                    break
+
+            return purged
+
+        except Exception:
+            self.collector.connection.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+    def run_retention(self, retention_days: int = None, max_days: int = None):
+        """Downsample and purge every day older than retention_days"""
+        retention_days = self.retention_days if retention_days is None else retention_days
+        cutoff = date.today() - timedelta(days=retention_days)
+        day = self.get_oldest_raw_day()
+
+        if day is None or day >= cutoff:
+            print(f"[OK] No raw tick data older than {cutoff}")
+            return 0, 0
+
+        print(f"Downsampling ticks from {day} up to {cutoff} (raw retention: {retention_days} days)")
+
+        total_bars = 0
+        total_purged = 0
+        days_done = 0
+
+        while day < cutoff and (max_days is None or days_done < max_days):
+            bars, already_done = self.downsample_day(day)
+            purged = self.purge_day(day)
+
+            if already_done and purged:
+                print(f"  {day}: bars already complete, {purged:,} remaining raw rows purged")
+            elif bars or purged:
+                print(f"  {day}: {bars:,} bars, {purged:,} raw rows purged")
+            total_bars += bars
+            total_purged += purged
+            days_done += 1
+            day += timedelta(days=1)
+
+        print(f"[OK] Wrote {total_bars:,} minute bars and purged {total_purged:,} raw rows from {days_done} days")
+        return total_bars, total_purged
+
+    def run(self, retention_days: int = None, max_days: int = None):
+        """Run the retention job"""
+        print("\n" + "="*60)
+        print("TICK DATA DOWNSAMPLING")
+        print("="*60)
+        print(f"Started at: {datetime.now()}")
+
+        try:
+            self.connect()
+            self.run_retention(retention_days, max_days)
+            return 0
+
+        except Exception as e:
+            print(f"\nERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+        finally:
+            self.collector.close()
+            print(f"\nFinished at: {datetime.now()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Roll old LME tick data into one-minute bars')
+    parser.add_argument('--config', default=None, help='Configuration file path')
+    parser.add_argument('--retention-days', type=int, default=None,
+                        help='Days of raw ticks to keep (default: archive.raw_retention_days)')
+    parser.add_argument('--max-days', type=int, default=None,
+                        help='Maximum number of days to process in this run')
+    args = parser.parse_args()
+
+    downsampler = TickDownsampler(args.config)
+    return downsampler.run(args.retention_days, args.max_days)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Incremental intraday summaries for LME spread tick data
+Version: 1.0
+Date: 2025-07-25
+
+Keeps running per-spread, per-day aggregates (open/high/low/close, VWAP
+numerator and denominator, quote minutes, bid-ask statistics) updated as
+tick batches are stored, so the collection service can flush current
+LME_T_daily_summary rows with one MERGE instead of recomputing the day
+from raw ticks. The aggregates follow sp_CalculateDailySummary.
+"""
+
+import threading
+from datetime import datetime, date
+from typing import Dict, List, Optional, Tuple
+
+
+class DayAggregate:
+    """Running aggregates of one spread over one trading day"""
+
+    __slots__ = ('open_price', 'open_time', 'close_price', 'close_time',
+                 'high_price', 'low_price', 'total_volume', 'trade_count',
+                 'last_timestamp', 'vwap_numerator', 'vwap_denominator',
+                 'spread_sum', 'spread_count', 'spread_max', 'quote_minutes',
+                 'version')
+
+    def __init__(self):
+        self.open_price = None
+        self.open_time = None
+        self.close_price = None
+        self.close_time = None
+        self.high_price = None
+        self.low_price = None
+        self.total_volume = None
+        self.trade_count = 0
+        self.last_timestamp = None
+        self.vwap_numerator = 0.0
+        self.vwap_denominator = 0
+        self.spread_sum = 0.0
+        self.spread_count = 0
+        self.spread_max = None
+        self.quote_minutes = set()
+        self.version = 0
+
+    def add(self, timestamp: datetime, bid, ask, last_price, todays_volume):
+        """Fold one tick into the aggregates"""
+        self.version += 1
+
+        # Ticks arrive in timestamp order per spread; count distinct timestamps
+        if timestamp != self.last_timestamp:
+            self.trade_count += 1
+            self.last_timestamp = timestamp
+        self.quote_minutes.add(timestamp.hour * 60 + timestamp.minute)
+
+        if todays_volume is not None:
+            todays_volume = int(todays_volume)
+            if self.total_volume is None or todays_volume > self.total_volume:
+                self.total_volume = todays_volume
+
+        if bid is not None and ask is not None:
+            bid_ask = float(ask) - float(bid)
+            self.spread_sum += bid_ask
+            self.spread_count += 1
+            if self.spread_max is None or bid_ask > self.spread_max:
+                self.spread_max = bid_ask
+
+        if last_price is None:
+            return
+
+        last_price = float(last_price)
+
+        if self.open_time is None or timestamp < self.open_time:
+            self.open_price, self.open_time = last_price, timestamp
+        if self.close_time is None or timestamp >= self.close_time:
+            self.close_price, self.close_time = last_price, timestamp
+        if self.high_price is None or last_price > self.high_price:
+            self.high_price = last_price
+        if self.low_price is None or last_price < self.low_price:
+            self.low_price = last_price
+
+        if todays_volume:
+            self.vwap_numerator += last_price * todays_volume
+            self.vwap_denominator += todays_volume
+
+    def summary_row(self, spread_id: int, trading_date: date) -> tuple:
+        """Row in lme_market.LME_DailySummaryType column order"""
+        vwap = self.vwap_numerator / self.vwap_denominator if self.vwap_denominator else None
+        avg_spread = self.spread_sum / self.spread_count if self.spread_count else None
+
+        return (
+            spread_id, trading_date,
+            self.open_price, self.high_price, self.low_price, self.close_price,
+            vwap, self.total_volume, self.trade_count,
+            avg_spread, self.spread_max, len(self.quote_minutes)
+        )
+
+
+class IntradaySummaryEngine:
+    """Running daily summaries keyed by (spread_id, trading_date)"""
+
+    def __init__(self):
+        self._aggregates: Dict[Tuple[int, date], DayAggregate] = {}
+        self._flushed_versions: Dict[Tuple[int, date], int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._aggregates)
+
+    def _add(self, spread_id: int, timestamp: datetime, bid, ask, last_price, todays_volume):
+        key = (spread_id, timestamp.date())
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            aggregate = self._aggregates[key] = DayAggregate()
+        aggregate.add(timestamp, bid, ask, last_price, todays_volume)
+
+    def load(self, trading_date: date, rows: List[tuple]):
+        """Seed a day from stored (spread_id, timestamp, bid, ask, last_price, todays_volume) rows"""
+        with self._lock:
+            for key in [key for key in self._aggregates if key[1] == trading_date]:
+                del self._aggregates[key]
+                self._flushed_versions.pop(key, None)
+
+            for row in rows:
+                self._add(*row)
+
+    def update(self, market_data: List[Dict]):
+        """Fold a stored tick batch into the running aggregates"""
+        with self._lock:
+            for data in market_data:
+                self._add(data['spread_id'], data['timestamp'], data.get('BID'),
+                          data.get('ASK'), data.get('LAST_PRICE'), data.get('todays_volume'))
+
+    def pending_rows(self) -> Tuple[Dict, List[tuple]]:
+        """Return (versions, rows) for aggregates changed since the last flush"""
+        versions = {}
+        rows = []
+
+        with self._lock:
+            for key, aggregate in self._aggregates.items():
+                if aggregate.version != self._flushed_versions.get(key):
+                    versions[key] = aggregate.version
+                    rows.append(aggregate.summary_row(*key))
+
+        return versions, rows
+
+    def mark_flushed(self, versions: Dict, keep_from: Optional[date] = None):
+        """Record a successful flush and drop clean aggregates of days before keep_from"""
+        with self._lock:
+            self._flushed_versions.update(versions)
+
+            if keep_from is None:
+                return
+
+            for key in [key for key in self._aggregates if key[1] < keep_from]:
+                if self._aggregates[key].version == self._flushed_versions.get(key):
+                    del self._aggregates[key]
+                    del self._flushed_versions[key]
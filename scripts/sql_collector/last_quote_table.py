@@ -0,0 +1,87 @@
+"""
+In-memory last-quote table for LME spread tick data
+Version: 1.0
+Date: 2025-07-25
+
+Keeps the last persisted quote of every spread so the collector only
+stores a tick when bid/ask/last/size actually changed, plus a periodic
+heartbeat row per spread to record liveness.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+# Bloomberg fields that make up a quote (todays_volume is derived by the collector)
+QUOTE_FIELDS = ['BID', 'ASK', 'LAST_PRICE', 'BID_SIZE', 'ASK_SIZE', 'todays_volume']
+
+
+def _normalize(value):
+    """Normalize a quote value so Bloomberg floats and SQL decimals compare equal"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    # Prices are stored as DECIMAL(12,4)
+    return round(float(value), 4)
+
+
+class LastQuoteTable:
+    """Per-spread_id table of the last quote written to LME_T_tick_data"""
+
+    def __init__(self, heartbeat_minutes: float = 15):
+        self.heartbeat = timedelta(minutes=heartbeat_minutes)
+        self.loaded = False
+        self._quotes: Dict[int, Tuple[tuple, datetime]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    @staticmethod
+    def quote_key(data: Dict) -> tuple:
+        """Build the comparable quote tuple for one market data record"""
+        return tuple(_normalize(data.get(field)) for field in QUOTE_FIELDS)
+
+    def load(self, rows: List[tuple]):
+        """Load (spread_id, bid, ask, last_price, bid_size, ask_size, todays_volume, timestamp) rows"""
+        with self._lock:
+            for row in rows:
+                spread_id, timestamp = row[0], row[-1]
+                quote = tuple(_normalize(v) for v in row[1:-1])
+                self._quotes[spread_id] = (quote, timestamp)
+            self.loaded = True
+
+    def filter_changed(self, market_data: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+        """Return records whose quote changed or whose heartbeat is due"""
+        now = now or datetime.now()
+        changed = []
+
+        with self._lock:
+            for data in market_data:
+                previous = self._quotes.get(data['spread_id'])
+                if previous is None:
+                    changed.append(data)
+                    continue
+
+                quote, persisted_at = previous
+                if self.quote_key(data) != quote or now - persisted_at >= self.heartbeat:
+                    changed.append(data)
+
+        return changed
+
+    def update(self, market_data: List[Dict]):
+        """Record quotes that were committed to the database"""
+        with self._lock:
+            for data in market_data:
+                self._quotes[data['spread_id']] = (self.quote_key(data), data['timestamp'])
+
+    def snapshot(self) -> Dict[int, Tuple[datetime, Optional[float]]]:
+        """Return {spread_id: (last stored tick time, todays_volume)}"""
+        todays_volume = QUOTE_FIELDS.index('todays_volume')
+        with self._lock:
+            return {
+                spread_id: (persisted_at, quote[todays_volume])
+                for spread_id, (quote, persisted_at) in self._quotes.items()
+            }
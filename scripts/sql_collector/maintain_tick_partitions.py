@@ -0,0 +1,210 @@
+"""
+Sliding-window partition maintenance for LME tick data
+Version: 1.0
+Date: 2025-07-25
+
+Creates next months' partitions of lme_market.LME_T_tick_data ahead of time
+and switches out partitions older than the retention period, optionally
+archiving them to gzipped CSV before they are truncated.
+Requires sql/schema/08_partition_tick_data.sql.
+"""
+
+import os
+import csv
+import gzip
+import argparse
+from datetime import datetime, date
+from pathlib import Path
+from sql_data_collector_jcl import SQLServerDataCollectorJCL
+
+
+def month_start(d: date) -> date:
+    """First day of the month containing d"""
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    """Shift a month-start date by a number of months"""
+    month_index = d.year * 12 + d.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class TickPartitionMaintainer:
+    """Maintains monthly partitions of LME_T_tick_data"""
+
+    def __init__(self, config_path=None):
+        if config_path is None:
+            config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.jcl.json')
+            config_path = os.path.abspath(config_path)
+
+        self.collector = SQLServerDataCollectorJCL(config_path)
+
+    def connect(self):
+        """Connect to database"""
+        if not self.collector.connect_database():
+            raise Exception("Failed to connect to database")
+
+    def get_partitions(self):
+        """Return (partition_number, lower_boundary, upper_boundary, rows) tuples"""
+        cursor = self.collector.connection.cursor()
+
+        try:
+            cursor.execute("EXEC lme_market.sp_GetTickPartitions")
+            return [tuple(row) for row in cursor.fetchall()]
+
+        finally:
+            cursor.close()
+
+    def show_partitions(self):
+        """Print the current partition layout"""
+        print(f"\n{'Partition':>9}  {'From':12} {'To':12} {'Rows':>12}")
+        print("-"*50)
+
+        for number, lower, upper, rows in self.get_partitions():
+            lower_str = lower.strftime('%Y-%m-%d') if lower else '(min)'
+            upper_str = upper.strftime('%Y-%m-%d') if upper else '(max)'
+            print(f"{number:>9}  {lower_str:12} {upper_str:12} {rows:>12,}")
+
+    def ensure_future_partitions(self, months_ahead: int = 2) -> int:
+        """Create monthly boundaries up to months_ahead months after the current one"""
+        current_month = month_start(date.today())
+        added = 0
+        cursor = self.collector.connection.cursor()
+
+        try:
+            for offset in range(1, months_ahead + 1):
+                boundary = add_months(current_month, offset)
+                cursor.execute("EXEC lme_market.sp_AddTickPartition @boundary = ?",
+                               (datetime.combine(boundary, datetime.min.time()),))
+                if cursor.fetchone()[0]:
+                    added += 1
+                    print(f"  Added partition starting {boundary}")
+
+            self.collector.connection.commit()
+
+        except Exception:
+            self.collector.connection.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+        print(f"[OK] Future partitions ready ({added} added)")
+        return added
+
+    def expire_partitions(self, retention_months: int, archive_dir: str = None) -> int:
+        """Switch out months that ended before the retention window"""
+        cutoff = add_months(month_start(date.today()), -retention_months)
+        expired = [
+            (lower, upper, rows) for _, lower, upper, rows in self.get_partitions()
+            if lower is not None and upper is not None and upper.date() <= cutoff
+        ]
+
+        if not expired:
+            print(f"[OK] No partitions older than {cutoff}")
+            return 0
+
+        total_rows = 0
+        for lower, upper, rows in expired:
+            print(f"  Expiring {lower:%Y-%m} ({rows:,} rows)")
+            total_rows += self._switch_out(lower, archive_dir)
+
+        print(f"[OK] Expired {len(expired)} partitions ({total_rows:,} rows)")
+        return total_rows
+
+    def _switch_out(self, boundary: datetime, archive_dir: str = None) -> int:
+        """Switch one partition out, archive it if requested, then truncate staging"""
+        cursor = self.collector.connection.cursor()
+
+        try:
+            cursor.execute("EXEC lme_market.sp_SwitchOutTickPartition @boundary = ?", (boundary,))
+            rows = cursor.fetchone()[0] or 0
+            self.collector.connection.commit()
+
+            if archive_dir:
+                self._archive_staging(cursor, boundary, archive_dir)
+
+            cursor.execute("TRUNCATE TABLE lme_market.LME_T_tick_data_switch")
+            self.collector.connection.commit()
+            return rows
+
+        except Exception:
+            self.collector.connection.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+    def _archive_staging(self, cursor, boundary: datetime, archive_dir: str):
+        """Stream the switched-out month to a gzipped CSV file"""
+        Path(archive_dir).mkdir(parents=True, exist_ok=True)
+        archive_file = Path(archive_dir) / f"tick_data_{boundary:%Y%m}.csv.gz"
+
+        cursor.execute("""
+            SELECT tick_id, spread_id, timestamp, bid, ask, last_price,
+                   bid_size, ask_size, volume, todays_volume, open_interest,
+                   last_update_dt, trading_dt, rt_spread_bp, contract_value,
+                   data_source, quality_flag, created_at
+            FROM lme_market.LME_T_tick_data_switch
+            ORDER BY timestamp, tick_id
+        """)
+
+        with gzip.open(archive_file, 'wt', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([column[0] for column in cursor.description])
+
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                writer.writerows(rows)
+
+        print(f"  Archived to {archive_file}")
+
+    def run(self, months_ahead: int, retention_months: int = None, archive_dir: str = None):
+        """Run the sliding-window maintenance"""
+        print("\n" + "="*60)
+        print("TICK DATA PARTITION MAINTENANCE")
+        print("="*60)
+        print(f"Started at: {datetime.now()}")
+
+        try:
+            self.connect()
+
+            self.ensure_future_partitions(months_ahead)
+
+            if retention_months is not None:
+                self.expire_partitions(retention_months, archive_dir)
+
+            self.show_partitions()
+            return 0
+
+        except Exception as e:
+            print(f"\nERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+        finally:
+            self.collector.close()
+            print(f"\nFinished at: {datetime.now()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LME tick data partition maintenance')
+    parser.add_argument('--config', default=None, help='Configuration file path')
+    parser.add_argument('--months-ahead', type=int, default=2,
+                        help='Months of empty partitions to keep ahead of the current month')
+    parser.add_argument('--retention-months', type=int, default=None,
+                        help='Switch out partitions older than this many months (default: keep all)')
+    parser.add_argument('--archive-dir', default=None,
+                        help='Write expired partitions to gzipped CSV in this directory before truncating')
+    args = parser.parse_args()
+
+    maintainer = TickPartitionMaintainer(args.config)
+    return maintainer.run(args.months_ahead, args.retention_months, args.archive_dir)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
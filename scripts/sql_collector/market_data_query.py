@@ -0,0 +1,212 @@
+"""
+Streaming query API for LME tick and summary views
+Version: 1.0
+Date: 2025-07-25
+
+Reads large extracts from the JCL views page by page with keyset
+pagination (WHERE key > last key ORDER BY key) instead of fetchall() or
+OFFSET ... FETCH NEXT, and yields each page as NumPy column arrays or a
+pandas DataFrame, so multi-million-row extracts run in bounded memory.
+
+    query = price_history(connection, metal_code='CU', start=datetime(2025, 7, 1))
+    for frame in query.frames():
+        ...
+
+Requires sql/views/15_keyset_query_views.sql.
+"""
+
+import decimal
+from datetime import datetime, date
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+PRICE_HISTORY_COLUMNS = [
+    'spread_id', 'metal_code', 'ticker', 'timestamp', 'bid', 'ask',
+    'last_price', 'mid_price', 'volume', 'todays_volume', 'tick_id'
+]
+
+DAILY_SUMMARY_COLUMNS = [
+    'spread_id', 'metal_code', 'ticker', 'spread_type', 'trading_date',
+    'open_price', 'high_price', 'low_price', 'close_price', 'vwap',
+    'total_volume', 'trade_count', 'avg_bid_ask_spread',
+    'daily_change', 'daily_change_pct'
+]
+
+
+def _to_array(values: Sequence, type_code) -> np.ndarray:
+    """Convert one column of a page to a NumPy array by its pyodbc type"""
+    if type_code is decimal.Decimal or type_code is float:
+        return np.array([np.nan if v is None else float(v) for v in values], dtype='float64')
+
+    if type_code is int or type_code is bool:
+        if any(v is None for v in values):
+            return np.array([np.nan if v is None else v for v in values], dtype='float64')
+        return np.array(values, dtype='int64' if type_code is int else 'bool')
+
+    if type_code is datetime:
+        return np.array(values, dtype='datetime64[ms]')
+
+    if type_code is date:
+        return np.array(values, dtype='datetime64[D]')
+
+    return np.array(values, dtype=object)
+
+
+def _keyset_predicate(key_columns: List[str]) -> str:
+    """(k1, k2, ...) > (?, ?, ...) written so the leading key can be seeked"""
+    if len(key_columns) == 1:
+        return f"{key_columns[0]} > ?"
+
+    first = key_columns[0]
+    return f"{first} >= ? AND ({first} > ? OR ({_keyset_predicate(key_columns[1:])}))"
+
+
+def _keyset_params(last_key: Sequence) -> list:
+    if len(last_key) == 1:
+        return [last_key[0]]
+    return [last_key[0], last_key[0]] + _keyset_params(last_key[1:])
+
+
+class KeysetQuery:
+    """Streams a view or table in key order, one bounded page per round trip"""
+
+    def __init__(self, connection, source: str, columns: List[str], key_columns: List[str],
+                 where: str = None, params: Sequence = (), page_rows: int = 100000,
+                 arraysize: int = 10000, limit: int = None):
+        missing = [key for key in key_columns if key not in columns]
+        if missing:
+            raise ValueError(f"Key columns must be selected: {', '.join(missing)}")
+
+        self.connection = connection
+        self.source = source
+        self.columns = list(columns)
+        self.key_columns = list(key_columns)
+        self.where = where
+        self.params = list(params)
+        self.page_rows = page_rows
+        self.arraysize = arraysize
+        self.limit = limit
+        self.type_codes = None
+
+        self._key_index = [self.columns.index(key) for key in self.key_columns]
+
+    def _page_sql(self, first_page: bool) -> str:
+        conditions = []
+        if self.where:
+            conditions.append(f"({self.where})")
+        if not first_page:
+            conditions.append(f"({_keyset_predicate(self.key_columns)})")
+
+        sql = f"SELECT TOP (?) {', '.join(self.columns)} FROM {self.source}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql + f" ORDER BY {', '.join(self.key_columns)}"
+
+    def pages(self) -> Iterator[List[tuple]]:
+        """Yield pages of row tuples
+
+        Each page is read completely and its cursor closed before it is
+        yielded, so the caller may run other statements on the connection.
+        """
+        last_key = None
+        remaining = self.limit
+
+        while remaining is None or remaining > 0:
+            page_rows = self.page_rows if remaining is None else min(self.page_rows, remaining)
+            params = [page_rows] + self.params
+            if last_key is not None:
+                params += _keyset_params(last_key)
+
+            cursor = self.connection.cursor()
+            cursor.arraysize = self.arraysize
+
+            try:
+                cursor.execute(self._page_sql(last_key is None), params)
+                if self.type_codes is None:
+                    self.type_codes = [column[1] for column in cursor.description]
+
+                rows = []
+                while True:
+                    chunk = cursor.fetchmany()
+                    if not chunk:
+                        break
+                    rows.extend(chunk)
+
+            finally:
+                cursor.close()
+
+            if not rows:
+                return
+
+            yield rows
+
+            if len(rows) < page_rows:
+                return
+
+            last_key = [rows[-1][i] for i in self._key_index]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def arrays(self) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield each page as a dict of NumPy column arrays"""
+        for rows in self.pages():
+            yield {
+                column: _to_array(values, type_code)
+                for column, values, type_code in zip(self.columns, zip(*rows), self.type_codes)
+            }
+
+    def frames(self) -> Iterator[pd.DataFrame]:
+        """Yield each page as a pandas DataFrame"""
+        for arrays in self.arrays():
+            yield pd.DataFrame(arrays, columns=self.columns)
+
+
+def price_history(connection, metal_code: str = None, spread_ids: Sequence[int] = None,
+                  start: datetime = None, end: datetime = None, **options) -> KeysetQuery:
+    """Keyset query over lme_market.V_price_history ordered by (spread_id, timestamp)"""
+    conditions, params = [], []
+
+    if metal_code:
+        conditions.append("metal_code = ?")
+        params.append(metal_code)
+    if spread_ids:
+        conditions.append(f"spread_id IN ({', '.join('?' for _ in spread_ids)})")
+        params.extend(spread_ids)
+    if start:
+        conditions.append("timestamp >= ?")
+        params.append(start)
+    if end:
+        conditions.append("timestamp < ?")
+        params.append(end)
+
+    # tick_id breaks ties between ticks of a spread that share a timestamp
+    return KeysetQuery(
+        connection, 'lme_market.V_price_history', PRICE_HISTORY_COLUMNS,
+        ['spread_id', 'timestamp', 'tick_id'],
+        where=" AND ".join(conditions) or None, params=params, **options
+    )
+
+
+def daily_summary(connection, metal_code: str = None, start: date = None,
+                  end: date = None, **options) -> KeysetQuery:
+    """Keyset query over lme_market.V_daily_summary ordered by (spread_id, trading_date)"""
+    conditions, params = [], []
+
+    if metal_code:
+        conditions.append("metal_code = ?")
+        params.append(metal_code)
+    if start:
+        conditions.append("trading_date >= ?")
+        params.append(start)
+    if end:
+        conditions.append("trading_date < ?")
+        params.append(end)
+
+    return KeysetQuery(
+        connection, 'lme_market.V_daily_summary', DAILY_SUMMARY_COLUMNS,
+        ['spread_id', 'trading_date'],
+        where=" AND ".join(conditions) or None, params=params, **options
+    )
@@ -68,24 +68,29 @@ def main():
         stored = collector.store_spreads(spreads)
         print(f"✓ Stored {stored} spread definitions")
         
-        # 5. Get market data (in batches)
+        # 5. Get market data (in batches, stored by the write-behind writer)
         print("\n5. Getting market data...")
         batch_size = 100
         total_market_data = []
-        
-        for i in range(0, len(spreads), batch_size):
-            batch = spreads[i:i+batch_size]
-            print(f"  Processing batch {i//batch_size + 1}/{(len(spreads) + batch_size - 1)//batch_size}...")
-            
-            market_data = collector.get_market_data(batch)
-            total_market_data.extend(market_data)
-            
-            # Store this batch
-            if market_data:
-                stored = collector.store_tick_data(market_data)
-                print(f"    Stored {stored} tick records")
+        tick_writer = collector.start_tick_writer()
+        
+        try:
+            for i in range(0, len(spreads), batch_size):
+                batch = spreads[i:i+batch_size]
+                print(f"  Processing batch {i//batch_size + 1}/{(len(spreads) + batch_size - 1)//batch_size}...")
+                
+                market_data = collector.get_market_data(batch)
+                total_market_data.extend(market_data)
+                
+                # Queue this batch
+                if market_data:
+                    tick_writer.submit(market_data)
+                    print(f"    Queued {len(market_data)} tick records")
+        finally:
+            flushed = tick_writer.close()
         
         print(f"\n✓ Total market data collected: {len(total_market_data)} records")
+        print(f"✓ Tick records stored: {flushed}")
         
         # 6. Show summary
         print("\n6. Data Summary:")
@@ -101,14 +106,14 @@ def main():
             SELECT COUNT(*) FROM lme_market.LME_T_tick_data t
             JOIN lme_market.LME_M_spreads s ON t.spread_id = s.spread_id
             WHERE s.metal_id = 1 
-            AND CAST(t.timestamp AS DATE) = CAST(GETDATE() AS DATE)
+            AND t.tick_date = CAST(GETDATE() AS DATE)
         """)
         today_ticks = cursor.fetchone()[0]
         print(f"  Tick records collected today: {today_ticks}")
         
         # Active spreads
         cursor.execute("""
-            SELECT COUNT(DISTINCT ticker) 
+            SELECT COUNT(*) 
             FROM lme_market.V_latest_market_data 
             WHERE metal_code = 'CU' 
             AND data_freshness = 'Active'
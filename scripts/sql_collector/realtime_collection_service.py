@@ -7,190 +7,519 @@ This service runs continuously to collect real-time market data
 at different frequencies based on configuration.
 """
 
+import os
 import sys
 import time
+import socket
 import signal
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import threading
-import queue
 from concurrent.futures import ThreadPoolExecutor
-from sql_data_collector import SQLServerDataCollector
+from sql_data_collector_jcl import SQLServerDataCollectorJCL
+from collection_scheduler import CollectionScheduler
+from trading_calendar import TradingCalendar
+from collection_metrics import (
+    MetricsServer, TICK_WRITER_QUEUE_DEPTH, SCHEDULER_LAG_SECONDS,
+    COLLECTION_JOB_SECONDS, COLLECTION_JOBS, COLLECTION_SKIPPED_CYCLES, CycleTimings
+)
+
+
+# Attempts to release a job lease before leaving it to expire
+COMPLETE_ATTEMPTS = 3
 
 
 class RealtimeCollectionService:
     """Service for continuous real-time data collection"""
     
-    def __init__(self, config_path: str = "config.json"):
-        self.collector = SQLServerDataCollector(config_path)
+    def __init__(self, config_path: str = "config.jcl.json"):
+        self.collector = SQLServerDataCollectorJCL(config_path)
         self.running = False
         self.threads = []
-        self.task_queue = queue.Queue()
-        self.executor = ThreadPoolExecutor(max_workers=5)
         self.collection_schedules = {}
+        self.metal_locks = {}
+        self.job_results = {}
+        self.running_jobs = set()  # Claimed config_ids whose leases are renewed
+        self.results_lock = threading.Lock()
+        self.tick_writer = None
+        self.pool = None
+        self.summary_flush_minutes = self.collector.config.get('collection', {}).get('summary_flush_minutes', 5)
+        self.snapshot_lock = threading.Lock()
         self.logger = logging.getLogger('RealtimeService')
         
+        # Due schedules are dispatched to a bounded worker pool
+        collection_config = self.collector.config.get('collection', {})
+        self.worker_threads = collection_config.get('worker_threads', 5)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.worker_threads,
+            thread_name_prefix='CollectionWorker'
+        )
+        self.scheduler = CollectionScheduler(
+            self.executor,
+            self._run_scheduled_collection,
+            lag_warning_seconds=collection_config.get('lag_warning_seconds', 5),
+            logger=self.logger
+        )
+        
+        # Job leases let several collector nodes share the schedules
+        self.node_id = collection_config.get('node_name') or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = collection_config.get('lease_seconds', 120)
+        
+        # LME session timetable: closed-market suspension and burst windows
+        self.calendar = TradingCalendar(self.collector.config.get('sessions', {}), self.logger)
+        
+        # Embedded /metrics endpoint
+        self.metrics_config = self.collector.config.get('metrics', {})
+        self.metrics_server = None
+        
+        # Schedules and collection settings are re-read periodically or on SIGHUP
+        self.reload_minutes = collection_config.get('reload_minutes', 5)
+        self.reload_event = threading.Event()
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self._reload_signal_handler)
         
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         self.logger.info(f"Received signal {signum}, shutting down...")
         self.stop()
         
+    def _reload_signal_handler(self, signum, frame):
+        """Handle SIGHUP: reload schedules and configuration"""
+        self.logger.info("Received SIGHUP, reloading configuration")
+        self.reload_event.set()
+        
     def start(self):
         """Start the collection service"""
         self.logger.info("Starting Real-time Collection Service")
         
-        # Connect to database and Bloomberg
-        if not self.collector.connect_database():
-            self.logger.error("Failed to connect to database")
+        # Connection pool: every worker checks out its own connection
+        self.pool = self.collector.create_connection_pool()
+        
+        # Connect to database and load collection schedules
+        try:
+            with self.pool.connection() as connection:
+                self._load_collection_schedules(connection)
+                self.collector.load_intraday_summary(connection=connection)
+                self.collector.load_last_quotes(connection)
+        except Exception as e:
+            self.logger.error(f"Failed to connect to database: {e}")
             return False
             
         if not self.collector.start_bloomberg_session():
             self.logger.error("Failed to start Bloomberg session")
             return False
             
-        # Load collection schedules
-        self._load_collection_schedules()
+        # Write-behind writer for bulk tick stores
+        self.tick_writer = self.collector.start_tick_writer()
+        TICK_WRITER_QUEUE_DEPTH.set_function(self.tick_writer.queue.qsize)
+        
+        self._start_metrics_server()
         
         # Start collection threads
         self.running = True
         self._start_collection_threads()
         
-        self.logger.info("Service started successfully")
+        self.logger.info(f"Service started successfully ({self.calendar.describe()})")
         return True
         
-    def _load_collection_schedules(self):
+    def _start_metrics_server(self):
+        """Serve Prometheus-style metrics over HTTP if enabled"""
+        if not self.metrics_config.get('enabled', True):
+            return
+            
+        host = self.metrics_config.get('host', '127.0.0.1')
+        
+        try:
+            self.metrics_server = MetricsServer(host, self.metrics_config.get('port', 9108))
+            self.metrics_server.start()
+            self.logger.info(f"Metrics available at http://{host}:{self.metrics_server.port}/metrics")
+            
+        except OSError as e:
+            # Collection does not depend on the endpoint
+            self.logger.error(f"Could not start metrics server: {e}")
+            self.metrics_server = None
+            
+    def _load_collection_schedules(self, connection):
         """Load collection schedules from database"""
-        cursor = self.collector.connection.cursor()
+        self.collection_schedules = self.collector.get_collection_schedules(connection)
         
+        for schedule in self.collection_schedules.values():
+            self.metal_locks.setdefault(schedule['metal_code'], threading.Lock())
+            
+        self.logger.info(f"Loaded {len(self.collection_schedules)} collection schedules")
+        
+    def _reload_collection_schedules(self, connection):
+        """Apply added, removed and changed schedules to the running scheduler
+        
+        Running jobs are never interrupted: a removed job is not queued
+        again after its run, and a changed job keeps its run and picks up
+        the new interval when it completes.
+        """
+        loaded = self.collector.get_collection_schedules(connection)
+        added, removed, changed = 0, 0, 0
+        
+        for config_id in list(self.collection_schedules):
+            if config_id not in loaded:
+                self.scheduler.cancel(config_id)
+                del self.collection_schedules[config_id]
+                removed += 1
+                
+        for config_id, new in loaded.items():
+            self.metal_locks.setdefault(new['metal_code'], threading.Lock())
+            schedule = self.collection_schedules.get(config_id)
+            interval_seconds = new['interval_minutes'] * 60
+            
+            if schedule is None:
+                self.collection_schedules[config_id] = new
+                self.scheduler.schedule(config_id, new['next_run'], interval_seconds)
+                added += 1
+                
+            elif schedule['interval_minutes'] != new['interval_minutes']:
+                schedule['interval_minutes'] = new['interval_minutes']
+                
+                # A shorter interval should not wait for the next_run set with the old one
+                next_run = min(new['next_run'], (new['last_run'] or datetime.now()) + timedelta(seconds=interval_seconds))
+                if self.scheduler.reschedule(config_id, next_run, interval_seconds):
+                    schedule['next_run'] = next_run
+                changed += 1
+                
+        if added or removed or changed:
+            self.logger.info(f"Reloaded collection schedules: {added} added, {removed} removed, {changed} changed")
+            
+    def _reload_config(self):
+        """Re-read the configuration file and apply collection settings"""
+        collection_config = self.collector.reload_config().get('collection', {})
+        
+        self.summary_flush_minutes = collection_config.get('summary_flush_minutes', 5)
+        self.scheduler.lag_warning_seconds = collection_config.get('lag_warning_seconds', 5)
+        self.lease_seconds = collection_config.get('lease_seconds', 120)
+        self.reload_minutes = collection_config.get('reload_minutes', 5)
+        self.calendar = TradingCalendar(self.collector.config.get('sessions', {}), self.logger)
+        self.logger.info(f"Session timetable reloaded: {self.calendar.describe()}")
+        
+        if collection_config.get('worker_threads', 5) != self.worker_threads:
+            self.logger.warning("worker_threads changed; the new pool size applies after a restart")
+            
+    def reload(self):
+        """Reload configuration and schedules without dropping in-flight work or caches"""
         try:
-            cursor.execute("""
-                SELECT 
-                    cc.config_id,
-                    m.metal_code,
-                    cc.collection_type,
-                    cc.interval_minutes,
-                    cc.last_run,
-                    cc.next_run
-                FROM config.M_collection_config cc
-                JOIN config.M_metals m ON cc.metal_id = m.metal_id
-                WHERE cc.is_active = 1 AND m.is_active = 1
-            """)
-            
-            for row in cursor.fetchall():
-                config_id = row[0]
-                self.collection_schedules[config_id] = {
-                    'metal_code': row[1],
-                    'collection_type': row[2],
-                    'interval_minutes': row[3],
-                    'last_run': row[4],
-                    'next_run': row[5] or datetime.now()
-                }
+            self._reload_config()
+        except Exception as e:
+            self.logger.error(f"Error reloading configuration, keeping current settings: {e}")
+            
+        try:
+            with self.pool.connection() as connection:
+                self._reload_collection_schedules(connection)
                 
-            self.logger.info(f"Loaded {len(self.collection_schedules)} collection schedules")
+        except Exception as e:
+            self.logger.error(f"Error reloading collection schedules: {e}")
             
-        finally:
-            cursor.close()
+    def _reload_worker(self):
+        """Worker thread that reloads periodically or when SIGHUP arrives"""
+        while self.running:
+            self.reload_event.wait(self.reload_minutes * 60)
+            self.reload_event.clear()
             
+            if self.running:
+                self.reload()
+                
     def _start_collection_threads(self):
-        """Start threads for different collection types"""
-        # High-frequency collection thread (active spreads)
-        realtime_thread = threading.Thread(
-            target=self._collection_worker,
-            args=('REALTIME',),
-            name='RealtimeCollector'
+        """Start the scheduler and background threads"""
+        for config_id, schedule in self.collection_schedules.items():
+            self.scheduler.schedule(config_id, schedule['next_run'], schedule['interval_minutes'] * 60)
+            
+        # Scheduler thread: sleeps until the next schedule is due
+        scheduler_thread = threading.Thread(
+            target=self.scheduler.run,
+            name='CollectionScheduler'
         )
-        realtime_thread.start()
-        self.threads.append(realtime_thread)
-        
-        # Regular collection thread (all spreads)
-        regular_thread = threading.Thread(
-            target=self._collection_worker,
-            args=('REGULAR',),
-            name='RegularCollector'
+        scheduler_thread.start()
+        self.threads.append(scheduler_thread)
+        
+        # Intraday summary flush thread
+        summary_thread = threading.Thread(
+            target=self._summary_worker,
+            name='SummaryFlusher'
         )
-        regular_thread.start()
-        self.threads.append(regular_thread)
-        
-        # Daily maintenance thread
-        daily_thread = threading.Thread(
-            target=self._collection_worker,
-            args=('DAILY',),
-            name='DailyCollector'
+        summary_thread.start()
+        self.threads.append(summary_thread)
+        
+        # Lease renewal thread for running jobs
+        lease_thread = threading.Thread(
+            target=self._lease_worker,
+            name='LeaseKeeper'
         )
-        daily_thread.start()
-        self.threads.append(daily_thread)
+        lease_thread.start()
+        self.threads.append(lease_thread)
         
-    def _collection_worker(self, collection_type: str):
-        """Worker thread for a specific collection type"""
-        self.logger.info(f"Started {collection_type} collection worker")
+        # Configuration and schedule reload thread
+        reload_thread = threading.Thread(
+            target=self._reload_worker,
+            name='ConfigReloader'
+        )
+        reload_thread.start()
+        self.threads.append(reload_thread)
         
-        while self.running:
+    def _run_scheduled_collection(self, config_id: int) -> bool:
+        """Run one due schedule on a worker, then queue its next run
+        
+        Returns False if the job was deferred instead of run.
+        """
+        schedule = self.collection_schedules.get(config_id)
+        if schedule is None:
+            return False
+            
+        # Market-data jobs wait for the next session while the market is closed
+        suspended_until = self.calendar.suspended_until(schedule['collection_type'])
+        if suspended_until is not None:
+            self.logger.info(
+                f"{schedule['collection_type']} collection for {schedule['metal_code']} "
+                f"suspended until {suspended_until:%Y-%m-%d %H:%M}"
+            )
+            schedule['next_run'] = suspended_until
+            if self.running and self.collection_schedules.get(config_id) is schedule:
+                self.scheduler.schedule(config_id, suspended_until, schedule['interval_minutes'] * 60)
+            return False
+            
+        # One job per metal at a time; a busy metal is retried shortly
+        metal_lock = self.metal_locks[schedule['metal_code']]
+        if not metal_lock.acquire(blocking=False):
+            if self.running:
+                self.scheduler.schedule(config_id, datetime.now() + timedelta(seconds=5))
+            return False
+            
+        try:
+            ran = self._claim_job(config_id, schedule)
+            if ran:
+                lag = max(0.0, (datetime.now() - schedule['next_run']).total_seconds())
+                SCHEDULER_LAG_SECONDS.observe(
+                    lag, metal=schedule['metal_code'], collection_type=schedule['collection_type']
+                )
+                with self.results_lock:
+                    self.running_jobs.add(config_id)
+                try:
+                    self._process_collection(config_id, schedule)
+                finally:
+                    with self.results_lock:
+                        self.running_jobs.discard(config_id)
+        finally:
+            metal_lock.release()
+        
+        # Schedules removed by a reload are not queued again
+        if self.running and self.collection_schedules.get(config_id) is schedule:
+            self.scheduler.schedule(config_id, schedule['next_run'], schedule['interval_minutes'] * 60)
+            
+        return ran
+        
+    def _claim_job(self, config_id: int, schedule: Dict) -> bool:
+        """Lease a due job in the database so that only one node runs it"""
+        try:
+            with self.pool.connection() as connection:
+                if self.collector.claim_collection_jobs(self.node_id, self.lease_seconds, config_id, connection):
+                    return True
+                next_run, lease_expires = self.collector.get_collection_lease(config_id, connection)
+                
+        except Exception as e:
+            self.logger.error(f"Error claiming collection job {config_id}: {e}")
+            schedule['next_run'] = datetime.now() + timedelta(seconds=30)
+            return False
+            
+        # Another node ran or is running the job; follow the database schedule
+        retry_at = datetime.now() + timedelta(seconds=5)
+        schedule['next_run'] = max(t for t in (next_run, lease_expires, retry_at) if t is not None)
+        self.logger.debug(f"Collection job {config_id} is leased elsewhere; next check at {schedule['next_run']}")
+        return False
+        
+    def _complete_job(self, config_id: int, schedule: Dict, succeeded: bool) -> Tuple[datetime, int]:
+        """Release a job lease; returns the job's next run time and skipped cycles"""
+        next_run, skipped = self.calendar.next_run(
+            schedule['collection_type'], schedule['next_run'], schedule['interval_minutes'] * 60
+        )
+        
+        # Retried: a lease left behind blocks the job until it expires
+        for attempt in range(COMPLETE_ATTEMPTS):
             try:
-                # Check which schedules are due
-                now = datetime.now()
-                due_schedules = []
+                with self.pool.connection() as connection:
+                    completed = self.collector.complete_collection_job(
+                        config_id, self.node_id, succeeded, connection,
+                        next_run=next_run if succeeded else None
+                    )
+                if completed is not None:
+                    return (completed[0], skipped) if succeeded else completed
+                self.logger.warning(f"Lease on collection job {config_id} expired before the job completed")
+                break
                 
-                for config_id, schedule in self.collection_schedules.items():
-                    if (schedule['collection_type'] == collection_type and 
-                        schedule['next_run'] <= now):
-                        due_schedules.append((config_id, schedule))
+            except Exception as e:
+                self.logger.error(
+                    f"Error completing collection job {config_id} (attempt {attempt + 1}/{COMPLETE_ATTEMPTS}): {e}"
+                )
+                if attempt + 1 < COMPLETE_ATTEMPTS:
+                    time.sleep(2 ** attempt)
+                    
+        if succeeded:
+            return next_run, skipped
+        return datetime.now() + timedelta(seconds=30), 0
+        
+    def _lease_worker(self):
+        """Worker thread that extends the leases of running jobs"""
+        next_renewal = time.monotonic() + self.lease_seconds / 3
+        
+        while self.running:
+            if time.monotonic() >= next_renewal:
+                with self.results_lock:
+                    running = list(self.running_jobs)
+                    
+                try:
+                    with self.pool.connection() as connection:
+                        self.collector.renew_collection_leases(
+                            self.node_id, self.lease_seconds, running, connection
+                        )
                         
-                # Process due schedules
-                for config_id, schedule in due_schedules:
-                    self._process_collection(config_id, schedule)
+                except Exception as e:
+                    self.logger.error(f"Error renewing collection leases: {e}")
                     
-                # Sleep for a short interval
-                time.sleep(10)  # Check every 10 seconds
+                next_renewal = time.monotonic() + self.lease_seconds / 3
                 
-            except Exception as e:
-                self.logger.error(f"Error in {collection_type} worker: {e}")
-                time.sleep(30)  # Wait before retrying
+            time.sleep(1)
+            
+    def _summary_worker(self):
+        """Worker thread that flushes intraday summaries periodically"""
+        self.logger.info("Started intraday summary worker")
+        next_flush = datetime.now() + timedelta(minutes=self.summary_flush_minutes)
+        
+        while self.running:
+            if datetime.now() >= next_flush:
+                self._flush_intraday_summary()
+                next_flush = datetime.now() + timedelta(minutes=self.summary_flush_minutes)
                 
+            time.sleep(10)
+            
+    def _flush_intraday_summary(self):
+        """Merge changed intraday summaries into LME_T_daily_summary"""
+        if self.pool is None:
+            return
+            
+        try:
+            with self.pool.connection() as connection:
+                merged = self.collector.flush_intraday_summary(connection)
+            if merged:
+                self.logger.info(f"Flushed {merged} intraday summaries")
+                
+        except Exception as e:
+            self.logger.error(f"Error flushing intraday summaries: {e}")
+            
+    def _write_activity_snapshot(self):
+        """Replace the spread activity snapshot read by the monitoring views"""
+        try:
+            with self.snapshot_lock, self.pool.connection() as connection:
+                self.collector.store_activity_snapshot(connection)
+                
+        except Exception as e:
+            self.logger.error(f"Error writing activity snapshot: {e}")
+            
     def _process_collection(self, config_id: int, schedule: Dict):
-        """Process a single collection task"""
+        """Process a single collection task and record its result"""
         metal_code = schedule['metal_code']
         collection_type = schedule['collection_type']
+        result = {
+            'metal_code': metal_code,
+            'collection_type': collection_type,
+            'started': datetime.now(),
+            'finished': None,
+            'status': 'RUNNING',
+            'error': None,
+            'skipped_cycles': 0
+        }
+        with self.results_lock:
+            self.job_results[config_id] = result
+        timings = CycleTimings()
         
         self.logger.info(f"Starting {collection_type} collection for {metal_code}")
         
         try:
             if collection_type == 'REALTIME':
-                self._collect_active_spreads(metal_code)
+                self._collect_active_spreads(metal_code, timings)
             elif collection_type == 'REGULAR':
-                self._collect_all_spreads(metal_code)
+                self._collect_all_spreads(metal_code, timings)
             elif collection_type == 'DAILY':
-                self._daily_maintenance(metal_code)
+                self._daily_maintenance(metal_code, timings)
                 
-            # Update schedule
-            self.collector.update_collection_status(metal_code, collection_type)
+            result['status'] = 'SUCCESS'
+            
+        except Exception as e:
+            self.logger.error(f"Error in {collection_type} collection for {metal_code}: {e}")
+            result['status'] = 'FAILED'
+            result['error'] = str(e)
+            
+        timings.finish(metal_code, collection_type)
+        self._record_cycle_metrics(config_id, schedule, result['status'], timings)
             
-            # Update local schedule
+        # Release the lease; next_run stays on the interval grid and
+        # cycles that passed during an overrun are skipped, not queued
+        succeeded = result['status'] == 'SUCCESS'
+        schedule['next_run'], skipped = self._complete_job(config_id, schedule, succeeded)
+        self.scheduler.record_skipped(config_id, skipped)
+        result['skipped_cycles'] = skipped
+        result['finished'] = datetime.now()
+        
+        labels = {'metal': metal_code, 'collection_type': collection_type}
+        COLLECTION_JOB_SECONDS.observe((result['finished'] - result['started']).total_seconds(), **labels)
+        COLLECTION_JOBS.inc(status=result['status'], **labels)
+        if skipped:
+            COLLECTION_SKIPPED_CYCLES.inc(skipped, **labels)
+        
+        if succeeded:
             schedule['last_run'] = datetime.now()
-            schedule['next_run'] = datetime.now() + timedelta(minutes=schedule['interval_minutes'])
+            
+            # Refresh the monitoring snapshot from in-memory state
+            self._write_activity_snapshot()
             
             self.logger.info(f"Completed {collection_type} collection for {metal_code}")
             
+    def _record_cycle_metrics(self, config_id: int, schedule: Dict, status: str, timings: CycleTimings):
+        """Persist the stage timings of a cycle to LME_T_collection_metrics"""
+        try:
+            with self.pool.connection() as connection:
+                self.collector.store_collection_metrics(
+                    schedule['metal_code'], schedule['collection_type'], status, timings,
+                    config_id=config_id, node_name=self.node_id, connection=connection
+                )
+                
         except Exception as e:
-            self.logger.error(f"Error in {collection_type} collection for {metal_code}: {e}")
+            self.logger.error(f"Error recording collection metrics: {e}")
+            
+    def get_job_results(self) -> Dict[int, Dict]:
+        """Latest result of each collection job, keyed by config_id"""
+        with self.results_lock:
+            return {config_id: dict(result) for config_id, result in self.job_results.items()}
             
-    def _collect_active_spreads(self, metal_code: str):
+    def get_job_stats(self) -> Dict[int, Dict]:
+        """Lag, duration, overrun and skipped-cycle statistics per config_id"""
+        return self.scheduler.job_stats()
+            
+    def _collect_active_spreads(self, metal_code: str, timings: CycleTimings):
         """Collect data for active spreads only"""
-        # Get spreads that have been active in the last hour
-        active_spreads = self.collector.get_active_spreads(metal_code, hours=1)
+        # Get spreads that have been active within the active window
+        with self.pool.connection() as connection:
+            active_spreads = self.collector.get_active_spreads(
+                metal_code, hours=self.collector.active_hours, connection=connection
+            )
         
         if not active_spreads:
             self.logger.info(f"No active spreads found for {metal_code}")
             return
             
         self.logger.info(f"Collecting data for {len(active_spreads)} active {metal_code} spreads")
+        timings.spread_count = len(active_spreads)
         
         # Get market data
-        market_data = self.collector.get_market_data(active_spreads)
+        with timings.stage('fetch'):
+            market_data = self.collector.get_market_data(active_spreads)
         
         # Filter only spreads with current bid/ask
         current_data = [
@@ -200,56 +529,43 @@ class RealtimeCollectionService:
         
         # Store tick data
         if current_data:
-            stored = self.collector.store_tick_data(current_data)
+            timings.tick_count = len(current_data)
+            with timings.stage('store_ticks'), self.pool.connection() as connection:
+                stored = self.collector.store_tick_data(current_data, connection)
             self.logger.info(f"Stored {stored} tick records for active {metal_code} spreads")
             
-    def _collect_all_spreads(self, metal_code: str):
+    def _collect_all_spreads(self, metal_code: str, timings: CycleTimings):
         """Collect data for all spreads"""
-        cursor = self.collector.connection.cursor()
+        # Get all active spreads from the registry
+        with self.pool.connection() as connection:
+            all_spreads = self.collector.get_spreads(metal_code, connection=connection)
+            
+        self.logger.info(f"Collecting data for {len(all_spreads)} {metal_code} spreads")
+        timings.spread_count = len(all_spreads)
         
-        try:
-            # Get all active spreads
-            cursor.execute("""
-                SELECT spread_id, ticker, spread_type, description
-                FROM market.M_spreads s
-                JOIN config.M_metals m ON s.metal_id = m.metal_id
-                WHERE m.metal_code = ? AND s.is_active = 1
-            """, (metal_code,))
-            
-            all_spreads = []
-            for row in cursor.fetchall():
-                all_spreads.append({
-                    'spread_id': row[0],
-                    'ticker': row[1],
-                    'spread_type': row[2],
-                    'description': row[3],
-                    'metal_code': metal_code
-                })
-                
-            self.logger.info(f"Collecting data for {len(all_spreads)} {metal_code} spreads")
+        # Process in batches
+        batch_size = 100
+        for i in range(0, len(all_spreads), batch_size):
+            batch = all_spreads[i:i+batch_size]
             
-            # Process in batches
-            batch_size = 100
-            for i in range(0, len(all_spreads), batch_size):
-                batch = all_spreads[i:i+batch_size]
-                
-                # Get market data
+            # Get market data
+            with timings.stage('fetch'):
                 market_data = self.collector.get_market_data(batch)
-                
-                # Store tick data
-                if market_data:
-                    stored = self.collector.store_tick_data(market_data)
-                    self.logger.info(f"Stored {stored} records for batch {i//batch_size + 1}")
-                    
-        finally:
-            cursor.close()
             
-    def _daily_maintenance(self, metal_code: str):
+            # Hand off to the write-behind writer and fetch the next batch
+            # (store_ticks is the hand-off time, including waits on a full queue)
+            if market_data:
+                timings.tick_count += len(market_data)
+                with timings.stage('store_ticks'):
+                    self.tick_writer.submit(market_data)
+                self.logger.info(f"Queued {len(market_data)} records for batch {i//batch_size + 1}")
+            
+    def _daily_maintenance(self, metal_code: str, timings: CycleTimings):
         """Perform daily maintenance tasks"""
         self.logger.info(f"Starting daily maintenance for {metal_code}")
         
         # 1. Search for new spreads
-        self._search_new_spreads(metal_code)
+        self._search_new_spreads(metal_code, timings)
         
         # 2. Update prompt dates
         self._update_prompt_dates(metal_code)
@@ -260,16 +576,19 @@ class RealtimeCollectionService:
         # 4. Mark inactive spreads
         self._mark_inactive_spreads(metal_code)
         
-    def _search_new_spreads(self, metal_code: str):
+    def _search_new_spreads(self, metal_code: str, timings: CycleTimings):
         """Search for new spreads that may have been created"""
         self.logger.info(f"Searching for new {metal_code} spreads")
         
         # Search for spreads
-        spreads = self.collector.search_spreads(metal_code)
+        with timings.stage('search'):
+            spreads = self.collector.search_spreads(metal_code)
+        timings.spread_count = len(spreads)
         
         # Store any new spreads found
         if spreads:
-            stored = self.collector.store_spreads(spreads)
+            with timings.stage('store_spreads'), self.pool.connection() as connection:
+                stored = self.collector.store_spreads(spreads, connection)
             self.logger.info(f"Found and stored {stored} new {metal_code} spreads")
             
     def _update_prompt_dates(self, metal_code: str):
@@ -280,68 +599,33 @@ class RealtimeCollectionService:
         
     def _calculate_daily_summaries(self, metal_code: str):
         """Calculate daily summary statistics"""
-        cursor = self.collector.connection.cursor()
-        
         try:
-            cursor.execute("""
-                EXEC market.sp_CalculateDailySummary 
-                    @trading_date = NULL,
-                    @metal_id = (SELECT metal_id FROM config.M_metals WHERE metal_code = ?)
-            """, (metal_code,))
-            
-            result = cursor.fetchone()
-            if result:
-                self.logger.info(f"Calculated {result[0]} daily summaries for {metal_code}")
-                
-            self.collector.connection.commit()
+            with self.pool.connection() as connection:
+                calculated = self.collector.calculate_daily_summaries(metal_code, connection)
+            self.logger.info(f"Calculated {calculated} daily summaries for {metal_code}")
             
         except Exception as e:
             self.logger.error(f"Error calculating daily summaries: {e}")
-            self.collector.connection.rollback()
-            
-        finally:
-            cursor.close()
             
     def _mark_inactive_spreads(self, metal_code: str):
         """Mark spreads as inactive if no data for extended period"""
-        cursor = self.collector.connection.cursor()
-        
         try:
             # Mark spreads inactive if no data for 30 days
-            cursor.execute("""
-                UPDATE s
-                SET s.is_active = 0,
-                    s.updated_at = GETDATE()
-                FROM market.M_spreads s
-                JOIN config.M_metals m ON s.metal_id = m.metal_id
-                WHERE m.metal_code = ?
-                AND s.is_active = 1
-                AND NOT EXISTS (
-                    SELECT 1 
-                    FROM market.T_tick_data t 
-                    WHERE t.spread_id = s.spread_id 
-                    AND t.timestamp > DATEADD(DAY, -30, GETDATE())
-                )
-            """, (metal_code,))
-            
-            inactive_count = cursor.rowcount
+            with self.pool.connection() as connection:
+                inactive_count = self.collector.mark_inactive_spreads(metal_code, 30, connection)
             if inactive_count > 0:
                 self.logger.info(f"Marked {inactive_count} {metal_code} spreads as inactive")
                 
-            self.collector.connection.commit()
-            
         except Exception as e:
             self.logger.error(f"Error marking inactive spreads: {e}")
-            self.collector.connection.rollback()
-            
-        finally:
-            cursor.close()
             
     def stop(self):
         """Stop the collection service"""
         self.logger.info("Stopping Real-time Collection Service")
         
         self.running = False
+        self.scheduler.stop()
+        self.reload_event.set()
         
         # Wait for threads to finish
         for thread in self.threads:
@@ -350,9 +634,28 @@ class RealtimeCollectionService:
         # Shutdown executor
         self.executor.shutdown(wait=True)
         
+        # Drain queued tick data
+        if self.tick_writer:
+            TICK_WRITER_QUEUE_DEPTH.remove_function()
+            flushed = self.tick_writer.close()
+            self.logger.info(f"Tick writer flushed {flushed} records")
+            self.tick_writer = None
+            
+        # Persist the final intraday summaries
+        self._flush_intraday_summary()
+            
+        # Close pooled database connections
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            
         # Close connections
         self.collector.close()
         
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        
         self.logger.info("Service stopped")
         
     def run(self):
@@ -377,7 +680,7 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='LME Metal Spreads Real-time Collection Service')
-    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    parser.add_argument('--config', default='config.jcl.json', help='Configuration file path')
     args = parser.parse_args()
     
     # Setup logging
@@ -0,0 +1,158 @@
+"""
+Process-local spread metadata registry for the LME collectors
+Version: 1.0
+Date: 2025-07-25
+
+Loads lme_market.LME_M_spreads once and afterwards refreshes only the rows
+whose updated_at moved past the last watermark, so collection cycles and
+maintenance scripts can look up spreads and spread_ids without a query.
+"""
+
+import threading
+import time
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+# Columns cached per spread, in query order
+SPREAD_COLUMNS = [
+    'spread_id', 'metal_code', 'ticker', 'spread_type', 'description',
+    'prompt_date1', 'prompt_date2', 'leg1_description', 'leg2_description',
+    'is_active', 'last_seen_date'
+]
+
+# lme_market.LME_SpreadDataType column order
+UPSERT_COLUMNS = [
+    'metal_code', 'ticker', 'spread_type', 'description',
+    'prompt_date1', 'prompt_date2', 'leg1_description', 'leg2_description'
+]
+
+# Columns sp_BulkUpsertSpreads updates only from non-NULL input
+MERGED_COLUMNS = ['description', 'prompt_date1', 'prompt_date2', 'leg1_description', 'leg2_description']
+
+# Re-read rows this far behind the watermark to catch late commits
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+
+class SpreadRegistry:
+    """Cache of spread metadata keyed by (metal_code, ticker) and spread_id"""
+
+    def __init__(self, refresh_seconds: float = 60):
+        self.refresh_seconds = refresh_seconds
+        self.watermark: Optional[datetime] = None
+        self._row_count = 0
+        self._last_poll = None
+        self._by_key: Dict[Tuple[str, str], Dict] = {}
+        self._by_id: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def loaded(self) -> bool:
+        return self._last_poll is not None
+
+    def _store(self, spread: Dict):
+        self._by_key[(spread['metal_code'], spread['ticker'])] = spread
+        self._by_id[spread['spread_id']] = spread
+
+    def _load_rows(self, cursor, since: Optional[datetime] = None):
+        query = f"""
+            SELECT {', '.join('m.metal_code' if c == 'metal_code' else 's.' + c for c in SPREAD_COLUMNS)}
+            FROM lme_market.LME_M_spreads s
+            JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+        """
+        if since is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query + " WHERE s.updated_at >= ?", (since - WATERMARK_OVERLAP,))
+
+        rows = cursor.fetchall()
+        with self._lock:
+            for row in rows:
+                spread = dict(zip(SPREAD_COLUMNS, row))
+                spread['is_active'] = bool(spread['is_active'])
+                self._store(spread)
+        return len(rows)
+
+    def refresh(self, connection, force: bool = False) -> int:
+        """Poll MAX(updated_at) and reload changed rows; returns rows reloaded"""
+        if not force and self.loaded and time.monotonic() - self._last_poll < self.refresh_seconds:
+            return 0
+
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("SELECT MAX(updated_at), COUNT(*) FROM lme_market.LME_M_spreads")
+            watermark, row_count = cursor.fetchone()
+
+            if not self.loaded:
+                reloaded = self._load_rows(cursor)
+            elif watermark != self.watermark or row_count != self._row_count:
+                reloaded = self._load_rows(cursor, self.watermark)
+            else:
+                reloaded = 0
+
+            self.watermark = watermark
+            self._row_count = row_count
+            self._last_poll = time.monotonic()
+            return reloaded
+
+        finally:
+            cursor.close()
+
+    def get(self, metal_code: str, ticker: str) -> Optional[Dict]:
+        """Cached spread by metal and ticker"""
+        return self._by_key.get((metal_code, ticker))
+
+    def get_by_id(self, spread_id: int) -> Optional[Dict]:
+        """Cached spread by spread_id"""
+        return self._by_id.get(spread_id)
+
+    def spreads_for_metal(self, metal_code: str, active_only: bool = True) -> List[Dict]:
+        """Copies of the cached spreads of one metal, ordered by spread_id"""
+        with self._lock:
+            spreads = [
+                dict(spread) for spread in self._by_id.values()
+                if spread['metal_code'] == metal_code and (spread['is_active'] or not active_only)
+            ]
+        return sorted(spreads, key=lambda spread: spread['spread_id'])
+
+    def all_spreads(self, active_only: bool = True) -> List[Dict]:
+        """Copies of all cached spreads"""
+        with self._lock:
+            return [
+                dict(spread) for spread in self._by_id.values()
+                if spread['is_active'] or not active_only
+            ]
+
+    def needs_upsert(self, row: Dict, today: date = None) -> bool:
+        """True if upserting this UPSERT_COLUMNS row would insert or change the spread"""
+        cached = self.get(row['metal_code'], row['ticker'])
+        if cached is None:
+            return True
+
+        # last_seen_date is advanced by the first upsert of each day
+        if cached['last_seen_date'] != (today or date.today()):
+            return True
+        if cached['spread_type'] != row['spread_type']:
+            return True
+
+        return any(
+            row[column] is not None and row[column] != cached[column]
+            for column in MERGED_COLUMNS
+        )
+
+    def register(self, row: Dict, spread_id: int):
+        """Record an UPSERT_COLUMNS row just written by sp_BulkUpsertSpreads"""
+        with self._lock:
+            entry = dict(self._by_id.get(spread_id, {'is_active': True}))
+            entry['spread_id'] = spread_id
+            for column in UPSERT_COLUMNS:
+                if row[column] is not None or column not in MERGED_COLUMNS:
+                    entry[column] = row[column]
+                else:
+                    entry.setdefault(column, None)
+            entry['last_seen_date'] = date.today()
+            self._store(entry)
@@ -16,6 +16,23 @@ from typing import List, Dict, Tuple, Optional
 import pandas as pd
 from pathlib import Path
 import time
+from last_quote_table import LastQuoteTable
+from tick_writer import TickWriter
+from connection_pool import ConnectionPool
+from intraday_summary import IntradaySummaryEngine
+from spread_registry import SpreadRegistry, UPSERT_COLUMNS
+from collection_metrics import (
+    BLOOMBERG_REQUEST_SECONDS, BLOOMBERG_SECURITIES_PER_REQUEST, BLOOMBERG_DECODE_SECONDS,
+    BLOOMBERG_RATE_LIMIT_WAIT_SECONDS, DB_WRITE_SECONDS, TICK_ROWS, CycleTimings
+)
+
+
+# Reference data fields requested for every spread
+MARKET_DATA_FIELDS = [
+    "BID", "ASK", "LAST_PRICE", "BID_SIZE", "ASK_SIZE",
+    "VOLUME", "TRADING_DT_REALTIME", "LAST_UPDATE_DT",
+    "OPEN_INT", "RT_SPREAD_BP", "CONTRACT_VALUE"
+]
 
 
 class SQLServerDataCollectorJCL:
@@ -23,6 +40,7 @@ class SQLServerDataCollectorJCL:
     
     def __init__(self, config_path: str = "config.json"):
         """Initialize collector with configuration"""
+        self.config_path = config_path
         self.config = self._load_config(config_path)
         self.connection = None
         self.session = None
@@ -33,6 +51,22 @@ class SQLServerDataCollectorJCL:
         # Schema prefix for JCL database
         self.schema_prefix = self.config.get('database', {}).get('schema_prefix', 'lme_')
         
+        # Change-only tick persistence
+        collection_config = self.config.get('collection', {})
+        self.change_only = collection_config.get('change_only', True)
+        self.active_hours = collection_config.get('active_hours', 1)
+        self.last_quotes = LastQuoteTable(self._heartbeat_minutes(collection_config))
+        
+        # Running daily summaries, fed by every stored tick batch
+        self.intraday_summary = IntradaySummaryEngine()
+        
+        # Nodes sharing the jobs only see their own ticks; summaries and the
+        # activity snapshot are then computed in the database (restart to change)
+        self.multi_node = collection_config.get('multi_node', False)
+        
+        # Spread metadata cache, refreshed from LME_M_spreads.updated_at
+        self.spread_registry = SpreadRegistry(collection_config.get('registry_refresh_seconds', 60))
+        
         # Metal codes mapping
         self.metal_configs = {
             'CU': {'base': 'LMCADS', 'name': 'Copper'},
@@ -48,6 +82,40 @@ class SQLServerDataCollectorJCL:
         with open(config_path, 'r') as f:
             return json.load(f)
             
+    def reload_config(self) -> dict:
+        """Re-read the configuration file and apply collection settings in place
+        
+        Database, Bloomberg and logging settings (and pool sizes) only take
+        effect on restart; caches are kept.
+        """
+        self.config = self._load_config(self.config_path)
+        
+        collection_config = self.config.get('collection', {})
+        self.change_only = collection_config.get('change_only', True)
+        self.active_hours = collection_config.get('active_hours', 1)
+        self.last_quotes.heartbeat = timedelta(minutes=self._heartbeat_minutes(collection_config))
+        self.spread_registry.refresh_seconds = collection_config.get('registry_refresh_seconds', 60)
+        
+        return self.config
+        
+    def _heartbeat_minutes(self, collection_config: dict) -> float:
+        """Heartbeat interval, capped at half of the REALTIME active window
+        
+        Unchanged quotes are not stored, so a quiet spread stays in the
+        active window (LME_M_spreads.last_quote_at) only through its
+        heartbeat ticks.
+        """
+        heartbeat_minutes = collection_config.get('heartbeat_minutes', 15)
+        limit_minutes = collection_config.get('active_hours', 1) * 60 / 2
+        
+        if heartbeat_minutes > limit_minutes:
+            self.logger.warning(
+                f"heartbeat_minutes {heartbeat_minutes} exceeds half of active_hours; using {limit_minutes:g}"
+            )
+            return limit_minutes
+            
+        return heartbeat_minutes
+        
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
         log_config = self.config.get('logging', {})
@@ -82,32 +150,37 @@ class SQLServerDataCollectorJCL:
         
         return logger
         
+    def create_connection(self) -> pyodbc.Connection:
+        """Open a new SQL Server connection from the database config"""
+        db_config = self.config['database']
+        
+        if db_config.get('trusted_connection', True):
+            conn_string = (
+                f"Driver={{{db_config['driver']}}};"
+                f"Server={db_config['server']};"
+                f"Database={db_config['database']};"
+                f"Trusted_Connection=yes;"
+            )
+        else:
+            conn_string = (
+                f"Driver={{{db_config['driver']}}};"
+                f"Server={db_config['server']};"
+                f"Database={db_config['database']};"
+                f"UID={db_config['username']};"
+                f"PWD={db_config['password']};"
+            )
+            
+        connection = pyodbc.connect(
+            conn_string,
+            timeout=db_config.get('connection_timeout', 30)
+        )
+        connection.timeout = db_config.get('query_timeout', 300)
+        return connection
+        
     def connect_database(self) -> bool:
         """Connect to SQL Server database"""
         try:
-            db_config = self.config['database']
-            
-            if db_config.get('trusted_connection', True):
-                conn_string = (
-                    f"Driver={{{db_config['driver']}}};"
-                    f"Server={db_config['server']};"
-                    f"Database={db_config['database']};"
-                    f"Trusted_Connection=yes;"
-                )
-            else:
-                conn_string = (
-                    f"Driver={{{db_config['driver']}}};"
-                    f"Server={db_config['server']};"
-                    f"Database={db_config['database']};"
-                    f"UID={db_config['username']};"
-                    f"PWD={db_config['password']};"
-                )
-                
-            self.connection = pyodbc.connect(
-                conn_string,
-                timeout=db_config.get('connection_timeout', 30)
-            )
-            self.connection.timeout = db_config.get('query_timeout', 300)
+            self.connection = self.create_connection()
             
             self.logger.info(f"Successfully connected to JCL database")
             return True
@@ -155,19 +228,8 @@ class SQLServerDataCollectorJCL:
             self.logger.error(f"Unknown metal code: {metal_code}")
             return []
             
-        base_ticker = self.metal_configs[metal_code]['base']
-        
         if search_patterns is None:
-            # Default search patterns
-            search_patterns = [
-                base_ticker,
-                f"{base_ticker} F", f"{base_ticker} G", f"{base_ticker} H",
-                f"{base_ticker} J", f"{base_ticker} K", f"{base_ticker} M",
-                f"{base_ticker} N", f"{base_ticker} Q", f"{base_ticker} U",
-                f"{base_ticker} V", f"{base_ticker} X", f"{base_ticker} Z",
-                f"{base_ticker} 03", f"{base_ticker} 00",
-                f"{base_ticker} 25", f"{base_ticker} 26"
-            ]
+            search_patterns = self.search_patterns(metal_code)
             
         all_spreads = []
         seen_tickers = set()
@@ -178,41 +240,74 @@ class SQLServerDataCollectorJCL:
             request.set("yellowKeyFilter", "YK_FILTER_CMDT")
             request.set("maxResults", 1000)
             
-            self.session.sendRequest(request)
+            # Per-request queue: collection jobs for other metals share the session
+            event_queue = blpapi.EventQueue()
+            started = time.perf_counter()
+            decode_seconds = 0.0
+            self.session.sendRequest(request, eventQueue=event_queue)
             
             while True:
-                event = self.session.nextEvent()
+                event = event_queue.nextEvent()
                 
                 if event.eventType() in [blpapi.Event.RESPONSE, blpapi.Event.PARTIAL_RESPONSE]:
+                    decode_started = time.perf_counter()
                     for msg in event:
-                        if msg.hasElement("results"):
-                            results = msg.getElement("results")
-                            
-                            for i in range(results.numValues()):
-                                result = results.getValueAsElement(i)
-                                
-                                if result.hasElement("security"):
-                                    ticker = result.getElementAsString("security")
-                                    
-                                    if ticker not in seen_tickers and self._is_spread(ticker):
-                                        seen_tickers.add(ticker)
-                                        
-                                        spread_info = {
-                                            'ticker': ticker.replace('<cmdty>', ' Comdty'),
-                                            'metal_code': metal_code,
-                                            'spread_type': self._classify_spread_type(ticker),
-                                            'description': result.getElementAsString("description") 
-                                                         if result.hasElement("description") else ""
-                                        }
-                                        
-                                        all_spreads.append(spread_info)
-                                        
+                        all_spreads.extend(self.parse_instrument_results(msg, metal_code, seen_tickers))
+                    decode_seconds += time.perf_counter() - decode_started
+                        
                 if event.eventType() == blpapi.Event.RESPONSE:
                     break
                     
+            BLOOMBERG_REQUEST_SECONDS.observe(
+                time.perf_counter() - started - decode_seconds, metal=metal_code, request='instruments'
+            )
+            BLOOMBERG_DECODE_SECONDS.observe(decode_seconds, metal=metal_code, request='instruments')
+            
         self.logger.info(f"Found {len(all_spreads)} spreads for {metal_code}")
         return all_spreads
         
+    def search_patterns(self, metal_code: str) -> List[str]:
+        """Default instrument search patterns of a metal"""
+        base_ticker = self.metal_configs[metal_code]['base']
+        
+        return [
+            base_ticker,
+            f"{base_ticker} F", f"{base_ticker} G", f"{base_ticker} H",
+            f"{base_ticker} J", f"{base_ticker} K", f"{base_ticker} M",
+            f"{base_ticker} N", f"{base_ticker} Q", f"{base_ticker} U",
+            f"{base_ticker} V", f"{base_ticker} X", f"{base_ticker} Z",
+            f"{base_ticker} 03", f"{base_ticker} 00",
+            f"{base_ticker} 25", f"{base_ticker} 26"
+        ]
+        
+    def parse_instrument_results(self, msg, metal_code: str, seen_tickers: set) -> List[Dict]:
+        """Spreads in one instrumentListRequest response message not yet in seen_tickers"""
+        spreads = []
+        
+        if not msg.hasElement("results"):
+            return spreads
+            
+        results = msg.getElement("results")
+        
+        for i in range(results.numValues()):
+            result = results.getValueAsElement(i)
+            
+            if result.hasElement("security"):
+                ticker = result.getElementAsString("security")
+                
+                if ticker not in seen_tickers and self._is_spread(ticker):
+                    seen_tickers.add(ticker)
+                    
+                    spreads.append({
+                        'ticker': ticker.replace('<cmdty>', ' Comdty'),
+                        'metal_code': metal_code,
+                        'spread_type': self._classify_spread_type(ticker),
+                        'description': result.getElementAsString("description") 
+                                     if result.hasElement("description") else ""
+                    })
+                    
+        return spreads
+        
     def _is_spread(self, ticker: str) -> bool:
         """Check if ticker represents a spread"""
         # Single futures contracts to exclude
@@ -258,39 +353,86 @@ class SQLServerDataCollectorJCL:
         else:
             return "Other"
             
-    def store_spreads(self, spreads: List[Dict]) -> int:
-        """Store spread definitions in database"""
-        stored_count = 0
-        cursor = self.connection.cursor()
+    def store_spreads(self, spreads: List[Dict], connection: pyodbc.Connection = None) -> int:
+        """Store spread definitions in database
         
-        try:
-            for spread in spreads:
-                cursor.execute("""
-                    DECLARE @spread_id INT;
-                    EXEC lme_market.sp_UpsertSpread 
-                        @metal_code = ?,
-                        @ticker = ?,
-                        @spread_type = ?,
-                        @description = ?,
-                        @spread_id = @spread_id OUTPUT;
-                    SELECT @spread_id;
-                """, (
+        Spreads the registry already holds unchanged (and seen today) get
+        their spread_id from the cache. The rest are sent as one table-valued
+        parameter to sp_BulkUpsertSpreads, and the spread_ids returned by its
+        MERGE OUTPUT are written back onto the spread dicts.
+        """
+        if not spreads:
+            return 0
+            
+        connection = connection or self.connection
+        self.spread_registry.refresh(connection)
+        
+        # MERGE rejects duplicate source keys, so keep the first of each ticker
+        rows = {}
+        for spread in spreads:
+            key = (spread['metal_code'], spread['ticker'])
+            if key not in rows:
+                rows[key] = (
                     spread['metal_code'],
                     spread['ticker'],
                     spread['spread_type'],
-                    spread.get('description', '')
-                ))
+                    spread.get('description', ''),
+                    spread.get('prompt_date1'),
+                    spread.get('prompt_date2'),
+                    spread.get('leg1_description'),
+                    spread.get('leg2_description')
+                )
                 
-                spread_id = cursor.fetchone()[0]
-                spread['spread_id'] = spread_id
-                stored_count += 1
+        rows = {
+            key: row for key, row in rows.items()
+            if self.spread_registry.needs_upsert(dict(zip(UPSERT_COLUMNS, row)))
+        }
+        
+        for spread in spreads:
+            cached = self.spread_registry.get(spread['metal_code'], spread['ticker'])
+            if cached is not None and (spread['metal_code'], spread['ticker']) not in rows:
+                spread['spread_id'] = cached['spread_id']
                 
-            self.connection.commit()
-            self.logger.info(f"Stored {stored_count} spread definitions")
+        if not rows:
+            self.logger.info("All spread definitions are up to date")
+            return 0
+            
+        stored_count = 0
+        cursor = connection.cursor()
+        
+        try:
+            started = time.perf_counter()
+            cursor.execute(
+                "EXEC lme_market.sp_BulkUpsertSpreads @Spreads = ?",
+                (list(rows.values()),)
+            )
+            
+            spread_ids = {}
+            inserted_count = 0
+            for spread_id, ticker, metal_code, action in cursor.fetchall():
+                spread_ids[(metal_code, ticker)] = spread_id
+                if action == 'INSERT':
+                    inserted_count += 1
+                    
+            for spread in spreads:
+                spread_id = spread_ids.get((spread['metal_code'], spread['ticker']))
+                if spread_id is not None:
+                    spread['spread_id'] = spread_id
+                    
+            stored_count = len(spread_ids)
+            connection.commit()
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started, stage='spread_upsert')
+            
+            for key, spread_id in spread_ids.items():
+                self.spread_registry.register(dict(zip(UPSERT_COLUMNS, rows[key])), spread_id)
+            
+            if stored_count < len(rows):
+                self.logger.warning(f"{len(rows) - stored_count} spreads were not stored (unknown metal code)")
+            self.logger.info(f"Stored {stored_count} spread definitions ({inserted_count} new)")
             
         except Exception as e:
             self.logger.error(f"Error storing spreads: {e}")
-            self.connection.rollback()
+            connection.rollback()
             
         finally:
             cursor.close()
@@ -300,11 +442,7 @@ class SQLServerDataCollectorJCL:
     def get_market_data(self, spreads: List[Dict], fields: List[str] = None) -> List[Dict]:
         """Get market data for spreads from Bloomberg"""
         if fields is None:
-            fields = [
-                "BID", "ASK", "LAST_PRICE", "BID_SIZE", "ASK_SIZE",
-                "VOLUME", "TRADING_DT_REALTIME", "LAST_UPDATE_DT",
-                "OPEN_INT", "RT_SPREAD_BP", "CONTRACT_VALUE"
-            ]
+            fields = MARKET_DATA_FIELDS
             
         market_data = []
         batch_size = self.config.get('collection', {}).get('batch_size', 50)
@@ -320,48 +458,74 @@ class SQLServerDataCollectorJCL:
             for field in fields:
                 request.append("fields", field)
                 
-            self.session.sendRequest(request)
+            metal_code = batch[0].get('metal_code') or ''
+            BLOOMBERG_SECURITIES_PER_REQUEST.observe(len(batch), metal=metal_code)
+            
+            # Per-request queue: collection jobs for other metals share the session
+            event_queue = blpapi.EventQueue()
+            started = time.perf_counter()
+            decode_seconds = 0.0
+            self.session.sendRequest(request, eventQueue=event_queue)
             
             while True:
-                event = self.session.nextEvent()
+                event = event_queue.nextEvent()
                 
                 if event.eventType() in [blpapi.Event.RESPONSE, blpapi.Event.PARTIAL_RESPONSE]:
+                    decode_started = time.perf_counter()
                     for msg in event:
-                        if msg.hasElement("securityData"):
-                            securityData = msg.getElement("securityData")
-                            
-                            for j in range(securityData.numValues()):
-                                security = securityData.getValueAsElement(j)
-                                ticker = security.getElementAsString("security")
-                                
-                                if security.hasElement("fieldData"):
-                                    fieldData = security.getElement("fieldData")
-                                    
-                                    # Find corresponding spread info
-                                    spread_info = next((s for s in batch if s['ticker'] == ticker), None)
-                                    
-                                    if spread_info:
-                                        data = {
-                                            'spread_id': spread_info['spread_id'],
-                                            'ticker': ticker,
-                                            'timestamp': datetime.now()
-                                        }
-                                        
-                                        # Extract field values
-                                        for field in fields:
-                                            if fieldData.hasElement(field):
-                                                data[field] = self._get_field_value(fieldData, field)
-                                                
-                                        market_data.append(data)
-                                        
+                        market_data.extend(self.parse_security_data(msg, batch, fields))
+                    decode_seconds += time.perf_counter() - decode_started
+                        
                 if event.eventType() == blpapi.Event.RESPONSE:
                     break
                     
+            BLOOMBERG_REQUEST_SECONDS.observe(
+                time.perf_counter() - started - decode_seconds, metal=metal_code, request='refdata'
+            )
+            BLOOMBERG_DECODE_SECONDS.observe(decode_seconds, metal=metal_code, request='refdata')
+            
             # Rate limiting
             time.sleep(0.3)
+            BLOOMBERG_RATE_LIMIT_WAIT_SECONDS.inc(0.3, metal=metal_code)
             
         return market_data
         
+    def parse_security_data(self, msg, batch: List[Dict], fields: List[str]) -> List[Dict]:
+        """Market data records in one ReferenceDataRequest response message"""
+        market_data = []
+        
+        if not msg.hasElement("securityData"):
+            return market_data
+            
+        securityData = msg.getElement("securityData")
+        
+        for j in range(securityData.numValues()):
+            security = securityData.getValueAsElement(j)
+            ticker = security.getElementAsString("security")
+            
+            if security.hasElement("fieldData"):
+                fieldData = security.getElement("fieldData")
+                
+                # Find corresponding spread info
+                spread_info = next((s for s in batch if s['ticker'] == ticker), None)
+                
+                if spread_info:
+                    data = {
+                        'spread_id': spread_info['spread_id'],
+                        'ticker': ticker,
+                        'metal_code': spread_info.get('metal_code'),
+                        'timestamp': datetime.now()
+                    }
+                    
+                    # Extract field values
+                    for field in fields:
+                        if fieldData.hasElement(field):
+                            data[field] = self._get_field_value(fieldData, field)
+                            
+                    market_data.append(data)
+                    
+        return market_data
+        
     def _get_field_value(self, fieldData, field_name):
         """Extract field value from Bloomberg field data"""
         if not fieldData.hasElement(field_name):
@@ -380,85 +544,345 @@ class SQLServerDataCollectorJCL:
             
         return None
         
-    def store_tick_data(self, market_data: List[Dict]) -> int:
-        """Store market tick data in database"""
+    @staticmethod
+    def _to_date(value) -> Optional[date]:
+        """Convert a Bloomberg date string (YYYY-MM-DD) to a date"""
+        if not value:
+            return None
+        try:
+            return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+        except ValueError:
+            return None
+            
+    def _todays_volume(self, data: Dict):
+        """Volume counts only if the last update happened today"""
+        if data.get('LAST_UPDATE_DT') != str(date.today()):
+            return 0
+        return data.get('VOLUME', 0)
+        
+    def load_last_quotes(self, connection: pyodbc.Connection = None):
+        """Warm the last-quote table from the latest stored tick of each spread"""
+        cursor = (connection or self.connection).cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT
+                    s.spread_id,
+                    t.bid,
+                    t.ask,
+                    t.last_price,
+                    t.bid_size,
+                    t.ask_size,
+                    t.todays_volume,
+                    t.timestamp
+                FROM lme_market.LME_M_spreads s
+                CROSS APPLY (
+                    SELECT TOP 1 bid, ask, last_price, bid_size, ask_size, todays_volume, timestamp
+                    FROM lme_market.LME_T_tick_data
+                    WHERE spread_id = s.spread_id
+                    ORDER BY timestamp DESC
+                ) t
+                WHERE s.is_active = 1
+            """)
+            
+            self.last_quotes.load(cursor.fetchall())
+            self.logger.info(f"Loaded last quotes for {len(self.last_quotes)} spreads")
+            
+        finally:
+            cursor.close()
+            
+    def store_tick_data(self, market_data: List[Dict], connection: pyodbc.Connection = None,
+                        raise_errors: bool = False) -> int:
+        """Store market tick data in database
+        
+        With change_only enabled, a tick is written only when its quote differs
+        from the last one stored for the spread, or when the heartbeat is due.
+        A separate connection can be passed for use from another thread.
+        With raise_errors, a failed insert is re-raised instead of returning 0.
+        """
+        connection = connection or self.connection
+        
+        for data in market_data:
+            data['todays_volume'] = self._todays_volume(data)
+            
+        if self.change_only:
+            if not self.last_quotes.loaded:
+                try:
+                    self.load_last_quotes(connection)
+                except Exception as e:
+                    self.logger.error(f"Error loading last quotes: {e}")
+            changed_data = self.last_quotes.filter_changed(market_data)
+            skipped_count = len(market_data) - len(changed_data)
+            if skipped_count:
+                self.logger.info(f"Skipped {skipped_count} unchanged tick records")
+                changed_ids = {id(data) for data in changed_data}
+                for data in market_data:
+                    if id(data) not in changed_ids:
+                        TICK_ROWS.inc(metal=(data.get('metal_code') or ''), outcome='unchanged')
+            market_data = changed_data
+            
         stored_count = 0
-        cursor = self.connection.cursor()
+        if not market_data:
+            return stored_count
+            
+        rows = [
+            (
+                data['spread_id'],
+                data['timestamp'],
+                data.get('BID'),
+                data.get('ASK'),
+                data.get('LAST_PRICE'),
+                data.get('BID_SIZE'),
+                data.get('ASK_SIZE'),
+                data.get('VOLUME'),
+                data['todays_volume'],
+                data.get('OPEN_INT'),
+                self._to_date(data.get('LAST_UPDATE_DT')),
+                self._to_date(data.get('TRADING_DT_REALTIME')),
+                data.get('RT_SPREAD_BP'),
+                data.get('CONTRACT_VALUE')
+            )
+            for data in market_data
+        ]
+        
+        cursor = connection.cursor()
         
         try:
-            for data in market_data:
-                # Calculate today's volume
-                todays_volume = data.get('VOLUME', 0)
-                if data.get('LAST_UPDATE_DT') != str(date.today()):
-                    todays_volume = 0
-                    
-                cursor.execute("""
-                    EXEC lme_market.sp_InsertTickData
-                        @spread_id = ?,
-                        @timestamp = ?,
-                        @bid = ?,
-                        @ask = ?,
-                        @last_price = ?,
-                        @bid_size = ?,
-                        @ask_size = ?,
-                        @volume = ?,
-                        @todays_volume = ?,
-                        @open_interest = ?,
-                        @last_update_dt = ?,
-                        @trading_dt = ?,
-                        @rt_spread_bp = ?,
-                        @contract_value = ?,
-                        @duplicate_check = ?
-                """, (
-                    data['spread_id'],
-                    data['timestamp'],
-                    data.get('BID'),
-                    data.get('ASK'),
-                    data.get('LAST_PRICE'),
-                    data.get('BID_SIZE'),
-                    data.get('ASK_SIZE'),
-                    data.get('VOLUME'),
-                    todays_volume,
-                    data.get('OPEN_INT'),
-                    data.get('LAST_UPDATE_DT'),
-                    data.get('TRADING_DT_REALTIME'),
-                    data.get('RT_SPREAD_BP'),
-                    data.get('CONTRACT_VALUE'),
-                    self.config.get('collection', {}).get('duplicate_check', True)
-                ))
-                
-                stored_count += 1
-                
-            self.connection.commit()
+            # One TVP call inserts the batch and upserts LME_T_latest_quote;
+            # duplicates are discarded by the dedup index
+            started = time.perf_counter()
+            cursor.execute(
+                "EXEC lme_market.sp_BulkInsertTickData @TickData = ?",
+                (rows,)
+            )
+            stored_count = cursor.fetchone()[0]
+            
+            connection.commit()
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started, stage='tick_insert')
+            
+            # The procedure returns one count; attribute it per metal when the batch has one
+            metals = {(data.get('metal_code') or '') for data in market_data}
+            metal_label = metals.pop() if len(metals) == 1 else 'mixed'
+            TICK_ROWS.inc(stored_count, metal=metal_label, outcome='inserted')
+            TICK_ROWS.inc(len(rows) - stored_count, metal=metal_label, outcome='duplicate')
+            
+            self.last_quotes.update(market_data)
+            self.intraday_summary.update(market_data)
             self.logger.info(f"Stored {stored_count} tick records")
             
         except Exception as e:
             self.logger.error(f"Error storing tick data: {e}")
-            self.connection.rollback()
-            
+            connection.rollback()
+            if raise_errors:
+                raise
+                
         finally:
             cursor.close()
             
         return stored_count
         
-    def get_active_spreads(self, metal_code: str, hours: int = 1) -> List[Dict]:
+    def load_intraday_summary(self, trading_date: date = None,
+                              connection: pyodbc.Connection = None):
+        """Seed the intraday summary engine from a day's stored ticks"""
+        if self.multi_node:
+            return
+            
+        trading_date = trading_date or date.today()
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            # Covered by IX_LME_T_tick_date_spread
+            cursor.execute("""
+                SELECT spread_id, timestamp, bid, ask, last_price, todays_volume
+                FROM lme_market.LME_T_tick_data
+                WHERE tick_date = ?
+                ORDER BY spread_id, timestamp
+            """, (trading_date,))
+            
+            self.intraday_summary.load(trading_date, cursor.fetchall())
+            self.logger.info(f"Loaded intraday summaries for {len(self.intraday_summary)} spreads")
+            
+        finally:
+            cursor.close()
+            
+    def flush_intraday_summary(self, connection: pyodbc.Connection = None) -> int:
+        """Merge changed intraday summaries into LME_T_daily_summary
+        
+        With multi_node, this node's in-memory summaries are partial, so
+        today's summaries of all metals are recalculated from the ticks.
+        """
+        if self.multi_node:
+            return self.calculate_daily_summaries(None, connection)
+            
+        versions, rows = self.intraday_summary.pending_rows()
+        if not rows:
+            return 0
+            
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            started = time.perf_counter()
+            cursor.execute(
+                "EXEC lme_market.sp_MergeDailySummary @Summaries = ?",
+                (rows,)
+            )
+            merged = cursor.fetchone()[0]
+            connection.commit()
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started, stage='summary_merge')
+            
+            # Earlier days are kept until their final update has been flushed
+            self.intraday_summary.mark_flushed(versions, keep_from=date.today())
+            return merged
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def store_activity_snapshot(self, connection: pyodbc.Connection = None) -> int:
+        """Write per metal / spread type activity rollups for the monitoring views
+        
+        Computed from the spread registry and the last-quote table, so no
+        tick data is read. With multi_node the rollups are computed from
+        LME_M_spreads and LME_T_latest_quote in the database instead.
+        """
+        connection = connection or self.connection
+        
+        if self.multi_node:
+            return self._refresh_activity_snapshot(connection)
+            
+        self.spread_registry.refresh(connection)
+        
+        now = datetime.now()
+        last_ticks = self.last_quotes.snapshot()
+        rollups = {}
+        
+        for spread in self.spread_registry.all_spreads():
+            counts = rollups.setdefault((spread['metal_code'], spread['spread_type']), [0, 0, 0, 0])
+            counts[0] += 1
+            
+            last_tick = last_ticks.get(spread['spread_id'])
+            if last_tick is None:
+                continue
+                
+            timestamp, todays_volume = last_tick
+            if now - timestamp <= timedelta(hours=1):
+                counts[1] += 1
+            if now - timestamp <= timedelta(minutes=30):
+                counts[2] += 1
+            if timestamp.date() == now.date() and todays_volume:
+                counts[3] += int(todays_volume)
+                
+        if not rollups:
+            return 0
+            
+        rows = [(metal_code, spread_type, *counts) for (metal_code, spread_type), counts in rollups.items()]
+        cursor = connection.cursor()
+        
+        try:
+            started = time.perf_counter()
+            cursor.execute(
+                "EXEC lme_market.sp_ReplaceActivitySnapshot @Snapshot = ?",
+                (rows,)
+            )
+            stored = cursor.fetchone()[0]
+            connection.commit()
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started, stage='activity_snapshot')
+            return stored
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def _refresh_activity_snapshot(self, connection: pyodbc.Connection) -> int:
+        """Rebuild the activity snapshot from database state"""
+        cursor = connection.cursor()
+        
+        try:
+            started = time.perf_counter()
+            cursor.execute("EXEC lme_market.sp_RefreshActivitySnapshot")
+            stored = cursor.fetchone()[0]
+            connection.commit()
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started, stage='activity_snapshot')
+            return stored
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def create_connection_pool(self, max_size: int = None) -> ConnectionPool:
+        """Create a connection pool for multi-threaded use"""
+        db_config = self.config['database']
+        collection_config = self.config.get('collection', {})
+        
+        return ConnectionPool(
+            self.create_connection,
+            max_size=max_size or db_config.get('pool_size', 5),
+            retry_attempts=collection_config.get('retry_attempts', 3),
+            retry_delay_seconds=collection_config.get('retry_delay_seconds', 5),
+            logger=self.logger
+        )
+        
+    def start_tick_writer(self) -> TickWriter:
+        """Start a write-behind tick writer on its own single-connection pool
+        
+        Each flush checks the connection out of the pool, so a connection
+        broken by a database restart or network drop is discarded and the
+        next flush reconnects with backoff.
+        """
+        collection_config = self.config.get('collection', {})
+        pool = self.create_connection_pool(max_size=1)
+        
+        def store(records):
+            with pool.connection() as connection:
+                return self.store_tick_data(records, connection, raise_errors=True)
+                
+        writer = TickWriter(
+            store,
+            batch_rows=collection_config.get('write_batch_rows', 500),
+            flush_seconds=collection_config.get('write_flush_seconds', 5),
+            max_queued_batches=collection_config.get('write_queue_batches', 20),
+            logger=self.logger,
+            pool=pool
+        )
+        writer.start()
+        
+        return writer
+        
+    def get_spreads(self, metal_code: str, active_only: bool = True,
+                    connection: pyodbc.Connection = None) -> List[Dict]:
+        """Get the spreads of a metal from the spread registry"""
+        self.spread_registry.refresh(connection or self.connection)
+        return self.spread_registry.spreads_for_metal(metal_code, active_only)
+        
+    def get_active_spreads(self, metal_code: str, hours: int = 1,
+                           connection: pyodbc.Connection = None) -> List[Dict]:
         """Get spreads that have been active in the last N hours"""
-        cursor = self.connection.cursor()
+        connection = connection or self.connection
+        cursor = connection.cursor()
         
         try:
             cursor.execute("""
-                SELECT DISTINCT
+                SELECT
                     s.spread_id,
                     s.ticker,
                     s.spread_type,
                     s.description
                 FROM lme_market.LME_M_spreads s
                 JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
-                JOIN lme_market.LME_T_tick_data t ON s.spread_id = t.spread_id
                 WHERE m.metal_code = ?
-                AND t.timestamp > DATEADD(HOUR, -?, GETDATE())
-                AND (t.bid IS NOT NULL OR t.ask IS NOT NULL)
                 AND s.is_active = 1
+                AND s.last_quote_at > DATEADD(HOUR, -?, GETDATE())
             """, (metal_code, hours))
             
             spreads = []
@@ -476,9 +900,11 @@ class SQLServerDataCollectorJCL:
         finally:
             cursor.close()
             
-    def update_collection_status(self, metal_code: str, collection_type: str):
+    def update_collection_status(self, metal_code: str, collection_type: str,
+                                 connection: pyodbc.Connection = None):
         """Update last run time for collection config"""
-        cursor = self.connection.cursor()
+        connection = connection or self.connection
+        cursor = connection.cursor()
         
         try:
             cursor.execute("""
@@ -489,11 +915,229 @@ class SQLServerDataCollectorJCL:
                 AND collection_type = ?
             """, (metal_code, collection_type))
             
-            self.connection.commit()
+            connection.commit()
             
         except Exception as e:
             self.logger.error(f"Error updating collection status: {e}")
-            self.connection.rollback()
+            connection.rollback()
+            
+        finally:
+            cursor.close()
+            
+    def get_collection_schedules(self, connection: pyodbc.Connection = None) -> Dict[int, Dict]:
+        """Active collection schedules keyed by config_id"""
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT 
+                    cc.config_id,
+                    m.metal_code,
+                    cc.collection_type,
+                    cc.interval_minutes,
+                    cc.last_run,
+                    cc.next_run
+                FROM lme_config.LME_M_collection_config cc
+                JOIN lme_config.LME_M_metals m ON cc.metal_id = m.metal_id
+                WHERE cc.is_active = 1 AND m.is_active = 1
+            """)
+            
+            schedules = {}
+            for row in cursor.fetchall():
+                schedules[row[0]] = {
+                    'metal_code': row[1],
+                    'collection_type': row[2],
+                    'interval_minutes': row[3],
+                    'last_run': row[4],
+                    'next_run': row[5] or datetime.now()
+                }
+                
+            return schedules
+            
+        finally:
+            cursor.close()
+            
+    def claim_collection_jobs(self, owner: str, lease_seconds: int, config_id: int = None,
+                              connection: pyodbc.Connection = None) -> Dict[int, datetime]:
+        """Lease due collection jobs for this node; returns {config_id: lease_expires}"""
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(
+                "EXEC lme_config.sp_ClaimCollectionJobs @owner = ?, @lease_seconds = ?, @config_id = ?",
+                (owner, lease_seconds, config_id)
+            )
+            claimed = {row[0]: row[1] for row in cursor.fetchall()}
+            connection.commit()
+            
+            return claimed
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def renew_collection_leases(self, owner: str, lease_seconds: int, config_ids,
+                                connection: pyodbc.Connection = None) -> int:
+        """Extend this node's leases on the given running jobs"""
+        if not config_ids:
+            return 0
+            
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(
+                "EXEC lme_config.sp_RenewCollectionLeases @owner = ?, @lease_seconds = ?, @ConfigIds = ?",
+                (owner, lease_seconds, [(config_id,) for config_id in config_ids])
+            )
+            renewed = cursor.fetchone()[0]
+            connection.commit()
+            
+            return renewed
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def complete_collection_job(self, config_id: int, owner: str, succeeded: bool = True,
+                                connection: pyodbc.Connection = None,
+                                next_run: datetime = None) -> Optional[Tuple[datetime, int]]:
+        """Release a job lease; returns (next_run, skipped_cycles), or None if the lease was lost
+        
+        Without next_run the database keeps the job on its interval grid.
+        """
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(
+                "EXEC lme_config.sp_CompleteCollectionJob @config_id = ?, @owner = ?, @succeeded = ?, @next_run = ?",
+                (config_id, owner, succeeded, next_run)
+            )
+            row = cursor.fetchone()
+            connection.commit()
+            
+            return (row[0], row[1]) if row else None
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def get_collection_lease(self, config_id: int,
+                             connection: pyodbc.Connection = None) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Current (next_run, lease_expires) of a collection job"""
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT next_run, lease_expires
+                FROM lme_config.LME_M_collection_config
+                WHERE config_id = ?
+            """, (config_id,))
+            
+            row = cursor.fetchone()
+            return (row[0], row[1]) if row else (None, None)
+            
+        finally:
+            cursor.close()
+            
+    def store_collection_metrics(self, metal_code: str, collection_type: str, status: str,
+                                 timings: CycleTimings, config_id: int = None, node_name: str = None,
+                                 connection: pyodbc.Connection = None) -> int:
+        """Write the stage timings of one collection cycle to LME_T_collection_metrics"""
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        stage_ms = {name: int(round(ms)) for name, ms in timings.stage_ms.items()}
+        
+        try:
+            cursor.execute("""
+                EXEC lme_config.sp_RecordCollectionMetrics
+                    @config_id = ?, @metal_code = ?, @collection_type = ?, @node_name = ?,
+                    @started_at = ?, @status = ?, @spread_count = ?, @tick_count = ?,
+                    @search_ms = ?, @fetch_ms = ?, @store_spreads_ms = ?, @store_ticks_ms = ?,
+                    @total_ms = ?
+            """, (
+                config_id, metal_code, collection_type, node_name,
+                timings.started_at, status, timings.spread_count, timings.tick_count,
+                stage_ms['search'], stage_ms['fetch'], stage_ms['store_spreads'], stage_ms['store_ticks'],
+                int(round(timings.total_ms or 0))
+            ))
+            recorded = cursor.fetchone()[0]
+            connection.commit()
+            
+            return recorded
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def calculate_daily_summaries(self, metal_code: Optional[str], connection: pyodbc.Connection = None) -> int:
+        """Recalculate today's daily summaries of a metal (all metals for None) from raw ticks"""
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                DECLARE @metal_id INT = (SELECT metal_id FROM lme_config.LME_M_metals WHERE metal_code = ?);
+                EXEC lme_market.sp_CalculateDailySummary 
+                    @trading_date = NULL,
+                    @metal_id = @metal_id
+            """, (metal_code,))
+            
+            result = cursor.fetchone()
+            connection.commit()
+            
+            return result[0] if result else 0
+            
+        except Exception:
+            connection.rollback()
+            raise
+            
+        finally:
+            cursor.close()
+            
+    def mark_inactive_spreads(self, metal_code: str, days: int = 30,
+                              connection: pyodbc.Connection = None) -> int:
+        """Mark spreads inactive if they had no quotes or trades for N days"""
+        connection = connection or self.connection
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                UPDATE s
+                SET s.is_active = 0,
+                    s.updated_at = GETDATE()
+                FROM lme_market.LME_M_spreads s
+                JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+                WHERE m.metal_code = ?
+                AND s.is_active = 1
+                AND (s.last_quote_at IS NULL OR s.last_quote_at < DATEADD(DAY, -?, GETDATE()))
+                AND (s.last_trade_at IS NULL OR s.last_trade_at < DATEADD(DAY, -?, GETDATE()))
+            """, (metal_code, days, days))
+            
+            inactive_count = cursor.rowcount
+            connection.commit()
+            
+            return inactive_count
+            
+        except Exception:
+            connection.rollback()
+            raise
             
         finally:
             cursor.close()
@@ -0,0 +1,349 @@
+"""
+Local Parquet mirror of LME tick history
+Version: 1.0
+Date: 2025-07-25
+
+Mirrors tick data (hot table and columnstore archive), the spread master
+and daily summaries from the JCL database into local Parquet files so
+research queries run on the analysis machine instead of the production
+server. Ticks are append-only and synced incrementally past the last
+mirrored tick_id; daily summaries are re-synced from the month that was
+current SUMMARY_RESYNC_DAYS before the last sync.
+
+Layout under mirror.directory:
+    ticks/metal=CU/date=2025-07-25/part-<first tick_id>.parquet
+    daily_summary/metal=CU/month=2025-07.parquet
+    spreads.parquet
+    _state.json
+
+MirrorReader reads it back, pruning partitions by metal and date and
+row groups by spread_id. Requires pyarrow.
+"""
+
+import os
+import json
+import argparse
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import List, Sequence
+
+import pandas as pd
+
+from sql_data_collector_jcl import SQLServerDataCollectorJCL
+from market_data_query import KeysetQuery
+
+
+TICK_SOURCE = """(
+    SELECT
+        t.tick_id, t.spread_id, m.metal_code, t.timestamp, t.bid, t.ask, t.last_price,
+        t.bid_size, t.ask_size, t.volume, t.todays_volume, t.open_interest,
+        t.last_update_dt, t.trading_dt, t.rt_spread_bp, t.contract_value
+    FROM lme_market.V_tick_data_all t
+    JOIN lme_market.LME_M_spreads s ON t.spread_id = s.spread_id
+    JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+) mirror_ticks"""
+
+TICK_COLUMNS = [
+    'tick_id', 'spread_id', 'metal_code', 'timestamp', 'bid', 'ask', 'last_price',
+    'bid_size', 'ask_size', 'volume', 'todays_volume', 'open_interest',
+    'last_update_dt', 'trading_dt', 'rt_spread_bp', 'contract_value'
+]
+
+SUMMARY_SOURCE = """(
+    SELECT
+        ds.spread_id, m.metal_code, ds.trading_date, ds.open_price, ds.high_price,
+        ds.low_price, ds.close_price, ds.vwap, ds.total_volume, ds.trade_count,
+        ds.avg_bid_ask_spread, ds.max_bid_ask_spread, ds.time_with_quotes
+    FROM lme_market.LME_T_daily_summary ds
+    JOIN lme_market.LME_M_spreads s ON ds.spread_id = s.spread_id
+    JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+) mirror_summary"""
+
+SUMMARY_COLUMNS = [
+    'spread_id', 'metal_code', 'trading_date', 'open_price', 'high_price',
+    'low_price', 'close_price', 'vwap', 'total_volume', 'trade_count',
+    'avg_bid_ask_spread', 'max_bid_ask_spread', 'time_with_quotes'
+]
+
+SPREAD_COLUMNS = [
+    'spread_id', 'metal_code', 'ticker', 'spread_type', 'description',
+    'prompt_date1', 'prompt_date2', 'leg1_description', 'leg2_description',
+    'is_active', 'first_seen_date', 'last_seen_date'
+]
+
+# Summaries of the last few days can still change after the month rolls over
+SUMMARY_RESYNC_DAYS = 7
+
+
+def _write_parquet(frame: pd.DataFrame, path: Path):
+    """Write a Parquet file atomically (temp file, then rename)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + '.tmp')
+    frame.to_parquet(temp_path, index=False)
+    os.replace(temp_path, path)
+
+
+class ParquetMirrorSync:
+    """Incrementally copies tick history into the local Parquet mirror"""
+
+    def __init__(self, config_path=None, mirror_dir=None):
+        if config_path is None:
+            config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.jcl.json')
+            config_path = os.path.abspath(config_path)
+
+        self.collector = SQLServerDataCollectorJCL(config_path)
+
+        mirror_config = self.collector.config.get('mirror', {})
+        self.mirror_dir = Path(mirror_dir or mirror_config.get('directory', 'data/mirror'))
+        self.page_rows = mirror_config.get('page_rows', 200000)
+        self.lag_minutes = mirror_config.get('lag_minutes', 1)
+        self.state_file = self.mirror_dir / '_state.json'
+
+    def connect(self):
+        """Connect to database"""
+        if not self.collector.connect_database():
+            raise Exception("Failed to connect to database")
+
+    def load_state(self) -> dict:
+        """Watermarks of the last successful sync"""
+        if not self.state_file.exists():
+            return {'tick_id': 0, 'summary_month': None}
+
+        with open(self.state_file, 'r') as f:
+            return json.load(f)
+
+    def save_state(self, state: dict):
+        """Persist watermarks atomically"""
+        self.mirror_dir.mkdir(parents=True, exist_ok=True)
+        state['synced_at'] = datetime.now().isoformat(timespec='seconds')
+
+        temp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def get_tick_high_watermark(self) -> int:
+        """Highest tick_id that is safe to mirror
+
+        Ticks created in the last lag_minutes are left for the next run so a
+        transaction that took a lower tick_id but commits late is not skipped.
+        """
+        cursor = self.collector.connection.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT MAX(tick_id)
+                FROM lme_market.LME_T_tick_data
+                WHERE created_at < DATEADD(MINUTE, -?, GETDATE())
+            """, (self.lag_minutes,))
+            return cursor.fetchone()[0] or 0
+
+        finally:
+            cursor.close()
+
+    def sync_ticks(self, state: dict) -> int:
+        """Append ticks past the tick_id watermark, one page at a time"""
+        low = state.get('tick_id', 0)
+        high = self.get_tick_high_watermark()
+
+        if high <= low:
+            print(f"[OK] Ticks already mirrored up to tick_id {low:,}")
+            return 0
+
+        print(f"Mirroring ticks {low + 1:,} .. {high:,}")
+
+        query = KeysetQuery(
+            self.collector.connection, TICK_SOURCE, TICK_COLUMNS, ['tick_id'],
+            where="tick_id > ? AND tick_id <= ?", params=(low, high),
+            page_rows=self.page_rows
+        )
+
+        total_rows = 0
+        for frame in query.frames():
+            days = frame['timestamp'].dt.strftime('%Y-%m-%d')
+
+            for (metal_code, day), part in frame.groupby([frame['metal_code'], days]):
+                path = (self.mirror_dir / 'ticks' / f"metal={metal_code}" / f"date={day}"
+                        / f"part-{int(part['tick_id'].iloc[0])}.parquet")
+                _write_parquet(part.drop(columns=['metal_code']), path)
+
+            # Files are named by their first tick_id, so a rerun overwrites them
+            state['tick_id'] = int(frame['tick_id'].iloc[-1])
+            self.save_state(state)
+
+            total_rows += len(frame)
+            print(f"  {total_rows:,} ticks mirrored (tick_id {state['tick_id']:,})")
+
+        state['tick_id'] = high
+        self.save_state(state)
+
+        print(f"[OK] Mirrored {total_rows:,} ticks")
+        return total_rows
+
+    def sync_daily_summary(self, state: dict) -> int:
+        """Rewrite the monthly summary files from the last synced month on"""
+        since = date.fromisoformat(state['summary_month'] + '-01') if state.get('summary_month') else None
+
+        query = KeysetQuery(
+            self.collector.connection, SUMMARY_SOURCE, SUMMARY_COLUMNS,
+            ['spread_id', 'trading_date'],
+            where="trading_date >= ?" if since else None,
+            params=(since,) if since else (),
+            page_rows=self.page_rows
+        )
+
+        frames = list(query.frames())
+        if not frames:
+            print("[OK] No daily summaries to mirror")
+            return 0
+
+        summary = pd.concat(frames, ignore_index=True)
+        months = summary['trading_date'].dt.strftime('%Y-%m')
+
+        for (metal_code, month), part in summary.groupby([summary['metal_code'], months]):
+            path = self.mirror_dir / 'daily_summary' / f"metal={metal_code}" / f"month={month}.parquet"
+            _write_parquet(part.drop(columns=['metal_code']), path)
+
+        # Recent summaries are still being updated (final intraday flush, DAILY
+        # recalculation), so the month of the last few days stays in the window
+        resync_from = date.today() - timedelta(days=SUMMARY_RESYNC_DAYS)
+        state['summary_month'] = resync_from.strftime('%Y-%m')
+        self.save_state(state)
+
+        print(f"[OK] Mirrored {len(summary):,} daily summaries")
+        return len(summary)
+
+    def sync_spreads(self) -> int:
+        """Snapshot the spread master"""
+        query = KeysetQuery(
+            self.collector.connection,
+            """(
+                SELECT s.spread_id, m.metal_code, s.ticker, s.spread_type, s.description,
+                       s.prompt_date1, s.prompt_date2, s.leg1_description, s.leg2_description,
+                       s.is_active, s.first_seen_date, s.last_seen_date
+                FROM lme_market.LME_M_spreads s
+                JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+            ) mirror_spreads""",
+            SPREAD_COLUMNS, ['spread_id'], page_rows=self.page_rows
+        )
+
+        frames = list(query.frames())
+        spreads = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=SPREAD_COLUMNS)
+        _write_parquet(spreads, self.mirror_dir / 'spreads.parquet')
+
+        print(f"[OK] Mirrored {len(spreads):,} spreads")
+        return len(spreads)
+
+    def run(self):
+        """Run an incremental sync"""
+        print("\n" + "="*60)
+        print("PARQUET MIRROR SYNC")
+        print("="*60)
+        print(f"Started at: {datetime.now()}")
+        print(f"Mirror directory: {self.mirror_dir.resolve()}")
+
+        try:
+            self.connect()
+
+            state = self.load_state()
+            self.sync_spreads()
+            self.sync_ticks(state)
+            self.sync_daily_summary(state)
+            return 0
+
+        except Exception as e:
+            print(f"\nERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+        finally:
+            self.collector.close()
+            print(f"\nFinished at: {datetime.now()}")
+
+
+class MirrorReader:
+    """Reads the local Parquet mirror with partition pruning"""
+
+    def __init__(self, mirror_dir='data/mirror'):
+        self.mirror_dir = Path(mirror_dir)
+
+    @staticmethod
+    def _partitions(root: Path, name: str, values: Sequence[str] = None) -> List[Path]:
+        """Partition directories (or files) under root, optionally filtered by value"""
+        if not root.exists():
+            return []
+
+        partitions = []
+        for path in sorted(root.glob(f"{name}=*")):
+            value = path.name.split('=', 1)[1]
+            if path.suffix == '.parquet':
+                value = value[:-len('.parquet')]
+            if values is None or value in values:
+                partitions.append(path)
+        return partitions
+
+    @staticmethod
+    def _read(files: List[Path], columns: List[str] = None, spread_ids: Sequence[int] = None) -> pd.DataFrame:
+        filters = [('spread_id', 'in', list(spread_ids))] if spread_ids else None
+        frames = [pd.read_parquet(f, columns=columns, filters=filters) for f in files]
+        frames = [frame for frame in frames if len(frame)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def read_spreads(self, metal_codes: Sequence[str] = None) -> pd.DataFrame:
+        """The mirrored spread master"""
+        spreads = pd.read_parquet(self.mirror_dir / 'spreads.parquet')
+        if metal_codes:
+            spreads = spreads[spreads['metal_code'].isin(metal_codes)]
+        return spreads.reset_index(drop=True)
+
+    def read_ticks(self, metal_codes: Sequence[str] = None, start: date = None, end: date = None,
+                   spread_ids: Sequence[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """Ticks with start <= date < end, ordered by tick_id within each file"""
+        files = []
+        for metal_dir in self._partitions(self.mirror_dir / 'ticks', 'metal', metal_codes):
+            for day_dir in self._partitions(metal_dir, 'date'):
+                day = date.fromisoformat(day_dir.name.split('=', 1)[1])
+                if (start is None or day >= start) and (end is None or day < end):
+                    files.extend(sorted(day_dir.glob('part-*.parquet')))
+
+        return self._read(files, columns, spread_ids)
+
+    def read_daily_summary(self, metal_codes: Sequence[str] = None, start: date = None,
+                           end: date = None, spread_ids: Sequence[int] = None,
+                           columns: List[str] = None) -> pd.DataFrame:
+        """Daily summaries with start <= trading_date < end"""
+        first_month = start.strftime('%Y-%m') if start else None
+        last_month = (end - timedelta(days=1)).strftime('%Y-%m') if end else None
+
+        files = []
+        for metal_dir in self._partitions(self.mirror_dir / 'daily_summary', 'metal', metal_codes):
+            for month_file in self._partitions(metal_dir, 'month'):
+                month = month_file.stem.split('=', 1)[1]
+                if (first_month is None or month >= first_month) and (last_month is None or month <= last_month):
+                    files.append(month_file)
+
+        summary = self._read(files, columns, spread_ids)
+        if len(summary) and 'trading_date' in summary.columns:
+            trading_date = pd.to_datetime(summary['trading_date'])
+            if start:
+                summary = summary[trading_date >= pd.Timestamp(start)]
+            if end:
+                summary = summary[trading_date < pd.Timestamp(end)]
+        return summary.reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync the local Parquet mirror of LME tick history')
+    parser.add_argument('--config', default=None, help='Configuration file path')
+    parser.add_argument('--mirror-dir', default=None,
+                        help='Mirror directory (default: mirror.directory)')
+    args = parser.parse_args()
+
+    sync = ParquetMirrorSync(args.config, args.mirror_dir)
+    return sync.run()
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
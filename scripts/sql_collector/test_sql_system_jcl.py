@@ -200,7 +200,7 @@ class JCLSystemTester:
         cursor = self.collector.connection.cursor()
         cursor.execute("""
             SELECT COUNT(*) FROM lme_market.LME_T_tick_data
-            WHERE CAST(timestamp AS DATE) = CAST(GETDATE() AS DATE)
+            WHERE tick_date = CAST(GETDATE() AS DATE)
         """)
         today_count = cursor.fetchone()[0]
         print(f"  Total ticks today: {today_count}")
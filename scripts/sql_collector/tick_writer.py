@@ -0,0 +1,117 @@
+"""
+Write-behind tick writer for LME spread collection
+Version: 1.0
+Date: 2025-07-25
+
+Decouples Bloomberg fetches from SQL Server stores: fetched batches are
+queued to a background thread that group-commits them by row count or
+time window. The bounded queue blocks producers when the database falls
+behind.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List
+
+
+class TickWriter(threading.Thread):
+    """Background thread that group-commits queued tick records"""
+
+    _STOP = object()
+
+    def __init__(self, store_func: Callable[[List[Dict]], int],
+                 batch_rows: int = 500, flush_seconds: float = 5.0,
+                 max_queued_batches: int = 20, logger: logging.Logger = None,
+                 pool=None):
+        super().__init__(name='TickWriter', daemon=True)
+        self.store_func = store_func
+        self.pool = pool  # Connection pool owned by the writer, closed when the thread exits
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.logger = logger or logging.getLogger('TickWriter')
+
+        self.queue = queue.Queue(maxsize=max_queued_batches)
+        self.flushed_rows = 0
+        self.submitted_rows = 0
+        self.commit_count = 0
+        self.failed_rows = 0
+        self._submit_lock = threading.Lock()  # submit() is called from several workers
+
+    def submit(self, records: List[Dict]):
+        """Queue records for writing, blocking while the queue is full"""
+        if not records:
+            return
+
+        if self.queue.full():
+            started = time.monotonic()
+            self.queue.put(records)
+            self.logger.warning(
+                f"Tick writer backlog full, waited {time.monotonic() - started:.1f}s to queue {len(records)} records"
+            )
+        else:
+            self.queue.put(records)
+
+        with self._submit_lock:
+            self.submitted_rows += len(records)
+
+    def run(self):
+        """Collect queued records and flush them in groups"""
+        pending = []
+        deadline = None
+        stopping = False
+
+        try:
+            while not stopping:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+
+                try:
+                    item = self.queue.get(timeout=timeout)
+                    if item is self._STOP:
+                        stopping = True
+                    else:
+                        pending.extend(item)
+                        if deadline is None:
+                            deadline = time.monotonic() + self.flush_seconds
+                except queue.Empty:
+                    pass
+
+                if pending and (stopping or len(pending) >= self.batch_rows
+                                or time.monotonic() >= deadline):
+                    self._flush(pending)
+                    pending = []
+                    deadline = None
+
+        finally:
+            # Closed here so close() never pulls the connection from under a flush
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+
+    def _flush(self, records: List[Dict]):
+        """Store one group of records in a single commit"""
+        try:
+            stored = self.store_func(records)
+            self.flushed_rows += stored
+            self.commit_count += 1
+            self.logger.debug(f"Flushed {stored} of {len(records)} queued tick records")
+
+        except Exception as e:
+            self.failed_rows += len(records)
+            self.logger.error(f"Error flushing {len(records)} tick records: {e}")
+
+    def close(self, timeout: float = None) -> int:
+        """Drain the queue, stop the thread and return the number of rows flushed"""
+        if self.is_alive():
+            self.queue.put(self._STOP)
+            self.join(timeout)
+
+            if self.is_alive():
+                self.logger.warning("Tick writer still flushing after timeout; leaving it to finish")
+
+        self.logger.info(
+            f"Tick writer stopped: {self.flushed_rows} rows flushed in {self.commit_count} commits "
+            f"({self.submitted_rows} submitted, {self.failed_rows} failed)"
+        )
+        return self.flushed_rows
@@ -0,0 +1,198 @@
+"""
+LME trading calendar and session timetable for collection scheduling
+Version: 1.0
+Date: 2025-07-25
+
+Reads the "sessions" section of the configuration: exchange time zone,
+trading hours, LME holidays and burst windows (ring and kerb sessions).
+The collection services use it to suspend or thin market-data polling
+while the market is closed and to poll the active spreads at a higher
+rate inside burst windows. DAILY maintenance is not session-bound.
+
+Session times are exchange local time; the services schedule in the
+host's local time, and conversion goes through zoneinfo when available.
+Windows Python has no IANA time zone database unless the tzdata package
+is installed; without it session times are taken as host local time.
+"""
+
+import logging
+from datetime import datetime, date, time as dt_time, timedelta
+from typing import Dict, Optional, Tuple
+
+from collection_scheduler import next_aligned_run
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+
+# Collection types that follow the session timetable
+SESSION_COLLECTION_TYPES = ('REALTIME', 'REGULAR')
+
+# LME ring and kerb sessions (London time) used when none are configured
+DEFAULT_BURST_WINDOWS = [
+    {'name': 'AM rings and kerb', 'start': '11:40', 'end': '13:25', 'interval_seconds': 60},
+    {'name': 'PM rings and kerb', 'start': '15:10', 'end': '17:00', 'interval_seconds': 60},
+]
+
+
+def _parse_time(value: str) -> dt_time:
+    return datetime.strptime(value, '%H:%M').time()
+
+
+class TradingCalendar:
+    """LME trading days, session hours and burst windows"""
+
+    def __init__(self, sessions_config: Dict = None, logger: logging.Logger = None):
+        config = sessions_config or {}
+        self.logger = logger or logging.getLogger('TradingCalendar')
+
+        self.enabled = config.get('enabled', True)
+        self.open_time = _parse_time(config.get('open', '01:00'))
+        self.close_time = _parse_time(config.get('close', '19:00'))
+        self.holidays = {date.fromisoformat(day) for day in config.get('holidays', [])}
+
+        # 0 suspends session-bound polling while closed; N polls at N x the interval
+        self.closed_interval_factor = config.get('closed_interval_factor', 0)
+
+        self.burst_windows = []
+        for window in config.get('burst_windows', DEFAULT_BURST_WINDOWS):
+            self.burst_windows.append({
+                'name': window.get('name', window['start']),
+                'start': _parse_time(window['start']),
+                'end': _parse_time(window['end']),
+                'interval_seconds': window.get('interval_seconds', 60),
+                'collection_types': window.get('collection_types', ['REALTIME'])
+            })
+
+        self.tz = None
+        if ZoneInfo is not None:
+            timezone = config.get('timezone', 'Europe/London')
+            try:
+                self.tz = ZoneInfo(timezone)
+            except ZoneInfoNotFoundError:
+                self.logger.warning(
+                    f"Time zone {timezone} not found (install tzdata); session times use local time"
+                )
+
+    def _exchange_time(self, now: datetime) -> datetime:
+        """Local naive time -> exchange naive time"""
+        if self.tz is None:
+            return now
+        return now.astimezone(self.tz).replace(tzinfo=None)
+
+    def _local_time(self, exchange_time: datetime) -> datetime:
+        """Exchange naive time -> local naive time"""
+        if self.tz is None:
+            return exchange_time
+        return exchange_time.replace(tzinfo=self.tz).astimezone().replace(tzinfo=None)
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def is_open(self, now: datetime = None) -> bool:
+        """True during trading hours of a trading day"""
+        exchange_now = self._exchange_time(now or datetime.now())
+
+        return (self.is_trading_day(exchange_now.date())
+                and self.open_time <= exchange_now.time() < self.close_time)
+
+    def next_open(self, now: datetime = None) -> datetime:
+        """Next session open after now (local time)"""
+        exchange_now = self._exchange_time(now or datetime.now())
+        day = exchange_now.date()
+
+        if exchange_now.time() >= self.open_time:
+            day += timedelta(days=1)
+
+        # Weekends plus the longest LME holiday run stay well inside two weeks
+        for _ in range(14):
+            if self.is_trading_day(day):
+                break
+            day += timedelta(days=1)
+
+        return self._local_time(datetime.combine(day, self.open_time))
+
+    def burst_window(self, collection_type: str, now: datetime = None) -> Optional[Dict]:
+        """Burst window in progress for a collection type, if any"""
+        exchange_now = self._exchange_time(now or datetime.now())
+
+        if not self.is_trading_day(exchange_now.date()):
+            return None
+
+        for window in self.burst_windows:
+            if (collection_type in window['collection_types']
+                    and window['start'] <= exchange_now.time() < window['end']):
+                return window
+        return None
+
+    def _next_burst_start(self, collection_type: str, now: datetime) -> Optional[datetime]:
+        """Start of the next burst window today (local time)"""
+        exchange_now = self._exchange_time(now)
+
+        if not self.is_trading_day(exchange_now.date()):
+            return None
+
+        starts = [
+            window['start'] for window in self.burst_windows
+            if collection_type in window['collection_types'] and window['start'] > exchange_now.time()
+        ]
+        if not starts:
+            return None
+        return self._local_time(datetime.combine(exchange_now.date(), min(starts)))
+
+    def suspended_until(self, collection_type: str, now: datetime = None) -> Optional[datetime]:
+        """Next open if polling of this collection type is suspended now"""
+        if not self.enabled or collection_type not in SESSION_COLLECTION_TYPES:
+            return None
+        if self.closed_interval_factor > 0 or self.is_open(now):
+            return None
+        return self.next_open(now)
+
+    def next_run(self, collection_type: str, due: Optional[datetime], interval_seconds: float,
+                 now: datetime = None) -> Tuple[datetime, int]:
+        """Session-aware next run after a run that was due at `due`
+
+        Returns (next_run, skipped_cycles) like next_aligned_run().
+        """
+        now = now or datetime.now()
+
+        if not self.enabled or collection_type not in SESSION_COLLECTION_TYPES:
+            return next_aligned_run(due, interval_seconds, now)
+
+        window = self.burst_window(collection_type, now)
+        if window is not None:
+            return next_aligned_run(due, min(interval_seconds, window['interval_seconds']), now)
+
+        if not self.is_open(now):
+            next_open = self.next_open(now)
+            if self.closed_interval_factor <= 0:
+                return next_open, 0
+
+            next_run, skipped = next_aligned_run(due, interval_seconds * self.closed_interval_factor, now)
+            return min(next_run, next_open), skipped
+
+        next_run, skipped = next_aligned_run(due, interval_seconds, now)
+
+        # Do not sleep through the start of a burst window
+        burst_start = self._next_burst_start(collection_type, now)
+        if burst_start is not None and burst_start < next_run:
+            next_run = burst_start
+        return next_run, skipped
+
+    def describe(self, now: datetime = None) -> str:
+        """One-line session state for logging"""
+        now = now or datetime.now()
+
+        if not self.enabled:
+            return "session scheduling disabled"
+        if not self.is_open(now):
+            return f"market closed until {self.next_open(now):%Y-%m-%d %H:%M}"
+
+        exchange_now = self._exchange_time(now)
+        names = [
+            window['name'] for window in self.burst_windows
+            if window['start'] <= exchange_now.time() < window['end']
+        ]
+        return f"market open (burst: {', '.join(names)})" if names else "market open"
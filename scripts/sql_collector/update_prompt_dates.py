@@ -238,15 +238,11 @@ class PromptDateUpdater:
         
         try:
             # Get all spreads without prompt dates
-            cursor.execute("""
-                SELECT s.spread_id, s.ticker, s.spread_type
-                FROM lme_market.LME_M_spreads s
-                JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
-                WHERE m.metal_code = ?
-                AND (s.prompt_date1 IS NULL OR s.prompt_date2 IS NULL)
-            """, (metal_code,))
-            
-            spreads = cursor.fetchall()
+            spreads = [
+                (spread['spread_id'], spread['ticker'], spread['spread_type'])
+                for spread in self.collector.get_spreads(metal_code, active_only=False)
+                if spread['prompt_date1'] is None or spread['prompt_date2'] is None
+            ]
             print(f"\nFound {len(spreads)} {metal_code} spreads without prompt dates")
             
             updated_count = 0
@@ -0,0 +1,94 @@
+-- Set-based spread upsert for JCL Database LME System
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Upsert a whole batch of spread definitions in one round trip and
+--          return the spread_id of every row through MERGE ... OUTPUT
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Drop procedure first (it depends on the table type)
+IF OBJECT_ID('lme_market.sp_BulkUpsertSpreads', 'P') IS NOT NULL DROP PROCEDURE lme_market.sp_BulkUpsertSpreads;
+GO
+
+IF EXISTS (SELECT * FROM sys.types WHERE name = 'LME_SpreadDataType' AND schema_id = SCHEMA_ID('lme_market'))
+    DROP TYPE lme_market.LME_SpreadDataType;
+GO
+
+-- Table type for bulk spread upsert
+CREATE TYPE lme_market.LME_SpreadDataType AS TABLE
+(
+    metal_code NVARCHAR(10) NOT NULL,
+    ticker NVARCHAR(50) NOT NULL,
+    spread_type NVARCHAR(20) NOT NULL,
+    description NVARCHAR(255),
+    prompt_date1 DATE,
+    prompt_date2 DATE,
+    leg1_description NVARCHAR(100),
+    leg2_description NVARCHAR(100),
+    PRIMARY KEY (metal_code, ticker)
+);
+GO
+
+-- Bulk upsert procedure (same column rules as sp_UpsertSpread)
+CREATE PROCEDURE lme_market.sp_BulkUpsertSpreads
+    @Spreads lme_market.LME_SpreadDataType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    MERGE lme_market.LME_M_spreads WITH (HOLDLOCK) AS target
+    USING (
+        SELECT
+            m.metal_id,
+            sd.metal_code,
+            sd.ticker,
+            sd.spread_type,
+            sd.description,
+            sd.prompt_date1,
+            sd.prompt_date2,
+            sd.leg1_description,
+            sd.leg2_description
+        FROM @Spreads sd
+        JOIN lme_config.LME_M_metals m ON m.metal_code = sd.metal_code
+    ) AS source
+    ON target.metal_id = source.metal_id AND target.ticker = source.ticker
+    WHEN MATCHED THEN
+        UPDATE SET
+            spread_type = source.spread_type,
+            description = COALESCE(source.description, target.description),
+            prompt_date1 = COALESCE(source.prompt_date1, target.prompt_date1),
+            prompt_date2 = COALESCE(source.prompt_date2, target.prompt_date2),
+            leg1_description = COALESCE(source.leg1_description, target.leg1_description),
+            leg2_description = COALESCE(source.leg2_description, target.leg2_description),
+            last_seen_date = CAST(GETDATE() AS DATE),
+            updated_at = GETDATE()
+    WHEN NOT MATCHED THEN
+        INSERT (metal_id, ticker, spread_type, description,
+                prompt_date1, prompt_date2, leg1_description, leg2_description)
+        VALUES (source.metal_id, source.ticker, source.spread_type, source.description,
+                source.prompt_date1, source.prompt_date2,
+                source.leg1_description, source.leg2_description)
+    OUTPUT
+        inserted.spread_id,
+        inserted.ticker,
+        source.metal_code,
+        $action AS merge_action;
+END
+GO
+
+-- Verify procedure creation
+SELECT
+    s.name AS SchemaName,
+    p.name AS ProcedureName,
+    p.create_date
+FROM sys.procedures p
+JOIN sys.schemas s ON p.schema_id = s.schema_id
+WHERE s.name = 'lme_market' AND p.name = 'sp_BulkUpsertSpreads';
+
+PRINT 'Created lme_market.sp_BulkUpsertSpreads successfully';
+GO
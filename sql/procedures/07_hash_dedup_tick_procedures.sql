@@ -0,0 +1,78 @@
+-- Tick insert procedures using the hash dedup index
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Drop the NOT EXISTS duplicate scans; UX_LME_T_tick_dedup
+--          (sql/schema/07_add_tick_quote_hash.sql) discards duplicates on insert
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Procedure to insert tick data with duplicate prevention
+-- @duplicate_check is kept for existing callers; duplicates are always
+-- discarded by the IGNORE_DUP_KEY index
+CREATE OR ALTER PROCEDURE lme_market.sp_InsertTickData
+    @spread_id INT,
+    @timestamp DATETIME2(3),
+    @bid DECIMAL(12,4) = NULL,
+    @ask DECIMAL(12,4) = NULL,
+    @last_price DECIMAL(12,4) = NULL,
+    @bid_size INT = NULL,
+    @ask_size INT = NULL,
+    @volume BIGINT = NULL,
+    @todays_volume BIGINT = NULL,
+    @open_interest INT = NULL,
+    @last_update_dt DATE = NULL,
+    @trading_dt DATE = NULL,
+    @rt_spread_bp DECIMAL(10,2) = NULL,
+    @contract_value DECIMAL(18,2) = NULL,
+    @duplicate_check BIT = 1
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO lme_market.LME_T_tick_data (
+        spread_id, timestamp, bid, ask, last_price,
+        bid_size, ask_size, volume, todays_volume,
+        open_interest, last_update_dt, trading_dt,
+        rt_spread_bp, contract_value
+    )
+    VALUES (
+        @spread_id, @timestamp, @bid, @ask, @last_price,
+        @bid_size, @ask_size, @volume, @todays_volume,
+        @open_interest, @last_update_dt, @trading_dt,
+        @rt_spread_bp, @contract_value
+    );
+END
+GO
+
+-- Bulk insert procedure for performance
+CREATE OR ALTER PROCEDURE lme_market.sp_BulkInsertTickData
+    @TickData lme_market.LME_TickDataType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Duplicates (against the table or within the batch) are discarded by UX_LME_T_tick_dedup
+    INSERT INTO lme_market.LME_T_tick_data (
+        spread_id, timestamp, bid, ask, last_price,
+        bid_size, ask_size, volume, todays_volume,
+        open_interest, last_update_dt, trading_dt,
+        rt_spread_bp, contract_value
+    )
+    SELECT
+        td.spread_id, td.timestamp, td.bid, td.ask, td.last_price,
+        td.bid_size, td.ask_size, td.volume, td.todays_volume,
+        td.open_interest, td.last_update_dt, td.trading_dt,
+        td.rt_spread_bp, td.contract_value
+    FROM @TickData td;
+
+    SELECT @@ROWCOUNT AS RecordsInserted;
+END
+GO
+
+PRINT 'Updated tick insert procedures to use UX_LME_T_tick_dedup';
+GO
@@ -0,0 +1,126 @@
+-- Sliding-window partition maintenance for LME_T_tick_data
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Procedures used by maintain_tick_partitions.py to add future
+--          monthly partitions and switch out expired ones
+--          (requires sql/schema/08_partition_tick_data.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- List tick partitions with their month and row count
+CREATE OR ALTER PROCEDURE lme_market.sp_GetTickPartitions
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT
+        p.partition_number,
+        CAST(prv.value AS DATETIME2(3)) AS lower_boundary,
+        CAST(next_prv.value AS DATETIME2(3)) AS upper_boundary,
+        p.rows
+    FROM sys.partitions p
+    JOIN sys.indexes i ON p.object_id = i.object_id AND p.index_id = i.index_id
+    JOIN sys.partition_schemes ps ON i.data_space_id = ps.data_space_id
+    LEFT JOIN sys.partition_range_values prv
+        ON prv.function_id = ps.function_id AND prv.boundary_id = p.partition_number - 1
+    LEFT JOIN sys.partition_range_values next_prv
+        ON next_prv.function_id = ps.function_id AND next_prv.boundary_id = p.partition_number
+    WHERE p.object_id = OBJECT_ID('lme_market.LME_T_tick_data')
+    AND i.name = 'CX_LME_T_tick_data'
+    ORDER BY p.partition_number;
+END
+GO
+
+-- Add a monthly boundary (splits the empty tail partition)
+CREATE OR ALTER PROCEDURE lme_market.sp_AddTickPartition
+    @boundary DATETIME2(3)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF EXISTS (
+        SELECT 1
+        FROM sys.partition_range_values prv
+        JOIN sys.partition_functions pf ON prv.function_id = pf.function_id
+        WHERE pf.name = 'PF_LME_tick_month'
+        AND CAST(prv.value AS DATETIME2(3)) = @boundary
+    )
+    BEGIN
+        SELECT 0 AS PartitionsAdded;
+        RETURN;
+    END
+
+    ALTER PARTITION SCHEME PS_LME_tick_month NEXT USED [PRIMARY];
+    ALTER PARTITION FUNCTION PF_LME_tick_month() SPLIT RANGE (@boundary);
+
+    SELECT 1 AS PartitionsAdded;
+END
+GO
+
+-- Switch the month starting at @boundary into LME_T_tick_data_switch
+-- and remove its boundary. The caller archives or truncates the staging table.
+CREATE OR ALTER PROCEDURE lme_market.sp_SwitchOutTickPartition
+    @boundary DATETIME2(3)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @partition_number INT = $PARTITION.PF_LME_tick_month(@boundary);
+    DECLARE @rows BIGINT;
+
+    IF NOT EXISTS (
+        SELECT 1
+        FROM sys.partition_range_values prv
+        JOIN sys.partition_functions pf ON prv.function_id = pf.function_id
+        WHERE pf.name = 'PF_LME_tick_month'
+        AND CAST(prv.value AS DATETIME2(3)) = @boundary
+    )
+    BEGIN
+        RAISERROR('No tick partition starts at the given boundary', 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (SELECT 1 FROM lme_market.LME_T_tick_data_switch)
+    BEGIN
+        RAISERROR('LME_T_tick_data_switch is not empty; archive or truncate it first', 16, 1);
+        RETURN;
+    END
+
+    SELECT @rows = p.rows
+    FROM sys.partitions p
+    JOIN sys.indexes i ON p.object_id = i.object_id AND p.index_id = i.index_id
+    WHERE p.object_id = OBJECT_ID('lme_market.LME_T_tick_data')
+    AND i.name = 'CX_LME_T_tick_data'
+    AND p.partition_number = @partition_number;
+
+    BEGIN TRANSACTION;
+
+    ALTER TABLE lme_market.LME_T_tick_data
+    SWITCH PARTITION @partition_number TO lme_market.LME_T_tick_data_switch;
+
+    ALTER PARTITION FUNCTION PF_LME_tick_month() MERGE RANGE (@boundary);
+
+    COMMIT TRANSACTION;
+
+    SELECT @rows AS RowsSwitchedOut;
+END
+GO
+
+-- Verify procedure creation
+SELECT
+    s.name AS SchemaName,
+    p.name AS ProcedureName,
+    p.create_date
+FROM sys.procedures p
+JOIN sys.schemas s ON p.schema_id = s.schema_id
+WHERE s.name = 'lme_market'
+AND p.name IN ('sp_GetTickPartitions', 'sp_AddTickPartition', 'sp_SwitchOutTickPartition')
+ORDER BY p.name;
+
+PRINT 'Created tick partition maintenance procedures successfully';
+GO
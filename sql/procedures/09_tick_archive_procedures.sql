@@ -0,0 +1,73 @@
+-- Tick archive procedures for JCL Database LME System
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Move closed days from LME_T_tick_data into the columnstore
+--          archive (requires sql/schema/09_create_tick_archive.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Move one closed day into LME_T_tick_archive in a single transaction
+CREATE OR ALTER PROCEDURE lme_market.sp_ArchiveTickDay
+    @day DATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @day_start DATETIME2(3) = @day;
+    DECLARE @day_end DATETIME2(3) = DATEADD(DAY, 1, @day);
+    DECLARE @rows BIGINT;
+
+    IF @day >= CAST(GETDATE() AS DATE)
+    BEGIN
+        RAISERROR('Only closed days can be archived', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRANSACTION;
+
+    -- TABLOCK lets large days load straight into compressed rowgroups
+    INSERT INTO lme_market.LME_T_tick_archive WITH (TABLOCK) (
+        tick_id, spread_id, timestamp, bid, ask, last_price,
+        bid_size, ask_size, volume, todays_volume, open_interest,
+        last_update_dt, trading_dt, rt_spread_bp, contract_value,
+        data_source, quality_flag, created_at
+    )
+    SELECT
+        tick_id, spread_id, timestamp, bid, ask, last_price,
+        bid_size, ask_size, volume, todays_volume, open_interest,
+        last_update_dt, trading_dt, rt_spread_bp, contract_value,
+        data_source, quality_flag, created_at
+    FROM lme_market.LME_T_tick_data
+    WHERE timestamp >= @day_start AND timestamp < @day_end
+    ORDER BY timestamp;
+
+    SET @rows = @@ROWCOUNT;
+
+    DELETE FROM lme_market.LME_T_tick_data
+    WHERE timestamp >= @day_start AND timestamp < @day_end;
+
+    COMMIT TRANSACTION;
+
+    SELECT @rows AS RowsArchived;
+END
+GO
+
+-- Compress open delta rowgroups after an archive run
+CREATE OR ALTER PROCEDURE lme_market.sp_CompressTickArchive
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    ALTER INDEX CCI_LME_T_tick_archive ON lme_market.LME_T_tick_archive
+    REORGANIZE WITH (COMPRESS_ALL_ROW_GROUPS = ON);
+END
+GO
+
+PRINT 'Created tick archive procedures successfully';
+GO
@@ -0,0 +1,176 @@
+-- Tick downsampling and purge procedures for JCL Database LME System
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Roll raw ticks (hot and archived) into LME_T_minute_bars and purge
+--          them in bounded batches (requires sql/schema/10_create_minute_bars.sql).
+--          Days recorded in LME_T_downsampled_days are never rebuilt, so an
+--          interrupted purge cannot overwrite complete bars with partial ones
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Aggregate ticks in [@from, @to) into one-minute bars
+-- (re-runnable; bars of days already recorded as downsampled are left alone)
+CREATE OR ALTER PROCEDURE lme_market.sp_DownsampleTicks
+    @from DATETIME2(3),
+    @to DATETIME2(3)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    WITH Ticks AS (
+        SELECT
+            spread_id,
+            CAST(DATEADD(MINUTE, DATEDIFF(MINUTE, CAST('2000-01-01' AS DATETIME2(3)), timestamp),
+                         CAST('2000-01-01' AS DATETIME2(3))) AS DATETIME2(0)) AS bar_time,
+            timestamp,
+            bid,
+            ask,
+            last_price,
+            (bid + ask) / 2.0 AS mid_price,
+            todays_volume
+        FROM lme_market.V_tick_data_all
+        WHERE timestamp >= @from AND timestamp < @to
+    ),
+    Ranked AS (
+        -- Rank non-NULL values separately so open/close skip missing quotes
+        SELECT
+            *,
+            ROW_NUMBER() OVER (PARTITION BY spread_id, bar_time, IIF(mid_price IS NULL, 1, 0) ORDER BY timestamp) AS mid_first,
+            ROW_NUMBER() OVER (PARTITION BY spread_id, bar_time, IIF(mid_price IS NULL, 1, 0) ORDER BY timestamp DESC) AS mid_last,
+            ROW_NUMBER() OVER (PARTITION BY spread_id, bar_time, IIF(last_price IS NULL, 1, 0) ORDER BY timestamp) AS last_first,
+            ROW_NUMBER() OVER (PARTITION BY spread_id, bar_time, IIF(last_price IS NULL, 1, 0) ORDER BY timestamp DESC) AS last_last,
+            ROW_NUMBER() OVER (PARTITION BY spread_id, bar_time, IIF(bid IS NULL, 1, 0) ORDER BY timestamp DESC) AS bid_last,
+            ROW_NUMBER() OVER (PARTITION BY spread_id, bar_time, IIF(ask IS NULL, 1, 0) ORDER BY timestamp DESC) AS ask_last
+        FROM Ticks
+    ),
+    Bars AS (
+        SELECT
+            spread_id,
+            bar_time,
+            MAX(CASE WHEN mid_price IS NOT NULL AND mid_first = 1 THEN mid_price END) AS mid_open,
+            MAX(mid_price) AS mid_high,
+            MIN(mid_price) AS mid_low,
+            MAX(CASE WHEN mid_price IS NOT NULL AND mid_last = 1 THEN mid_price END) AS mid_close,
+            MAX(CASE WHEN last_price IS NOT NULL AND last_first = 1 THEN last_price END) AS last_open,
+            MAX(last_price) AS last_high,
+            MIN(last_price) AS last_low,
+            MAX(CASE WHEN last_price IS NOT NULL AND last_last = 1 THEN last_price END) AS last_close,
+            MAX(CASE WHEN bid IS NOT NULL AND bid_last = 1 THEN bid END) AS bid_close,
+            MAX(CASE WHEN ask IS NOT NULL AND ask_last = 1 THEN ask END) AS ask_close,
+            MAX(todays_volume) AS max_todays_volume,
+            COUNT(*) AS tick_count
+        FROM Ranked
+        GROUP BY spread_id, bar_time
+    )
+    MERGE lme_market.LME_T_minute_bars AS target
+    USING (
+        SELECT b.*
+        FROM Bars b
+        WHERE NOT EXISTS (
+            SELECT 1 FROM lme_market.LME_T_downsampled_days d
+            WHERE d.bar_date = CAST(b.bar_time AS DATE)
+        )
+    ) AS source
+    ON target.spread_id = source.spread_id AND target.bar_time = source.bar_time
+    WHEN MATCHED THEN
+        UPDATE SET
+            mid_open = source.mid_open,
+            mid_high = source.mid_high,
+            mid_low = source.mid_low,
+            mid_close = source.mid_close,
+            last_open = source.last_open,
+            last_high = source.last_high,
+            last_low = source.last_low,
+            last_close = source.last_close,
+            bid_close = source.bid_close,
+            ask_close = source.ask_close,
+            max_todays_volume = source.max_todays_volume,
+            tick_count = source.tick_count
+    WHEN NOT MATCHED THEN
+        INSERT (spread_id, bar_time, mid_open, mid_high, mid_low, mid_close,
+                last_open, last_high, last_low, last_close,
+                bid_close, ask_close, max_todays_volume, tick_count)
+        VALUES (source.spread_id, source.bar_time, source.mid_open, source.mid_high,
+                source.mid_low, source.mid_close, source.last_open, source.last_high,
+                source.last_low, source.last_close, source.bid_close, source.ask_close,
+                source.max_todays_volume, source.tick_count);
+
+    SELECT @@ROWCOUNT AS BarsProcessed;
+END
+GO
+
+-- Downsample one day once: build its bars and record the day in the same
+-- transaction. Returns (BarsProcessed, AlreadyDone); a day already recorded
+-- is skipped and may be purged
+CREATE OR ALTER PROCEDURE lme_market.sp_DownsampleTickDay
+    @day DATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @from DATETIME2(3) = CAST(@day AS DATETIME2(3));
+    DECLARE @to DATETIME2(3) = DATEADD(DAY, 1, @from);
+    DECLARE @result TABLE (BarsProcessed INT);
+    DECLARE @bars INT;
+
+    BEGIN TRANSACTION;
+
+    -- The range lock also serializes concurrent runs for the same day
+    IF EXISTS (SELECT 1 FROM lme_market.LME_T_downsampled_days WITH (UPDLOCK, HOLDLOCK) WHERE bar_date = @day)
+    BEGIN
+        COMMIT TRANSACTION;
+        SELECT CAST(0 AS INT) AS BarsProcessed, CAST(1 AS BIT) AS AlreadyDone;
+        RETURN;
+    END
+
+    INSERT INTO @result
+    EXEC lme_market.sp_DownsampleTicks @from = @from, @to = @to;
+
+    SELECT @bars = ISNULL(SUM(BarsProcessed), 0) FROM @result;
+
+    INSERT INTO lme_market.LME_T_downsampled_days (bar_date, bar_count)
+    VALUES (@day, @bars);
+
+    COMMIT TRANSACTION;
+
+    SELECT @bars AS BarsProcessed, CAST(0 AS BIT) AS AlreadyDone;
+END
+GO
+
+-- Delete one bounded batch of raw ticks in [@from, @to) from both tiers
+-- Call repeatedly (committing in between) until it returns 0
+CREATE OR ALTER PROCEDURE lme_market.sp_PurgeTickBatch
+    @from DATETIME2(3),
+    @to DATETIME2(3),
+    @batch_size INT = 50000
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @rows INT;
+
+    DELETE TOP (@batch_size) FROM lme_market.LME_T_tick_data
+    WHERE timestamp >= @from AND timestamp < @to;
+
+    SET @rows = @@ROWCOUNT;
+
+    IF @rows < @batch_size
+    BEGIN
+        DELETE TOP (@batch_size - @rows) FROM lme_market.LME_T_tick_archive
+        WHERE timestamp >= @from AND timestamp < @to;
+
+        SET @rows = @rows + @@ROWCOUNT;
+    END
+
+    SELECT @rows AS RowsPurged;
+END
+GO
+
+PRINT 'Created tick downsample procedures successfully';
+GO
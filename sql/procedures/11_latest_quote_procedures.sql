@@ -0,0 +1,142 @@
+-- Tick insert procedures maintaining LME_T_latest_quote
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Upsert the latest quote of each spread in the same call that
+--          inserts its ticks (requires sql/schema/11_create_latest_quote.sql;
+--          duplicates are still discarded by UX_LME_T_tick_dedup)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Procedure to insert tick data with duplicate prevention
+-- @duplicate_check is kept for existing callers; duplicates are always
+-- discarded by the IGNORE_DUP_KEY index
+CREATE OR ALTER PROCEDURE lme_market.sp_InsertTickData
+    @spread_id INT,
+    @timestamp DATETIME2(3),
+    @bid DECIMAL(12,4) = NULL,
+    @ask DECIMAL(12,4) = NULL,
+    @last_price DECIMAL(12,4) = NULL,
+    @bid_size INT = NULL,
+    @ask_size INT = NULL,
+    @volume BIGINT = NULL,
+    @todays_volume BIGINT = NULL,
+    @open_interest INT = NULL,
+    @last_update_dt DATE = NULL,
+    @trading_dt DATE = NULL,
+    @rt_spread_bp DECIMAL(10,2) = NULL,
+    @contract_value DECIMAL(18,2) = NULL,
+    @duplicate_check BIT = 1
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO lme_market.LME_T_tick_data (
+        spread_id, timestamp, bid, ask, last_price,
+        bid_size, ask_size, volume, todays_volume,
+        open_interest, last_update_dt, trading_dt,
+        rt_spread_bp, contract_value
+    )
+    VALUES (
+        @spread_id, @timestamp, @bid, @ask, @last_price,
+        @bid_size, @ask_size, @volume, @todays_volume,
+        @open_interest, @last_update_dt, @trading_dt,
+        @rt_spread_bp, @contract_value
+    );
+
+    UPDATE lme_market.LME_T_latest_quote
+    SET timestamp = @timestamp,
+        bid = @bid,
+        ask = @ask,
+        last_price = @last_price,
+        bid_size = @bid_size,
+        ask_size = @ask_size,
+        volume = @volume,
+        todays_volume = @todays_volume,
+        open_interest = @open_interest,
+        last_update_dt = @last_update_dt,
+        trading_dt = @trading_dt,
+        updated_at = GETDATE()
+    WHERE spread_id = @spread_id
+    AND timestamp <= @timestamp;
+
+    IF @@ROWCOUNT = 0 AND NOT EXISTS (SELECT 1 FROM lme_market.LME_T_latest_quote WHERE spread_id = @spread_id)
+    BEGIN
+        INSERT INTO lme_market.LME_T_latest_quote (
+            spread_id, timestamp, bid, ask, last_price, bid_size, ask_size,
+            volume, todays_volume, open_interest, last_update_dt, trading_dt
+        )
+        VALUES (
+            @spread_id, @timestamp, @bid, @ask, @last_price, @bid_size, @ask_size,
+            @volume, @todays_volume, @open_interest, @last_update_dt, @trading_dt
+        );
+    END
+END
+GO
+
+-- Bulk insert procedure for performance
+CREATE OR ALTER PROCEDURE lme_market.sp_BulkInsertTickData
+    @TickData lme_market.LME_TickDataType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @inserted INT;
+
+    -- Duplicates (against the table or within the batch) are discarded by UX_LME_T_tick_dedup
+    INSERT INTO lme_market.LME_T_tick_data (
+        spread_id, timestamp, bid, ask, last_price,
+        bid_size, ask_size, volume, todays_volume,
+        open_interest, last_update_dt, trading_dt,
+        rt_spread_bp, contract_value
+    )
+    SELECT
+        td.spread_id, td.timestamp, td.bid, td.ask, td.last_price,
+        td.bid_size, td.ask_size, td.volume, td.todays_volume,
+        td.open_interest, td.last_update_dt, td.trading_dt,
+        td.rt_spread_bp, td.contract_value
+    FROM @TickData td;
+
+    SET @inserted = @@ROWCOUNT;
+
+    -- Upsert the newest tick of each spread in the batch
+    WITH LatestInBatch AS (
+        SELECT
+            td.*,
+            ROW_NUMBER() OVER (PARTITION BY td.spread_id ORDER BY td.timestamp DESC) AS rn
+        FROM @TickData td
+    )
+    MERGE lme_market.LME_T_latest_quote WITH (HOLDLOCK) AS target
+    USING (SELECT * FROM LatestInBatch WHERE rn = 1) AS source
+    ON target.spread_id = source.spread_id
+    WHEN MATCHED AND source.timestamp >= target.timestamp THEN
+        UPDATE SET
+            timestamp = source.timestamp,
+            bid = source.bid,
+            ask = source.ask,
+            last_price = source.last_price,
+            bid_size = source.bid_size,
+            ask_size = source.ask_size,
+            volume = source.volume,
+            todays_volume = source.todays_volume,
+            open_interest = source.open_interest,
+            last_update_dt = source.last_update_dt,
+            trading_dt = source.trading_dt,
+            updated_at = GETDATE()
+    WHEN NOT MATCHED THEN
+        INSERT (spread_id, timestamp, bid, ask, last_price, bid_size, ask_size,
+                volume, todays_volume, open_interest, last_update_dt, trading_dt)
+        VALUES (source.spread_id, source.timestamp, source.bid, source.ask, source.last_price,
+                source.bid_size, source.ask_size, source.volume, source.todays_volume,
+                source.open_interest, source.last_update_dt, source.trading_dt);
+
+    SELECT @inserted AS RecordsInserted;
+END
+GO
+
+PRINT 'Updated tick insert procedures to maintain LME_T_latest_quote';
+GO
@@ -0,0 +1,125 @@
+-- Day-bounded procedures on the tick_date column
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Read the day's ticks once through IX_LME_T_tick_date_spread
+--          instead of three CAST(timestamp AS DATE) scans
+--          (requires sql/schema/12_add_tick_date.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Procedure to calculate and insert daily summary
+CREATE OR ALTER PROCEDURE lme_market.sp_CalculateDailySummary
+    @trading_date DATE = NULL,
+    @metal_id INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    -- Use today if no date specified
+    IF @trading_date IS NULL
+        SET @trading_date = CAST(GETDATE() AS DATE);
+    
+    -- Seek the day once; every aggregate below reads this set
+    SELECT 
+        t.spread_id,
+        t.timestamp,
+        t.bid,
+        t.ask,
+        t.last_price,
+        t.todays_volume
+    INTO #day_ticks
+    FROM lme_market.LME_T_tick_data t
+    JOIN lme_market.LME_M_spreads s ON t.spread_id = s.spread_id
+    WHERE t.tick_date = @trading_date
+    AND (@metal_id IS NULL OR s.metal_id = @metal_id);
+    
+    CREATE CLUSTERED INDEX CX_day_ticks ON #day_ticks(spread_id, timestamp);
+    
+    -- Calculate summaries
+    WITH DaySummary AS (
+        SELECT 
+            spread_id,
+            @trading_date as trading_date,
+            MIN(last_price) as low_price,
+            MAX(last_price) as high_price,
+            MAX(todays_volume) as total_volume,
+            COUNT(DISTINCT timestamp) as trade_count,
+            AVG(CASE WHEN bid IS NOT NULL AND ask IS NOT NULL 
+                     THEN ask - bid ELSE NULL END) as avg_bid_ask_spread,
+            MAX(CASE WHEN bid IS NOT NULL AND ask IS NOT NULL 
+                     THEN ask - bid ELSE NULL END) as max_bid_ask_spread,
+            COUNT(DISTINCT DATEPART(HOUR, timestamp) * 60 + DATEPART(MINUTE, timestamp)) as time_with_quotes
+        FROM #day_ticks
+        GROUP BY spread_id
+    ),
+    OpenClose AS (
+        SELECT DISTINCT
+            spread_id,
+            FIRST_VALUE(last_price) OVER (PARTITION BY spread_id ORDER BY timestamp) as open_price,
+            LAST_VALUE(last_price) OVER (PARTITION BY spread_id ORDER BY timestamp 
+                ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) as close_price
+        FROM #day_ticks
+        WHERE last_price IS NOT NULL
+    ),
+    VWAP AS (
+        SELECT 
+            spread_id,
+            SUM(last_price * todays_volume) / NULLIF(SUM(todays_volume), 0) as vwap
+        FROM #day_ticks
+        WHERE last_price IS NOT NULL AND todays_volume > 0
+        GROUP BY spread_id
+    )
+    -- Insert or update daily summaries
+    MERGE lme_market.LME_T_daily_summary AS target
+    USING (
+        SELECT 
+            ds.spread_id,
+            ds.trading_date,
+            oc.open_price,
+            ds.high_price,
+            ds.low_price,
+            oc.close_price,
+            v.vwap,
+            ds.total_volume,
+            ds.trade_count,
+            ds.avg_bid_ask_spread,
+            ds.max_bid_ask_spread,
+            ds.time_with_quotes
+        FROM DaySummary ds
+        LEFT JOIN OpenClose oc ON ds.spread_id = oc.spread_id
+        LEFT JOIN VWAP v ON ds.spread_id = v.spread_id
+    ) AS source
+    ON target.spread_id = source.spread_id AND target.trading_date = source.trading_date
+    WHEN MATCHED THEN
+        UPDATE SET
+            open_price = source.open_price,
+            high_price = source.high_price,
+            low_price = source.low_price,
+            close_price = source.close_price,
+            vwap = source.vwap,
+            total_volume = source.total_volume,
+            trade_count = source.trade_count,
+            avg_bid_ask_spread = source.avg_bid_ask_spread,
+            max_bid_ask_spread = source.max_bid_ask_spread,
+            time_with_quotes = source.time_with_quotes
+    WHEN NOT MATCHED THEN
+        INSERT (spread_id, trading_date, open_price, high_price, low_price, 
+                close_price, vwap, total_volume, trade_count, avg_bid_ask_spread, 
+                max_bid_ask_spread, time_with_quotes)
+        VALUES (source.spread_id, source.trading_date, source.open_price, 
+                source.high_price, source.low_price, source.close_price, 
+                source.vwap, source.total_volume, source.trade_count, 
+                source.avg_bid_ask_spread, source.max_bid_ask_spread, 
+                source.time_with_quotes);
+    
+    SELECT @@ROWCOUNT AS SummariesProcessed;
+END
+GO
+
+PRINT 'Updated day-bounded procedures to use tick_date';
+GO
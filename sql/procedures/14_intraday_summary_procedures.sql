@@ -0,0 +1,88 @@
+-- Incremental daily summary flush for the collection service
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Merge the running intraday aggregates kept by the collection
+--          service into LME_T_daily_summary in one round trip, so intraday
+--          summaries stay current without rescanning the day's ticks
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Drop procedure first (it depends on the table type)
+IF OBJECT_ID('lme_market.sp_MergeDailySummary', 'P') IS NOT NULL DROP PROCEDURE lme_market.sp_MergeDailySummary;
+GO
+
+IF EXISTS (SELECT * FROM sys.types WHERE name = 'LME_DailySummaryType' AND schema_id = SCHEMA_ID('lme_market'))
+    DROP TYPE lme_market.LME_DailySummaryType;
+GO
+
+-- Table type for daily summary rows computed by the service
+CREATE TYPE lme_market.LME_DailySummaryType AS TABLE
+(
+    spread_id INT NOT NULL,
+    trading_date DATE NOT NULL,
+    open_price DECIMAL(12,4),
+    high_price DECIMAL(12,4),
+    low_price DECIMAL(12,4),
+    close_price DECIMAL(12,4),
+    vwap DECIMAL(12,4),
+    total_volume BIGINT,
+    trade_count INT,
+    avg_bid_ask_spread DECIMAL(10,4),
+    max_bid_ask_spread DECIMAL(10,4),
+    time_with_quotes INT,
+    PRIMARY KEY (spread_id, trading_date)
+);
+GO
+
+-- Upsert whole-day summaries (the rows replace what is stored)
+CREATE PROCEDURE lme_market.sp_MergeDailySummary
+    @Summaries lme_market.LME_DailySummaryType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    MERGE lme_market.LME_T_daily_summary WITH (HOLDLOCK) AS target
+    USING @Summaries AS source
+    ON target.spread_id = source.spread_id AND target.trading_date = source.trading_date
+    WHEN MATCHED THEN
+        UPDATE SET
+            open_price = source.open_price,
+            high_price = source.high_price,
+            low_price = source.low_price,
+            close_price = source.close_price,
+            vwap = source.vwap,
+            total_volume = source.total_volume,
+            trade_count = source.trade_count,
+            avg_bid_ask_spread = source.avg_bid_ask_spread,
+            max_bid_ask_spread = source.max_bid_ask_spread,
+            time_with_quotes = source.time_with_quotes
+    WHEN NOT MATCHED THEN
+        INSERT (spread_id, trading_date, open_price, high_price, low_price,
+                close_price, vwap, total_volume, trade_count, avg_bid_ask_spread,
+                max_bid_ask_spread, time_with_quotes)
+        VALUES (source.spread_id, source.trading_date, source.open_price,
+                source.high_price, source.low_price, source.close_price,
+                source.vwap, source.total_volume, source.trade_count,
+                source.avg_bid_ask_spread, source.max_bid_ask_spread,
+                source.time_with_quotes);
+
+    SELECT @@ROWCOUNT AS SummariesProcessed;
+END
+GO
+
+-- Verify procedure creation
+SELECT
+    s.name AS SchemaName,
+    p.name AS ProcedureName,
+    p.create_date
+FROM sys.procedures p
+JOIN sys.schemas s ON p.schema_id = s.schema_id
+WHERE s.name = 'lme_market' AND p.name = 'sp_MergeDailySummary';
+
+PRINT 'Created lme_market.sp_MergeDailySummary successfully';
+GO
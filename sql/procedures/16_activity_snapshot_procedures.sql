@@ -0,0 +1,78 @@
+-- Spread activity snapshot procedures
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Replace the monitoring snapshot with the rollups computed by the
+--          collection service in one round trip
+--          (requires sql/schema/16_create_activity_snapshot.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Drop procedure first (it depends on the table type)
+IF OBJECT_ID('lme_market.sp_ReplaceActivitySnapshot', 'P') IS NOT NULL DROP PROCEDURE lme_market.sp_ReplaceActivitySnapshot;
+GO
+
+IF EXISTS (SELECT * FROM sys.types WHERE name = 'LME_ActivitySnapshotType' AND schema_id = SCHEMA_ID('lme_market'))
+    DROP TYPE lme_market.LME_ActivitySnapshotType;
+GO
+
+-- Table type for activity rollups
+CREATE TYPE lme_market.LME_ActivitySnapshotType AS TABLE
+(
+    metal_code NVARCHAR(10) NOT NULL,
+    spread_type NVARCHAR(20) NOT NULL,
+    spread_count INT NOT NULL,
+    active_1h INT NOT NULL,
+    active_30m INT NOT NULL,
+    volume_today BIGINT NOT NULL,
+    PRIMARY KEY (metal_code, spread_type)
+);
+GO
+
+-- Replace the whole snapshot atomically
+CREATE PROCEDURE lme_market.sp_ReplaceActivitySnapshot
+    @Snapshot lme_market.LME_ActivitySnapshotType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @snapshot_at DATETIME2(3) = GETDATE();
+    DECLARE @rows INT;
+
+    BEGIN TRANSACTION;
+
+    DELETE FROM lme_market.LME_T_spread_activity_snapshot WITH (TABLOCKX);
+
+    INSERT INTO lme_market.LME_T_spread_activity_snapshot (
+        metal_id, spread_type, spread_count, active_1h, active_30m, volume_today, snapshot_at
+    )
+    SELECT
+        m.metal_id, sn.spread_type, sn.spread_count, sn.active_1h, sn.active_30m,
+        sn.volume_today, @snapshot_at
+    FROM @Snapshot sn
+    JOIN lme_config.LME_M_metals m ON m.metal_code = sn.metal_code;
+
+    SET @rows = @@ROWCOUNT;
+
+    COMMIT TRANSACTION;
+
+    SELECT @rows AS SnapshotRows;
+END
+GO
+
+-- Verify procedure creation
+SELECT
+    s.name AS SchemaName,
+    p.name AS ProcedureName,
+    p.create_date
+FROM sys.procedures p
+JOIN sys.schemas s ON p.schema_id = s.schema_id
+WHERE s.name = 'lme_market' AND p.name = 'sp_ReplaceActivitySnapshot';
+
+PRINT 'Created lme_market.sp_ReplaceActivitySnapshot successfully';
+GO
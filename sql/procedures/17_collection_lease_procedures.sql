@@ -0,0 +1,101 @@
+-- Collection job lease procedures
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Claim, renew and complete collection jobs so that each due job
+--          runs on exactly one collector node
+--          (requires sql/schema/17_add_collection_leases.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Claim due jobs that are not leased (or whose lease expired).
+-- READPAST skips rows another node is claiming at the same moment instead
+-- of waiting for them; UPDLOCK keeps two nodes from claiming the same row.
+CREATE OR ALTER PROCEDURE lme_config.sp_ClaimCollectionJobs
+    @owner NVARCHAR(100),
+    @lease_seconds INT,
+    @config_id INT = NULL,
+    @max_jobs INT = 100
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @now DATETIME2 = GETDATE();
+
+    WITH due AS (
+        SELECT TOP (@max_jobs)
+            cc.config_id,
+            cc.next_run,
+            cc.lease_owner,
+            cc.lease_expires
+        FROM lme_config.LME_M_collection_config cc WITH (UPDLOCK, READPAST, ROWLOCK)
+        WHERE cc.is_active = 1
+        AND (@config_id IS NULL OR cc.config_id = @config_id)
+        AND (cc.next_run IS NULL OR cc.next_run <= @now)
+        AND (cc.lease_expires IS NULL OR cc.lease_expires < @now)
+        ORDER BY cc.next_run
+    )
+    UPDATE due
+    SET lease_owner = @owner,
+        lease_expires = DATEADD(SECOND, @lease_seconds, @now)
+    OUTPUT inserted.config_id, inserted.lease_expires
+    OPTION (RECOMPILE);
+END
+GO
+
+-- Extend every lease a node holds (called while its jobs are running)
+CREATE OR ALTER PROCEDURE lme_config.sp_RenewCollectionLeases
+    @owner NVARCHAR(100),
+    @lease_seconds INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    UPDATE lme_config.LME_M_collection_config
+    SET lease_expires = DATEADD(SECOND, @lease_seconds, GETDATE())
+    WHERE lease_owner = @owner
+    AND lease_expires >= GETDATE();
+
+    SELECT @@ROWCOUNT AS renewed;
+END
+GO
+
+-- Release a lease and move the job's next_run forward.
+-- Returns no row if the lease was lost (expired and claimed by another node).
+CREATE OR ALTER PROCEDURE lme_config.sp_CompleteCollectionJob
+    @config_id INT,
+    @owner NVARCHAR(100),
+    @succeeded BIT = 1,
+    @retry_seconds INT = 30
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @now DATETIME2 = GETDATE();
+
+    UPDATE lme_config.LME_M_collection_config
+    SET last_run = CASE WHEN @succeeded = 1 THEN @now ELSE last_run END,
+        next_run = CASE WHEN @succeeded = 1
+                        THEN DATEADD(MINUTE, interval_minutes, @now)
+                        ELSE DATEADD(SECOND, @retry_seconds, @now) END,
+        lease_owner = NULL,
+        lease_expires = NULL
+    OUTPUT inserted.next_run
+    WHERE config_id = @config_id
+    AND lease_owner = @owner;
+END
+GO
+
+-- Verify procedures
+SELECT name, create_date, modify_date
+FROM sys.procedures
+WHERE schema_id = SCHEMA_ID('lme_config')
+AND name IN ('sp_ClaimCollectionJobs', 'sp_RenewCollectionLeases', 'sp_CompleteCollectionJob');
+GO
+
+PRINT 'Collection lease procedures created successfully';
+GO
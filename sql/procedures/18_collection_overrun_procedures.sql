@@ -0,0 +1,62 @@
+-- Fixed-rate collection schedules with cycle coalescing
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: sp_CompleteCollectionJob advances next_run on the job's interval
+--          grid (due time + k * interval) instead of completion + interval,
+--          so long runs no longer make schedules drift. Cycles that passed
+--          while the job was running are skipped and reported, not queued
+--          (requires sql/procedures/17_collection_lease_procedures.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Release a lease and move the job's next_run forward.
+-- Returns (next_run, skipped_cycles), or no row if the lease was lost.
+CREATE OR ALTER PROCEDURE lme_config.sp_CompleteCollectionJob
+    @config_id INT,
+    @owner NVARCHAR(100),
+    @succeeded BIT = 1,
+    @retry_seconds INT = 30
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @now DATETIME2 = GETDATE();
+
+    UPDATE cc
+    SET last_run = CASE WHEN @succeeded = 1 THEN @now ELSE cc.last_run END,
+        next_run = CASE WHEN @succeeded = 1
+                        THEN DATEADD(SECOND, p.periods * d.period_seconds, d.due)
+                        ELSE DATEADD(SECOND, @retry_seconds, @now) END,
+        lease_owner = NULL,
+        lease_expires = NULL
+    OUTPUT
+        inserted.next_run,
+        CASE WHEN @succeeded = 1 THEN p.periods - 1 ELSE 0 END AS skipped_cycles
+    FROM lme_config.LME_M_collection_config cc
+    CROSS APPLY (
+        SELECT ISNULL(cc.next_run, @now) AS due, cc.interval_minutes * 60 AS period_seconds
+    ) d
+    CROSS APPLY (
+        -- First interval boundary after now, counted from the run's due time
+        SELECT CASE WHEN d.due > @now THEN 1
+                    ELSE DATEDIFF(SECOND, d.due, @now) / d.period_seconds + 1 END AS periods
+    ) p
+    WHERE cc.config_id = @config_id
+    AND cc.lease_owner = @owner;
+END
+GO
+
+-- Verify procedure
+SELECT name, create_date, modify_date
+FROM sys.procedures
+WHERE schema_id = SCHEMA_ID('lme_config')
+AND name = 'sp_CompleteCollectionJob';
+GO
+
+PRINT 'Updated lme_config.sp_CompleteCollectionJob successfully';
+GO
@@ -0,0 +1,63 @@
+-- Session-aware collection schedules
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Let the collector pass the next run it computed from the LME
+--          session timetable (suspended while closed, burst windows) to
+--          sp_CompleteCollectionJob; without @next_run the job stays on its
+--          interval grid as before
+--          (requires sql/procedures/18_collection_overrun_procedures.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Release a lease and move the job's next_run forward.
+-- Returns (next_run, skipped_cycles), or no row if the lease was lost.
+CREATE OR ALTER PROCEDURE lme_config.sp_CompleteCollectionJob
+    @config_id INT,
+    @owner NVARCHAR(100),
+    @succeeded BIT = 1,
+    @retry_seconds INT = 30,
+    @next_run DATETIME2 = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @now DATETIME2 = GETDATE();
+
+    UPDATE cc
+    SET last_run = CASE WHEN @succeeded = 1 THEN @now ELSE cc.last_run END,
+        next_run = CASE WHEN @succeeded = 0 THEN DATEADD(SECOND, @retry_seconds, @now)
+                        WHEN @next_run IS NOT NULL THEN @next_run
+                        ELSE DATEADD(SECOND, p.periods * d.period_seconds, d.due) END,
+        lease_owner = NULL,
+        lease_expires = NULL
+    OUTPUT
+        inserted.next_run,
+        CASE WHEN @succeeded = 1 AND @next_run IS NULL THEN p.periods - 1 ELSE 0 END AS skipped_cycles
+    FROM lme_config.LME_M_collection_config cc
+    CROSS APPLY (
+        SELECT ISNULL(cc.next_run, @now) AS due, cc.interval_minutes * 60 AS period_seconds
+    ) d
+    CROSS APPLY (
+        -- First interval boundary after now, counted from the run's due time
+        SELECT CASE WHEN d.due > @now THEN 1
+                    ELSE DATEDIFF(SECOND, d.due, @now) / d.period_seconds + 1 END AS periods
+    ) p
+    WHERE cc.config_id = @config_id
+    AND cc.lease_owner = @owner;
+END
+GO
+
+-- Verify procedure
+SELECT name, create_date, modify_date
+FROM sys.procedures
+WHERE schema_id = SCHEMA_ID('lme_config')
+AND name = 'sp_CompleteCollectionJob';
+GO
+
+PRINT 'Updated lme_config.sp_CompleteCollectionJob successfully';
+GO
@@ -0,0 +1,58 @@
+-- Collection cycle metrics procedures
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Record the stage timings of one collection cycle in a single
+--          round trip
+--          (requires sql/schema/20_create_collection_metrics.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Insert one cycle row; the metal is resolved by code
+CREATE OR ALTER PROCEDURE lme_config.sp_RecordCollectionMetrics
+    @config_id INT = NULL,
+    @metal_code NVARCHAR(10),
+    @collection_type NVARCHAR(20),
+    @node_name NVARCHAR(100) = NULL,
+    @started_at DATETIME2(3),
+    @status NVARCHAR(10),
+    @spread_count INT = 0,
+    @tick_count INT = 0,
+    @search_ms INT = 0,
+    @fetch_ms INT = 0,
+    @store_spreads_ms INT = 0,
+    @store_ticks_ms INT = 0,
+    @total_ms INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO lme_config.LME_T_collection_metrics (
+        config_id, metal_id, collection_type, node_name, started_at, status,
+        spread_count, tick_count, search_ms, fetch_ms, store_spreads_ms, store_ticks_ms, total_ms
+    )
+    SELECT
+        @config_id, m.metal_id, @collection_type, @node_name, @started_at, @status,
+        @spread_count, @tick_count, @search_ms, @fetch_ms, @store_spreads_ms, @store_ticks_ms, @total_ms
+    FROM lme_config.LME_M_metals m
+    WHERE m.metal_code = @metal_code;
+
+    SELECT @@ROWCOUNT AS RecordedRows;
+END
+GO
+
+-- Verify procedure creation
+SELECT
+    s.name AS SchemaName,
+    p.name AS ProcedureName,
+    p.create_date
+FROM sys.procedures p
+JOIN sys.schemas s ON p.schema_id = s.schema_id
+WHERE s.name = 'lme_config' AND p.name = 'sp_RecordCollectionMetrics';
+
+PRINT 'Created lme_config.sp_RecordCollectionMetrics successfully';
+GO
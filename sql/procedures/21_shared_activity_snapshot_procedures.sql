@@ -0,0 +1,67 @@
+-- Activity snapshot computed in the database for multi-node collection
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: With collection.multi_node, several collector nodes share the
+--          jobs and none of them holds every stored tick in memory, so the
+--          monitoring snapshot is rebuilt from LME_M_spreads and
+--          LME_T_latest_quote (no tick data is read)
+--          (requires sql/schema/11_create_latest_quote.sql and
+--          sql/schema/16_create_activity_snapshot.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Rebuild the whole snapshot from the database in one transaction
+CREATE OR ALTER PROCEDURE lme_market.sp_RefreshActivitySnapshot
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @snapshot_at DATETIME2(3) = GETDATE();
+    DECLARE @today DATE = CAST(@snapshot_at AS DATE);
+    DECLARE @rows INT;
+
+    BEGIN TRANSACTION;
+
+    DELETE FROM lme_market.LME_T_spread_activity_snapshot WITH (TABLOCKX);
+
+    INSERT INTO lme_market.LME_T_spread_activity_snapshot (
+        metal_id, spread_type, spread_count, active_1h, active_30m, volume_today, snapshot_at
+    )
+    SELECT
+        s.metal_id,
+        s.spread_type,
+        COUNT(*),
+        SUM(CASE WHEN lq.timestamp >= DATEADD(HOUR, -1, @snapshot_at) THEN 1 ELSE 0 END),
+        SUM(CASE WHEN lq.timestamp >= DATEADD(MINUTE, -30, @snapshot_at) THEN 1 ELSE 0 END),
+        ISNULL(SUM(CASE WHEN CAST(lq.timestamp AS DATE) = @today THEN lq.todays_volume END), 0),
+        @snapshot_at
+    FROM lme_market.LME_M_spreads s
+    LEFT JOIN lme_market.LME_T_latest_quote lq ON lq.spread_id = s.spread_id
+    WHERE s.is_active = 1
+    GROUP BY s.metal_id, s.spread_type;
+
+    SET @rows = @@ROWCOUNT;
+
+    COMMIT TRANSACTION;
+
+    SELECT @rows AS SnapshotRows;
+END
+GO
+
+-- Verify procedure creation
+SELECT
+    s.name AS SchemaName,
+    p.name AS ProcedureName,
+    p.create_date
+FROM sys.procedures p
+JOIN sys.schemas s ON p.schema_id = s.schema_id
+WHERE s.name = 'lme_market' AND p.name = 'sp_RefreshActivitySnapshot';
+
+PRINT 'Created lme_market.sp_RefreshActivitySnapshot successfully';
+GO
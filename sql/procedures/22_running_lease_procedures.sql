@@ -0,0 +1,60 @@
+-- Renew only the leases of running collection jobs
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: sp_RenewCollectionLeases extended every lease a node held, so a
+--          lease left behind by a failed completion was renewed for the
+--          life of the process and the job never ran again on any node.
+--          The collector now passes the config_ids it is running
+--          (requires sql/procedures/17_collection_lease_procedures.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Drop procedure first (it depends on the table type)
+IF OBJECT_ID('lme_config.sp_RenewCollectionLeases', 'P') IS NOT NULL DROP PROCEDURE lme_config.sp_RenewCollectionLeases;
+GO
+
+IF EXISTS (SELECT * FROM sys.types WHERE name = 'LME_ConfigIdListType' AND schema_id = SCHEMA_ID('lme_config'))
+    DROP TYPE lme_config.LME_ConfigIdListType;
+GO
+
+-- Table type for a list of collection config ids
+CREATE TYPE lme_config.LME_ConfigIdListType AS TABLE
+(
+    config_id INT NOT NULL PRIMARY KEY
+);
+GO
+
+-- Extend the leases a node holds on the jobs it is running
+CREATE PROCEDURE lme_config.sp_RenewCollectionLeases
+    @owner NVARCHAR(100),
+    @lease_seconds INT,
+    @ConfigIds lme_config.LME_ConfigIdListType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    UPDATE cc
+    SET lease_expires = DATEADD(SECOND, @lease_seconds, GETDATE())
+    FROM lme_config.LME_M_collection_config cc
+    JOIN @ConfigIds ids ON ids.config_id = cc.config_id
+    WHERE cc.lease_owner = @owner
+    AND cc.lease_expires >= GETDATE();
+
+    SELECT @@ROWCOUNT AS renewed;
+END
+GO
+
+-- Verify procedure
+SELECT name, create_date, modify_date
+FROM sys.procedures
+WHERE schema_id = SCHEMA_ID('lme_config')
+AND name = 'sp_RenewCollectionLeases';
+GO
+
+PRINT 'Updated lme_config.sp_RenewCollectionLeases successfully';
+GO
@@ -0,0 +1,56 @@
+-- Add hash-keyed duplicate detection to LME_T_tick_data
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Replace the ISNULL(..., -999999) duplicate scan with a persisted
+--          quote hash backed by a unique IGNORE_DUP_KEY index, so duplicate
+--          elimination is a single index probe regardless of table size
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+SET ANSI_PADDING ON;
+SET ANSI_WARNINGS ON;
+SET ARITHABORT ON;
+SET CONCAT_NULL_YIELDS_NULL ON;
+SET NUMERIC_ROUNDABORT OFF;
+GO
+
+-- 8-byte hash of bid/ask/last_price ('N' marks NULL so NULL and 0 differ)
+IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data') AND name = 'quote_hash')
+BEGIN
+    ALTER TABLE lme_market.LME_T_tick_data ADD quote_hash AS
+        CAST(HASHBYTES('SHA2_256', CONCAT(
+            ISNULL(CONVERT(VARCHAR(20), bid), 'N'), '|',
+            ISNULL(CONVERT(VARCHAR(20), ask), 'N'), '|',
+            ISNULL(CONVERT(VARCHAR(20), last_price), 'N')
+        )) AS BINARY(8)) PERSISTED;
+END
+GO
+
+-- Remove existing duplicates so the unique index can be built (keeps the first tick)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data') AND name = 'UX_LME_T_tick_dedup')
+BEGIN
+    WITH Duplicates AS (
+        SELECT
+            ROW_NUMBER() OVER (PARTITION BY spread_id, timestamp, quote_hash ORDER BY tick_id) AS rn
+        FROM lme_market.LME_T_tick_data
+    )
+    DELETE FROM Duplicates WHERE rn > 1;
+
+    PRINT CONCAT('Removed ', @@ROWCOUNT, ' duplicate tick rows');
+END
+GO
+
+-- Dedup key: duplicates are silently discarded on insert
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data') AND name = 'UX_LME_T_tick_dedup')
+BEGIN
+    CREATE UNIQUE INDEX UX_LME_T_tick_dedup
+    ON lme_market.LME_T_tick_data(spread_id, timestamp, quote_hash)
+    WITH (IGNORE_DUP_KEY = ON);
+END
+GO
+
+PRINT 'Successfully added/verified tick quote hash and dedup index';
+GO
@@ -0,0 +1,164 @@
+-- Monthly partitioning of LME_T_tick_data
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Partition tick data by month on timestamp so time-bounded queries
+--          touch only the partitions they need, and expired months can be
+--          switched out instead of deleted row by row.
+--          Run after 07_add_tick_quote_hash.sql. Partitions are maintained by
+--          scripts/sql_collector/maintain_tick_partitions.py
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+SET ANSI_PADDING ON;
+SET ANSI_WARNINGS ON;
+SET ARITHABORT ON;
+SET CONCAT_NULL_YIELDS_NULL ON;
+SET NUMERIC_ROUNDABORT OFF;
+GO
+
+-- ===================================
+-- Partition function and scheme
+-- ===================================
+
+-- RANGE RIGHT monthly boundaries from the first month with data
+-- through two months ahead, so the last partition is always empty
+IF NOT EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = 'PF_LME_tick_month')
+BEGIN
+    DECLARE @first_month DATE = DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1);
+    DECLARE @last_month DATE = DATEADD(MONTH, 2, @first_month);
+    DECLARE @min_timestamp DATETIME2(3) = (SELECT MIN(timestamp) FROM lme_market.LME_T_tick_data);
+    DECLARE @boundaries NVARCHAR(MAX) = N'';
+    DECLARE @month DATE;
+
+    IF @min_timestamp IS NOT NULL AND @min_timestamp < @first_month
+        SET @first_month = DATEFROMPARTS(YEAR(@min_timestamp), MONTH(@min_timestamp), 1);
+
+    SET @month = @first_month;
+    WHILE @month <= @last_month
+    BEGIN
+        SET @boundaries += CASE WHEN @boundaries = N'' THEN N'' ELSE N', ' END
+                         + N'''' + CONVERT(NVARCHAR(10), @month, 23) + N'''';
+        SET @month = DATEADD(MONTH, 1, @month);
+    END
+
+    EXEC(N'CREATE PARTITION FUNCTION PF_LME_tick_month (DATETIME2(3)) AS RANGE RIGHT FOR VALUES (' + @boundaries + N')');
+    PRINT 'Created partition function PF_LME_tick_month';
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = 'PS_LME_tick_month')
+BEGIN
+    CREATE PARTITION SCHEME PS_LME_tick_month
+    AS PARTITION PF_LME_tick_month ALL TO ([PRIMARY]);
+    PRINT 'Created partition scheme PS_LME_tick_month';
+END
+GO
+
+-- ===================================
+-- Rebuild LME_T_tick_data on the scheme
+-- ===================================
+
+-- The clustered identity PK cannot be aligned; replace it with a clustered
+-- index on (timestamp, tick_id) and a nonclustered PK that includes timestamp
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data') AND name = 'CX_LME_T_tick_data')
+BEGIN
+    DECLARE @pk_name SYSNAME = (
+        SELECT name FROM sys.key_constraints
+        WHERE parent_object_id = OBJECT_ID('lme_market.LME_T_tick_data') AND type = 'PK'
+    );
+
+    IF @pk_name IS NOT NULL
+        EXEC(N'ALTER TABLE lme_market.LME_T_tick_data DROP CONSTRAINT ' + @pk_name);
+
+    CREATE CLUSTERED INDEX CX_LME_T_tick_data
+    ON lme_market.LME_T_tick_data(timestamp, tick_id)
+    ON PS_LME_tick_month(timestamp);
+
+    ALTER TABLE lme_market.LME_T_tick_data
+    ADD CONSTRAINT PK_LME_T_tick_data PRIMARY KEY NONCLUSTERED (tick_id, timestamp)
+    ON PS_LME_tick_month(timestamp);
+
+    PRINT 'Rebuilt LME_T_tick_data on PS_LME_tick_month';
+END
+GO
+
+-- Align nonclustered indexes with the partition scheme
+CREATE INDEX IX_LME_T_tick_timestamp ON lme_market.LME_T_tick_data(timestamp) INCLUDE (spread_id)
+    WITH (DROP_EXISTING = ON) ON PS_LME_tick_month(timestamp);
+CREATE INDEX IX_LME_T_tick_spread_timestamp ON lme_market.LME_T_tick_data(spread_id, timestamp DESC)
+    WITH (DROP_EXISTING = ON) ON PS_LME_tick_month(timestamp);
+CREATE INDEX IX_LME_T_tick_todays_volume ON lme_market.LME_T_tick_data(todays_volume) WHERE todays_volume > 0
+    WITH (DROP_EXISTING = ON) ON PS_LME_tick_month(timestamp);
+CREATE INDEX IX_LME_T_tick_trading_dt ON lme_market.LME_T_tick_data(trading_dt, spread_id)
+    WITH (DROP_EXISTING = ON) ON PS_LME_tick_month(timestamp);
+CREATE UNIQUE INDEX UX_LME_T_tick_dedup ON lme_market.LME_T_tick_data(spread_id, timestamp, quote_hash)
+    WITH (IGNORE_DUP_KEY = ON, DROP_EXISTING = ON) ON PS_LME_tick_month(timestamp);
+GO
+
+-- ===================================
+-- Switch-out staging table
+-- ===================================
+
+-- Same structure and indexes as LME_T_tick_data on [PRIMARY];
+-- expired partitions are switched in here, then archived or truncated
+IF OBJECT_ID('lme_market.LME_T_tick_data_switch', 'U') IS NULL
+BEGIN
+    CREATE TABLE lme_market.LME_T_tick_data_switch (
+        tick_id BIGINT IDENTITY(1,1) NOT NULL,
+        spread_id INT NOT NULL,
+        timestamp DATETIME2(3) NOT NULL,
+        bid DECIMAL(12,4),
+        ask DECIMAL(12,4),
+        last_price DECIMAL(12,4),
+        bid_size INT,
+        ask_size INT,
+        volume BIGINT,
+        todays_volume BIGINT,
+        open_interest INT,
+        last_update_dt DATE,
+        trading_dt DATE,
+        rt_spread_bp DECIMAL(10,2),
+        contract_value DECIMAL(18,2),
+        data_source NVARCHAR(20) DEFAULT 'Bloomberg',
+        quality_flag TINYINT DEFAULT 0,
+        created_at DATETIME2(3) DEFAULT GETDATE(),
+        quote_hash AS
+            CAST(HASHBYTES('SHA2_256', CONCAT(
+                ISNULL(CONVERT(VARCHAR(20), bid), 'N'), '|',
+                ISNULL(CONVERT(VARCHAR(20), ask), 'N'), '|',
+                ISNULL(CONVERT(VARCHAR(20), last_price), 'N')
+            )) AS BINARY(8)) PERSISTED,
+        CONSTRAINT PK_LME_T_tick_data_switch PRIMARY KEY NONCLUSTERED (tick_id, timestamp)
+    ) ON [PRIMARY];
+
+    CREATE CLUSTERED INDEX CX_LME_T_tick_data_switch ON lme_market.LME_T_tick_data_switch(timestamp, tick_id);
+    CREATE INDEX IX_LME_T_tick_switch_timestamp ON lme_market.LME_T_tick_data_switch(timestamp) INCLUDE (spread_id);
+    CREATE INDEX IX_LME_T_tick_switch_spread_timestamp ON lme_market.LME_T_tick_data_switch(spread_id, timestamp DESC);
+    CREATE INDEX IX_LME_T_tick_switch_todays_volume ON lme_market.LME_T_tick_data_switch(todays_volume) WHERE todays_volume > 0;
+    CREATE INDEX IX_LME_T_tick_switch_trading_dt ON lme_market.LME_T_tick_data_switch(trading_dt, spread_id);
+    CREATE UNIQUE INDEX UX_LME_T_tick_switch_dedup ON lme_market.LME_T_tick_data_switch(spread_id, timestamp, quote_hash)
+        WITH (IGNORE_DUP_KEY = ON);
+
+    PRINT 'Created switch-out staging table LME_T_tick_data_switch';
+END
+GO
+
+-- Verify partition layout
+SELECT
+    p.partition_number,
+    prv.value AS lower_boundary,
+    p.rows
+FROM sys.partitions p
+JOIN sys.indexes i ON p.object_id = i.object_id AND p.index_id = i.index_id
+LEFT JOIN sys.partition_range_values prv
+    ON prv.function_id = (SELECT function_id FROM sys.partition_functions WHERE name = 'PF_LME_tick_month')
+    AND prv.boundary_id = p.partition_number - 1
+WHERE p.object_id = OBJECT_ID('lme_market.LME_T_tick_data')
+AND i.name = 'CX_LME_T_tick_data'
+ORDER BY p.partition_number;
+
+PRINT 'Successfully partitioned LME_T_tick_data by month';
+GO
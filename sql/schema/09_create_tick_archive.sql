@@ -0,0 +1,47 @@
+-- Columnstore archive tier for LME tick data
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Archive table for ticks older than archive.hot_days, stored as a
+--          clustered columnstore with archive compression for batch-mode
+--          research scans. Filled by scripts/sql_collector/archive_tick_data.py
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+IF OBJECT_ID('lme_market.LME_T_tick_archive', 'U') IS NULL
+BEGIN
+    CREATE TABLE lme_market.LME_T_tick_archive (
+        tick_id BIGINT NOT NULL,
+        spread_id INT NOT NULL,
+        timestamp DATETIME2(3) NOT NULL,
+        bid DECIMAL(12,4),
+        ask DECIMAL(12,4),
+        last_price DECIMAL(12,4),
+        bid_size INT,
+        ask_size INT,
+        volume BIGINT,
+        todays_volume BIGINT,
+        open_interest INT,
+        last_update_dt DATE,
+        trading_dt DATE,
+        rt_spread_bp DECIMAL(10,2),
+        contract_value DECIMAL(18,2),
+        data_source NVARCHAR(20),
+        quality_flag TINYINT,
+        created_at DATETIME2(3),
+        archived_at DATETIME2(3) DEFAULT GETDATE()
+    );
+
+    -- Days are archived in timestamp order, so rowgroup min/max on timestamp
+    -- lets date-bounded scans skip segments without partitioning the archive
+    CREATE CLUSTERED COLUMNSTORE INDEX CCI_LME_T_tick_archive
+    ON lme_market.LME_T_tick_archive
+    WITH (DATA_COMPRESSION = COLUMNSTORE_ARCHIVE);
+
+    PRINT 'Created columnstore archive table LME_T_tick_archive';
+END
+GO
@@ -0,0 +1,54 @@
+-- One-minute bars for downsampled LME tick data
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Long-term storage for ticks older than archive.raw_retention_days.
+--          Filled by scripts/sql_collector/downsample_tick_data.py, which then
+--          purges the raw rows. LME_T_downsampled_days records the days whose
+--          bars are complete so they are never rebuilt from partly purged ticks
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+IF OBJECT_ID('lme_market.LME_T_minute_bars', 'U') IS NULL
+BEGIN
+    CREATE TABLE lme_market.LME_T_minute_bars (
+        spread_id INT NOT NULL,
+        bar_time DATETIME2(0) NOT NULL,          -- Start of the minute
+        mid_open DECIMAL(12,4),
+        mid_high DECIMAL(12,4),
+        mid_low DECIMAL(12,4),
+        mid_close DECIMAL(12,4),
+        last_open DECIMAL(12,4),
+        last_high DECIMAL(12,4),
+        last_low DECIMAL(12,4),
+        last_close DECIMAL(12,4),
+        bid_close DECIMAL(12,4),
+        ask_close DECIMAL(12,4),
+        max_todays_volume BIGINT,
+        tick_count INT NOT NULL,
+        created_at DATETIME2 DEFAULT GETDATE(),
+        CONSTRAINT PK_LME_T_minute_bars PRIMARY KEY (spread_id, bar_time),
+        FOREIGN KEY (spread_id) REFERENCES lme_market.LME_M_spreads(spread_id)
+    );
+
+    CREATE INDEX IX_LME_T_minute_bars_time ON lme_market.LME_T_minute_bars(bar_time) INCLUDE (spread_id);
+
+    PRINT 'Created table LME_T_minute_bars';
+END
+GO
+
+IF OBJECT_ID('lme_market.LME_T_downsampled_days', 'U') IS NULL
+BEGIN
+    CREATE TABLE lme_market.LME_T_downsampled_days (
+        bar_date DATE NOT NULL PRIMARY KEY,      -- Day whose minute bars are final
+        bar_count INT NOT NULL,
+        downsampled_at DATETIME2 NOT NULL DEFAULT GETDATE()
+    );
+
+    PRINT 'Created table LME_T_downsampled_days';
+END
+GO
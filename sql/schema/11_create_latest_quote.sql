@@ -0,0 +1,58 @@
+-- Latest quote table for LME spreads
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: One row per spread holding its most recent tick, maintained by the
+--          tick insert procedures so "current market" reads are O(spreads)
+--          instead of MAX(timestamp) GROUP BY over the tick table
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+IF OBJECT_ID('lme_market.LME_T_latest_quote', 'U') IS NULL
+BEGIN
+    CREATE TABLE lme_market.LME_T_latest_quote (
+        spread_id INT NOT NULL PRIMARY KEY,
+        timestamp DATETIME2(3) NOT NULL,
+        bid DECIMAL(12,4),
+        ask DECIMAL(12,4),
+        last_price DECIMAL(12,4),
+        bid_size INT,
+        ask_size INT,
+        volume BIGINT,
+        todays_volume BIGINT,
+        open_interest INT,
+        last_update_dt DATE,
+        trading_dt DATE,
+        updated_at DATETIME2(3) DEFAULT GETDATE(),
+        FOREIGN KEY (spread_id) REFERENCES lme_market.LME_M_spreads(spread_id)
+    );
+
+    CREATE INDEX IX_LME_T_latest_quote_timestamp ON lme_market.LME_T_latest_quote(timestamp);
+
+    PRINT 'Created table LME_T_latest_quote';
+END
+GO
+
+-- Backfill from the latest stored tick of each spread
+INSERT INTO lme_market.LME_T_latest_quote (
+    spread_id, timestamp, bid, ask, last_price, bid_size, ask_size,
+    volume, todays_volume, open_interest, last_update_dt, trading_dt
+)
+SELECT
+    s.spread_id, t.timestamp, t.bid, t.ask, t.last_price, t.bid_size, t.ask_size,
+    t.volume, t.todays_volume, t.open_interest, t.last_update_dt, t.trading_dt
+FROM lme_market.LME_M_spreads s
+CROSS APPLY (
+    SELECT TOP 1 *
+    FROM lme_market.LME_T_tick_data
+    WHERE spread_id = s.spread_id
+    ORDER BY timestamp DESC
+) t
+WHERE NOT EXISTS (SELECT 1 FROM lme_market.LME_T_latest_quote lq WHERE lq.spread_id = s.spread_id);
+
+PRINT CONCAT('Backfilled ', @@ROWCOUNT, ' latest quotes');
+GO
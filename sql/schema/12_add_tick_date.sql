@@ -0,0 +1,54 @@
+-- Add a sargable trading-date column to LME_T_tick_data
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Persist CAST(timestamp AS DATE) as tick_date and cover it with
+--          (tick_date, spread_id) INCLUDE (bid, ask, last_price, todays_volume)
+--          so day-bounded views and procedures seek one day instead of
+--          evaluating the cast on every row
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+SET ANSI_PADDING ON;
+SET ANSI_WARNINGS ON;
+SET ARITHABORT ON;
+SET CONCAT_NULL_YIELDS_NULL ON;
+SET NUMERIC_ROUNDABORT OFF;
+GO
+
+-- Trading date of each tick
+IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data') AND name = 'tick_date')
+BEGIN
+    ALTER TABLE lme_market.LME_T_tick_data ADD tick_date AS CAST(timestamp AS DATE) PERSISTED;
+END
+GO
+
+-- Covering index for day-bounded queries (aligned with the monthly partitions)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data') AND name = 'IX_LME_T_tick_date_spread')
+BEGIN
+    CREATE INDEX IX_LME_T_tick_date_spread
+    ON lme_market.LME_T_tick_data(tick_date, spread_id)
+    INCLUDE (bid, ask, last_price, todays_volume)
+    ON PS_LME_tick_month(timestamp);
+END
+GO
+
+-- The switch-out staging table must keep the same columns and indexes
+IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data_switch') AND name = 'tick_date')
+BEGIN
+    ALTER TABLE lme_market.LME_T_tick_data_switch ADD tick_date AS CAST(timestamp AS DATE) PERSISTED;
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_market.LME_T_tick_data_switch') AND name = 'IX_LME_T_tick_switch_date_spread')
+BEGIN
+    CREATE INDEX IX_LME_T_tick_switch_date_spread
+    ON lme_market.LME_T_tick_data_switch(tick_date, spread_id)
+    INCLUDE (bid, ask, last_price, todays_volume);
+END
+GO
+
+PRINT 'Successfully added/verified tick_date column and index';
+GO
@@ -0,0 +1,56 @@
+-- Add last activity timestamps to LME_M_spreads
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Keep last_quote_at (latest tick with a bid or ask) and
+--          last_trade_at (latest tick with a last price) on the spread master
+--          so activity checks are index range scans per metal instead of
+--          joins against LME_T_tick_data
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('lme_market.LME_M_spreads') AND name = 'last_quote_at')
+BEGIN
+    ALTER TABLE lme_market.LME_M_spreads ADD last_quote_at DATETIME2(3) NULL;
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('lme_market.LME_M_spreads') AND name = 'last_trade_at')
+BEGIN
+    ALTER TABLE lme_market.LME_M_spreads ADD last_trade_at DATETIME2(3) NULL;
+END
+GO
+
+-- Backfill from stored ticks
+UPDATE s
+SET s.last_quote_at = a.last_quote_at,
+    s.last_trade_at = a.last_trade_at
+FROM lme_market.LME_M_spreads s
+JOIN (
+    SELECT
+        spread_id,
+        MAX(CASE WHEN bid IS NOT NULL OR ask IS NOT NULL THEN timestamp END) AS last_quote_at,
+        MAX(CASE WHEN last_price IS NOT NULL THEN timestamp END) AS last_trade_at
+    FROM lme_market.LME_T_tick_data
+    GROUP BY spread_id
+) a ON s.spread_id = a.spread_id
+WHERE s.last_quote_at IS NULL AND s.last_trade_at IS NULL;
+
+PRINT CONCAT('Backfilled activity timestamps for ', @@ROWCOUNT, ' spreads');
+GO
+
+-- Active spreads per metal by last quote time
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_market.LME_M_spreads') AND name = 'IX_LME_M_spreads_metal_quote')
+BEGIN
+    CREATE INDEX IX_LME_M_spreads_metal_quote
+    ON lme_market.LME_M_spreads(metal_id, is_active, last_quote_at)
+    INCLUDE (ticker, spread_type, description, last_trade_at);
+END
+GO
+
+PRINT 'Successfully added/verified spread activity columns';
+GO
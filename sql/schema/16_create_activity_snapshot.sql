@@ -0,0 +1,32 @@
+-- Spread activity snapshot table for monitoring views
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Hold the per metal / spread type activity rollups written by the
+--          collection service at the end of each cycle, so
+--          V_spread_type_summary and V_collection_health no longer join
+--          every active spread to LME_T_tick_data
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+IF OBJECT_ID('lme_market.LME_T_spread_activity_snapshot', 'U') IS NULL
+BEGIN
+    CREATE TABLE lme_market.LME_T_spread_activity_snapshot (
+        metal_id INT NOT NULL,
+        spread_type NVARCHAR(20) NOT NULL,
+        spread_count INT NOT NULL,               -- Active spreads
+        active_1h INT NOT NULL,                  -- Spreads with a tick in the last hour
+        active_30m INT NOT NULL,                 -- Spreads with a tick in the last 30 minutes
+        volume_today BIGINT NOT NULL,            -- Sum of the spreads' current todays_volume
+        snapshot_at DATETIME2(3) NOT NULL,
+        PRIMARY KEY (metal_id, spread_type),
+        FOREIGN KEY (metal_id) REFERENCES lme_config.LME_M_metals(metal_id)
+    );
+
+    PRINT 'Created table LME_T_spread_activity_snapshot';
+END
+GO
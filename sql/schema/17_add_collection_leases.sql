@@ -0,0 +1,37 @@
+-- Add job lease columns to LME_M_collection_config
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Let several collector processes share the collection schedules.
+--          A node claims a due job by writing lease_owner / lease_expires;
+--          leases of a crashed node expire and the job is claimed by another
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('lme_config.LME_M_collection_config') AND name = 'lease_owner')
+BEGIN
+    ALTER TABLE lme_config.LME_M_collection_config ADD lease_owner NVARCHAR(100) NULL;
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('lme_config.LME_M_collection_config') AND name = 'lease_expires')
+BEGIN
+    ALTER TABLE lme_config.LME_M_collection_config ADD lease_expires DATETIME2 NULL;
+END
+GO
+
+-- Due-job scan of the claim procedure
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_config.LME_M_collection_config') AND name = 'IX_LME_M_collection_config_due')
+BEGIN
+    CREATE INDEX IX_LME_M_collection_config_due
+    ON lme_config.LME_M_collection_config(is_active, next_run)
+    INCLUDE (lease_owner, lease_expires);
+END
+GO
+
+PRINT 'Successfully added/verified collection lease columns';
+GO
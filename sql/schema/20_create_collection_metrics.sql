@@ -0,0 +1,50 @@
+-- Collection cycle metrics table
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: One row per collection cycle with the milliseconds spent in each
+--          stage (instrument search, Bloomberg fetch, spread upsert, tick
+--          store), so sweep durations can be trended per metal and
+--          collection type
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+IF OBJECT_ID('lme_config.LME_T_collection_metrics', 'U') IS NULL
+BEGIN
+    CREATE TABLE lme_config.LME_T_collection_metrics (
+        metric_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+        config_id INT NULL,
+        metal_id INT NOT NULL,
+        collection_type NVARCHAR(20) NOT NULL,
+        node_name NVARCHAR(100) NULL,            -- Collector node that ran the cycle
+        started_at DATETIME2(3) NOT NULL,
+        status NVARCHAR(10) NOT NULL,            -- 'SUCCESS', 'FAILED'
+        spread_count INT NOT NULL DEFAULT 0,     -- Spreads polled (DAILY: spreads found by the search)
+        tick_count INT NOT NULL DEFAULT 0,       -- Tick rows handed to the store
+        search_ms INT NOT NULL DEFAULT 0,        -- search_spreads
+        fetch_ms INT NOT NULL DEFAULT 0,         -- get_market_data
+        store_spreads_ms INT NOT NULL DEFAULT 0, -- store_spreads
+        store_ticks_ms INT NOT NULL DEFAULT 0,   -- store_tick_data (queue hand-off with the tick writer)
+        total_ms INT NOT NULL,                   -- Wall time of the cycle
+        FOREIGN KEY (metal_id) REFERENCES lme_config.LME_M_metals(metal_id)
+    );
+
+    PRINT 'Created table LME_T_collection_metrics';
+END
+GO
+
+-- Trend queries per metal / collection type over time
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('lme_config.LME_T_collection_metrics') AND name = 'IX_LME_T_collection_metrics_metal_type')
+BEGIN
+    CREATE INDEX IX_LME_T_collection_metrics_metal_type
+    ON lme_config.LME_T_collection_metrics(metal_id, collection_type, started_at)
+    INCLUDE (status, spread_count, tick_count, search_ms, fetch_ms, store_spreads_ms, store_ticks_ms, total_ms);
+END
+GO
+
+PRINT 'Successfully added/verified collection metrics table';
+GO
@@ -0,0 +1,57 @@
+-- Union views over hot and archived tick data
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Present LME_T_tick_data (rowstore) and LME_T_tick_archive
+--          (columnstore) as one table for historical analysis
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- All tick data, hot and archived
+-- A day lives in exactly one of the two tables (sp_ArchiveTickDay moves it atomically)
+CREATE OR ALTER VIEW lme_market.V_tick_data_all
+AS
+SELECT
+    tick_id, spread_id, timestamp, bid, ask, last_price,
+    bid_size, ask_size, volume, todays_volume, open_interest,
+    last_update_dt, trading_dt, rt_spread_bp, contract_value,
+    data_source, quality_flag, created_at,
+    CAST(0 AS BIT) AS is_archived
+FROM lme_market.LME_T_tick_data
+UNION ALL
+SELECT
+    tick_id, spread_id, timestamp, bid, ask, last_price,
+    bid_size, ask_size, volume, todays_volume, open_interest,
+    last_update_dt, trading_dt, rt_spread_bp, contract_value,
+    data_source, quality_flag, created_at,
+    CAST(1 AS BIT) AS is_archived
+FROM lme_market.LME_T_tick_archive;
+GO
+
+-- View for historical price data (for charting), now including archived ticks
+CREATE OR ALTER VIEW lme_market.V_price_history
+AS
+SELECT 
+    s.spread_id,
+    m.metal_code,
+    s.ticker,
+    t.timestamp,
+    t.bid,
+    t.ask,
+    t.last_price,
+    (t.bid + t.ask) / 2.0 as mid_price,
+    t.volume,
+    t.todays_volume
+FROM lme_market.V_tick_data_all t
+JOIN lme_market.LME_M_spreads s ON t.spread_id = s.spread_id
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+WHERE t.last_price IS NOT NULL 
+   OR (t.bid IS NOT NULL AND t.ask IS NOT NULL);
+GO
+
+PRINT 'Created tick archive union views successfully';
+GO
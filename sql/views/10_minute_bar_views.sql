@@ -0,0 +1,39 @@
+-- Views over downsampled one-minute bars
+-- Version: 1.0
+-- Date: 2025-07-25
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- One-minute bars with spread and metal details
+CREATE OR ALTER VIEW lme_market.V_minute_bars
+AS
+SELECT
+    m.metal_code,
+    s.ticker,
+    s.spread_type,
+    b.spread_id,
+    b.bar_time,
+    b.mid_open,
+    b.mid_high,
+    b.mid_low,
+    b.mid_close,
+    b.last_open,
+    b.last_high,
+    b.last_low,
+    b.last_close,
+    b.bid_close,
+    b.ask_close,
+    b.max_todays_volume,
+    b.tick_count
+FROM lme_market.LME_T_minute_bars b
+JOIN lme_market.LME_M_spreads s ON b.spread_id = s.spread_id
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id;
+GO
+
+PRINT 'Created minute bar views successfully';
+GO
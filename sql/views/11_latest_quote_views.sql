@@ -0,0 +1,159 @@
+-- Current-market views on top of LME_T_latest_quote
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Read the latest quote of each spread from LME_T_latest_quote
+--          instead of aggregating 24 hours of ticks, and join the actual
+--          spread type views on spread_id instead of ticker
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- View for latest market data (most recent tick for each spread)
+CREATE OR ALTER VIEW lme_market.V_latest_market_data
+AS
+SELECT 
+    m.metal_code,
+    m.metal_name,
+    s.ticker,
+    s.spread_type,
+    s.description,
+    s.prompt_date1,
+    s.prompt_date2,
+    s.leg1_description,
+    s.leg2_description,
+    lq.bid,
+    lq.ask,
+    lq.last_price,
+    lq.bid_size,
+    lq.ask_size,
+    lq.todays_volume,
+    lq.open_interest,
+    (lq.ask - lq.bid) as bid_ask_spread,
+    lq.timestamp as last_update_time,
+    lq.last_update_dt,
+    lq.trading_dt,
+    CASE 
+        WHEN lq.timestamp > DATEADD(MINUTE, -10, GETDATE()) THEN 'Active'
+        WHEN lq.timestamp > DATEADD(HOUR, -1, GETDATE()) THEN 'Recent'
+        ELSE 'Stale'
+    END as data_freshness,
+    s.spread_id
+FROM lme_market.LME_T_latest_quote lq
+JOIN lme_market.LME_M_spreads s ON lq.spread_id = s.spread_id
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+WHERE s.is_active = 1
+AND lq.timestamp > DATEADD(HOUR, -24, GETDATE());  -- Last 24 hours
+GO
+
+-- 1. Active spreads with actual classification
+CREATE OR ALTER VIEW lme_market.V_active_spreads_actual
+AS
+SELECT 
+    m.metal_code,
+    s.ticker,
+    s.spread_type as original_type,
+    COALESCE(s.actual_spread_type, s.spread_type) as spread_type,  -- Use actual if available
+    s.actual_leg1_type,
+    s.actual_leg2_type,
+    s.prompt_date1,
+    s.prompt_date2,
+    s.leg1_description,
+    s.leg2_description,
+    md.bid as bid_price,
+    md.ask as ask_price,
+    md.last_price,
+    md.todays_volume as volume,
+    md.last_update_dt,
+    s.classification_notes
+FROM lme_market.LME_M_spreads s
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+LEFT JOIN lme_market.V_latest_market_data md ON s.spread_id = md.spread_id
+WHERE s.is_active = 1;
+GO
+
+-- 2. Spread type summary using actual types
+CREATE OR ALTER VIEW lme_market.V_spread_type_summary_actual
+AS
+SELECT 
+    m.metal_code,
+    COALESCE(s.actual_spread_type, s.spread_type) as spread_type,
+    COUNT(DISTINCT s.spread_id) as spread_count,
+    COUNT(DISTINCT CASE WHEN md.last_update_dt >= CAST(GETDATE() AS DATE) THEN s.spread_id END) as active_today,
+    AVG(md.todays_volume) as avg_volume,
+    MAX(md.last_update_dt) as last_activity
+FROM lme_market.LME_M_spreads s
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+LEFT JOIN lme_market.V_latest_market_data md ON s.spread_id = md.spread_id
+WHERE s.is_active = 1
+GROUP BY m.metal_code, COALESCE(s.actual_spread_type, s.spread_type);
+GO
+
+-- 3. Cash-3W spreads specifically
+CREATE OR ALTER VIEW lme_market.V_cash_3w_spreads
+AS
+SELECT 
+    m.metal_code,
+    s.ticker,
+    s.prompt_date1 as cash_date,
+    s.prompt_date2 as third_wed_date,
+    DATENAME(MONTH, s.prompt_date2) + ' ' + CAST(YEAR(s.prompt_date2) as VARCHAR(4)) as contract_month,
+    md.bid as bid_price,
+    md.ask as ask_price,
+    md.last_price,
+    md.todays_volume as volume,
+    md.last_update_dt
+FROM lme_market.LME_M_spreads s
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+LEFT JOIN lme_market.V_latest_market_data md ON s.spread_id = md.spread_id
+WHERE s.actual_spread_type = 'Cash-3W'
+  AND s.is_active = 1;
+GO
+
+-- 4. Reclassified spreads report
+CREATE OR ALTER VIEW lme_market.V_reclassified_spreads_report
+AS
+SELECT 
+    m.metal_code,
+    s.ticker,
+    s.spread_type as ticker_format_type,
+    s.actual_spread_type as actual_type,
+    s.prompt_date1,
+    s.prompt_date2,
+    md.todays_volume as volume,
+    md.last_update_dt,
+    s.classification_notes
+FROM lme_market.LME_M_spreads s
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+LEFT JOIN lme_market.V_latest_market_data md ON s.spread_id = md.spread_id
+WHERE s.spread_type != s.actual_spread_type
+  AND s.actual_spread_type IS NOT NULL
+  AND s.is_active = 1;
+GO
+
+-- 5. Today's active spreads by actual type
+CREATE OR ALTER VIEW lme_market.V_today_active_by_actual_type
+AS
+SELECT 
+    m.metal_code,
+    COALESCE(s.actual_spread_type, s.spread_type) as spread_type,
+    s.ticker,
+    s.prompt_date1,
+    s.prompt_date2,
+    md.bid,
+    md.ask,
+    md.last_price,
+    md.todays_volume,
+    md.last_update_dt
+FROM lme_market.LME_M_spreads s
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+JOIN lme_market.V_latest_market_data md ON s.spread_id = md.spread_id
+WHERE s.is_active = 1
+  AND md.last_update_dt >= CAST(GETDATE() AS DATE);
+GO
+
+PRINT 'Rebuilt current-market views on LME_T_latest_quote';
+GO
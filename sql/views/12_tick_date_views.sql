@@ -0,0 +1,36 @@
+-- Day-bounded views on the tick_date column
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Filter today's ticks with a seek on tick_date instead of
+--          CAST(timestamp AS DATE) (requires sql/schema/12_add_tick_date.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- View for today's trading activity
+CREATE OR ALTER VIEW lme_market.V_todays_activity
+AS
+SELECT 
+    m.metal_code,
+    s.ticker,
+    s.spread_type,
+    MIN(t.last_price) as days_low,
+    MAX(t.last_price) as days_high,
+    MAX(t.todays_volume) as volume,
+    COUNT(DISTINCT t.timestamp) as tick_count,
+    MIN(t.timestamp) as first_tick_time,
+    MAX(t.timestamp) as last_tick_time
+FROM lme_market.LME_T_tick_data t
+JOIN lme_market.LME_M_spreads s ON t.spread_id = s.spread_id
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+WHERE t.tick_date = CAST(GETDATE() AS DATE)
+AND t.todays_volume > 0
+GROUP BY m.metal_code, s.ticker, s.spread_type;
+GO
+
+PRINT 'Updated day-bounded views to use tick_date';
+GO
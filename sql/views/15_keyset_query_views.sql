@@ -0,0 +1,67 @@
+-- Key columns for streaming extracts
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Expose the keys used by market_data_query.py for keyset
+--          pagination: tick_id on V_price_history (tie-breaker for ticks
+--          sharing a timestamp) and spread_id on V_daily_summary
+--          (requires sql/views/09_tick_archive_views.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- View for historical price data (for charting), including archived ticks
+CREATE OR ALTER VIEW lme_market.V_price_history
+AS
+SELECT 
+    s.spread_id,
+    m.metal_code,
+    s.ticker,
+    t.timestamp,
+    t.bid,
+    t.ask,
+    t.last_price,
+    (t.bid + t.ask) / 2.0 as mid_price,
+    t.volume,
+    t.todays_volume,
+    t.tick_id
+FROM lme_market.V_tick_data_all t
+JOIN lme_market.LME_M_spreads s ON t.spread_id = s.spread_id
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id
+WHERE t.last_price IS NOT NULL 
+   OR (t.bid IS NOT NULL AND t.ask IS NOT NULL);
+GO
+
+-- View for daily summary data
+CREATE OR ALTER VIEW lme_market.V_daily_summary
+AS
+SELECT 
+    m.metal_code,
+    s.ticker,
+    s.spread_type,
+    ds.trading_date,
+    ds.open_price,
+    ds.high_price,
+    ds.low_price,
+    ds.close_price,
+    ds.vwap,
+    ds.total_volume,
+    ds.trade_count,
+    ds.avg_bid_ask_spread,
+    (ds.close_price - ds.open_price) as daily_change,
+    CASE 
+        WHEN ds.open_price > 0 
+        THEN ((ds.close_price - ds.open_price) / ds.open_price) * 100 
+        ELSE NULL 
+    END as daily_change_pct,
+    ds.spread_id
+FROM lme_market.LME_T_daily_summary ds
+JOIN lme_market.LME_M_spreads s ON ds.spread_id = s.spread_id
+JOIN lme_config.LME_M_metals m ON s.metal_id = m.metal_id;
+GO
+
+PRINT 'Updated price history and daily summary views with key columns';
+GO
@@ -0,0 +1,57 @@
+-- Monitoring views on the spread activity snapshot
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Read V_spread_type_summary and V_collection_health from
+--          LME_T_spread_activity_snapshot instead of scanning the tick table
+--          (requires sql/schema/16_create_activity_snapshot.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- View for spread type summary
+CREATE OR ALTER VIEW lme_market.V_spread_type_summary
+AS
+SELECT 
+    m.metal_code,
+    sn.spread_type,
+    sn.spread_count,
+    sn.active_1h as active_count,
+    sn.volume_today as volume_24h,
+    sn.snapshot_at
+FROM lme_market.LME_T_spread_activity_snapshot sn
+JOIN lme_config.LME_M_metals m ON sn.metal_id = m.metal_id;
+GO
+
+-- View for monitoring data collection health
+CREATE OR ALTER VIEW lme_config.V_collection_health
+AS
+SELECT 
+    m.metal_code,
+    m.metal_name,
+    sn.spread_type,
+    sn.spread_count as total_spreads,
+    sn.active_30m as recent_updates,
+    CAST(sn.active_30m AS FLOAT) / NULLIF(sn.spread_count, 0) * 100 as update_percentage,
+    cc.collection_type,
+    cc.interval_minutes,
+    cc.last_run,
+    DATEDIFF(MINUTE, cc.last_run, GETDATE()) as minutes_since_last_run,
+    CASE 
+        WHEN cc.last_run IS NULL THEN 'Never Run'
+        WHEN DATEDIFF(MINUTE, cc.last_run, GETDATE()) > cc.interval_minutes * 2 THEN 'Overdue'
+        WHEN DATEDIFF(MINUTE, cc.last_run, GETDATE()) > cc.interval_minutes THEN 'Due'
+        ELSE 'OK'
+    END as collection_status,
+    sn.snapshot_at
+FROM lme_config.LME_M_metals m
+JOIN lme_market.LME_T_spread_activity_snapshot sn ON m.metal_id = sn.metal_id
+LEFT JOIN lme_config.LME_M_collection_config cc ON m.metal_id = cc.metal_id
+WHERE m.is_active = 1;
+GO
+
+PRINT 'Updated monitoring views to read the activity snapshot';
+GO
@@ -0,0 +1,42 @@
+-- Collection cycle metrics views
+-- Version: 1.0
+-- Date: 2025-07-25
+-- Purpose: Hourly trend of collection cycle durations and the share of each
+--          stage, per metal and collection type
+--          (requires sql/schema/20_create_collection_metrics.sql)
+
+USE JCL;
+GO
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+-- Stage times are summed over concurrent batches, so with the async service
+-- their total can exceed the cycle's wall time
+CREATE OR ALTER VIEW lme_config.V_collection_metrics_trend
+AS
+SELECT 
+    m.metal_code,
+    cm.collection_type,
+    DATEADD(HOUR, DATEDIFF(HOUR, 0, cm.started_at), 0) as hour_start,
+    COUNT(*) as cycles,
+    SUM(CASE WHEN cm.status = 'SUCCESS' THEN 0 ELSE 1 END) as failed_cycles,
+    AVG(CAST(cm.spread_count AS FLOAT)) as avg_spreads,
+    SUM(CAST(cm.tick_count AS BIGINT)) as ticks,
+    AVG(CAST(cm.total_ms AS FLOAT)) as avg_total_ms,
+    MAX(cm.total_ms) as max_total_ms,
+    AVG(CAST(cm.search_ms AS FLOAT)) as avg_search_ms,
+    AVG(CAST(cm.fetch_ms AS FLOAT)) as avg_fetch_ms,
+    AVG(CAST(cm.store_spreads_ms AS FLOAT)) as avg_store_spreads_ms,
+    AVG(CAST(cm.store_ticks_ms AS FLOAT)) as avg_store_ticks_ms,
+    CAST(SUM(CAST(cm.fetch_ms AS BIGINT)) AS FLOAT) / NULLIF(SUM(CAST(cm.total_ms AS BIGINT)), 0) * 100 as fetch_percentage,
+    CAST(SUM(CAST(cm.store_ticks_ms AS BIGINT)) AS FLOAT) / NULLIF(SUM(CAST(cm.total_ms AS BIGINT)), 0) * 100 as store_ticks_percentage,
+    AVG(CAST(cm.fetch_ms AS FLOAT)) / NULLIF(AVG(CAST(cm.spread_count AS FLOAT)), 0) as fetch_ms_per_spread
+FROM lme_config.LME_T_collection_metrics cm
+JOIN lme_config.LME_M_metals m ON cm.metal_id = m.metal_id
+GROUP BY m.metal_code, cm.collection_type, DATEADD(HOUR, DATEDIFF(HOUR, 0, cm.started_at), 0);
+GO
+
+PRINT 'Created lme_config.V_collection_metrics_trend';
+GO